@@ -0,0 +1,107 @@
+from datetime import date
+from typing import List, Optional
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import async_crud
+from .database import get_async_db
+from .schemas import WearResponse, WearZone, FleetWearResponse, WearForecastResponse, ProcurementResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get('/health')
+async def health_check(db: AsyncSession = Depends(get_async_db)):
+    try:
+        await db.execute(text('SELECT 1'))
+        logger.info('Health check: database is healthy')
+        return {'status': 'healthy', 'database': 'connected'}
+    except Exception:
+        logger.exception('Health check failed: database connection error')
+        raise HTTPException(status_code=500, detail='Database connection error')
+
+@router.get('/wear/', response_model=List[FleetWearResponse])
+async def api_get_fleet_wear(
+    equipment_ids: Optional[List[int]] = Query(None),
+    zone: Optional[WearZone] = None,
+    current_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        if current_date is None:
+            current_date = date.today()
+        wear = await async_crud.calculate_wear_rows(db, current_date, equipment_ids, zone)
+        logger.info('Calculated fleet wear for %s parts', len(wear))
+        return ORJSONResponse(wear)
+    except Exception:
+        logger.exception('Error calculating fleet wear for equipment_ids: %s', equipment_ids)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@router.get('/wear/{equipment_id}', response_model=List[WearResponse])
+async def api_get_wear(equipment_id: int, current_date: Optional[date] = None,
+                       db: AsyncSession = Depends(get_async_db)):
+    try:
+        if current_date is None:
+            current_date = date.today()
+        wear = await async_crud.calculate_wear_for_equipment(db, equipment_id, current_date)
+        logger.info('Calculated wear for equipment_id: %s', equipment_id)
+        return wear
+    except Exception:
+        logger.exception('Error calculating wear for equipment_id: %s', equipment_id)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@router.get('/wear/{equipment_id}/forecast', response_model=WearForecastResponse)
+async def api_get_wear_forecast(
+    equipment_id: int,
+    date_to: date = Query(..., alias='to'),
+    date_from: Optional[date] = Query(None, alias='from'),
+    step: int = Query(1, ge=1),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        if date_from is None:
+            date_from = date.today()
+        forecast = await async_crud.forecast_wear_for_equipment(db, equipment_id, date_from, date_to, step)
+        logger.info('Forecast wear for equipment_id: %s', equipment_id)
+        return ORJSONResponse(forecast)
+    except ValueError as ve:
+        logger.error('Invalid input for wear forecast: %s', ve)
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception:
+        logger.exception('Error forecasting wear for equipment_id: %s', equipment_id)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@router.get('/procurement/', response_model=List[ProcurementResponse])
+async def api_get_procurement_plans(
+    end_date: date,
+    part_ids: Optional[List[int]] = Query(None),
+    equipment_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        plans = await async_crud.calculate_procurement_rows(db, end_date, part_ids, equipment_id)
+        logger.info('Calculated procurement plans for %s parts', len(plans))
+        return ORJSONResponse(plans)
+    except ValueError as ve:
+        logger.error('Invalid input for procurement calculation: %s', ve)
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception:
+        logger.exception('Error calculating procurement plans for end_date: %s', end_date)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@router.get('/procurement/{part_id}', response_model=ProcurementResponse)
+async def api_get_procurement(part_id: int, end_date: date, db: AsyncSession = Depends(get_async_db)):
+    try:
+        procurement = await async_crud.calculate_procurement_plan(db, part_id, end_date)
+        logger.info('Calculated procurement plan for part_id: %s', part_id)
+        return procurement
+    except ValueError as ve:
+        logger.error('Invalid input for procurement calculation: %s', ve)
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception:
+        logger.exception('Error calculating procurement for part_id: %s', part_id)
+        raise HTTPException(status_code=500, detail='Internal server error')
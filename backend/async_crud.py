@@ -0,0 +1,27 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud
+from .schemas import WearResponse, ProcurementResponse
+
+# The async path reuses the sync query code through AsyncSession.run_sync, which
+# drives it on the async driver without holding a threadpool worker.
+
+async def calculate_wear_rows(db: AsyncSession, current_date: date, equipment_ids: Optional[List[int]] = None,
+                              zone: Optional[str] = None) -> List[Dict[str, Any]]:
+    return await db.run_sync(crud.calculate_wear_rows, current_date, equipment_ids, zone)
+
+async def calculate_wear_for_equipment(db: AsyncSession, equipment_id: int, current_date: date) -> List[WearResponse]:
+    return await db.run_sync(crud.calculate_wear_for_equipment, equipment_id, current_date)
+
+async def forecast_wear_for_equipment(db: AsyncSession, equipment_id: int, date_from: date, date_to: date,
+                                      step_days: int = 1) -> Dict[str, Any]:
+    return await db.run_sync(crud.forecast_wear_for_equipment, equipment_id, date_from, date_to, step_days)
+
+async def calculate_procurement_plan(db: AsyncSession, part_id: int, end_date: date) -> ProcurementResponse:
+    return await db.run_sync(crud.calculate_procurement_plan, part_id, end_date)
+
+async def calculate_procurement_rows(db: AsyncSession, end_date: date, part_ids: Optional[List[int]] = None,
+                                     equipment_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    return await db.run_sync(crud.calculate_procurement_rows, end_date, part_ids, equipment_id)
@@ -0,0 +1,92 @@
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+CacheKey = Tuple[str, str, str]
+
+@dataclass
+class CachedResponse:
+    generation: int
+    etag: str
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+class ResponseCache:
+    """In-memory LRU of serialized list responses, invalidated per table.
+
+    Every table has a generation counter that write endpoints bump. A cached
+    body is only served while its generation is current, and the ETag embeds
+    the generation so a matching If-None-Match can be answered with 304
+    without loading anything. The boot id keeps ETags from a previous process
+    from ever matching.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._boot_id = uuid.uuid4().hex[:8]
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._entries: 'OrderedDict[CacheKey, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def generation(self, table: str) -> int:
+        with self._lock:
+            return self._generations[table]
+
+    def bump(self, table: str) -> None:
+        with self._lock:
+            self._generations[table] += 1
+            for key in [key for key in self._entries if key[0] == table]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def etag(self, key: CacheKey, generation: int) -> str:
+        digest = hashlib.sha1(f'{key[1]}?{key[2]}'.encode()).hexdigest()[:12]
+        return f'W/"{key[0]}-{self._boot_id}-{generation}-{digest}"'
+
+    def get(self, key: CacheKey, generation: int) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.generation != generation:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: CacheKey, entry: CachedResponse) -> None:
+        with self._lock:
+            if entry.generation != self._generations[key[0]]:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def respond(self, request: Request, table: str,
+                build: Callable[[], Tuple[bytes, Dict[str, str]]]) -> Response:
+        key = (table, request.url.path, str(request.query_params))
+        generation = self.generation(table)
+        etag = self.etag(key, generation)
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+
+        if _etag_matches(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=headers)
+
+        entry = self.get(key, generation)
+        if entry is None:
+            body, extra_headers = build()
+            entry = CachedResponse(generation=generation, etag=etag, body=body, headers=extra_headers)
+            self.put(key, entry)
+        return Response(content=entry.body, media_type='application/json', headers={**entry.headers, **headers})
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or etag[2:] in candidates
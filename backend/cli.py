@@ -0,0 +1,80 @@
+import argparse
+import logging
+import sys
+
+from .database import SessionLocal, engine, init_schema, seed_database
+from .migrations import LATEST_VERSION, current_version
+from .crud import rebuild_part_state, rebuild_replacement_stats, rebuild_wear_alerts
+
+logger = logging.getLogger(__name__)
+
+def _rebuild_part_state(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        count = rebuild_part_state(db)
+        print(f'Rebuilt part state for {count} parts')
+        # Alerts are derived from part_state, so they follow it
+        return _rebuild_wear_alerts(args)
+    finally:
+        db.close()
+
+def _rebuild_wear_alerts(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        count = rebuild_wear_alerts(db)
+        print(f'Rebuilt {count} wear alerts')
+        return 0
+    finally:
+        db.close()
+
+def _rebuild_replacement_stats(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        count = rebuild_replacement_stats(db)
+        print(f'Rebuilt {count} replacement stats rows')
+        return 0
+    finally:
+        db.close()
+
+def _migrate(args: argparse.Namespace) -> int:
+    # Tables added since the last deploy have to exist before a migration fills them
+    applied = init_schema(engine)
+    print(f'Applied migrations: {applied or "none"}; schema version {current_version(engine)}/{LATEST_VERSION}')
+    return 0
+
+def _seed(args: argparse.Namespace) -> int:
+    init_schema(engine)
+    db = SessionLocal()
+    try:
+        seeded = seed_database(db)
+        print(f'Seeded: {seeded}' if seeded else 'Database already seeded, nothing to do')
+        return 0
+    finally:
+        db.close()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m backend.cli', description='Spare Parts Journal maintenance commands')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = commands.add_parser('rebuild-part-state', help='Regenerate the part_state table from replacement history')
+    rebuild.set_defaults(handler=_rebuild_part_state)
+
+    alerts = commands.add_parser('rebuild-wear-alerts', help='Regenerate the wear_alerts index from part_state')
+    alerts.set_defaults(handler=_rebuild_wear_alerts)
+
+    stats = commands.add_parser('rebuild-replacement-stats',
+                                help='Regenerate the replacement_stats rollup from replacement history')
+    stats.set_defaults(handler=_rebuild_replacement_stats)
+
+    migrate_parser = commands.add_parser('migrate', help='Create missing tables and apply pending schema migrations')
+    migrate_parser.set_defaults(handler=_migrate)
+
+    seed = commands.add_parser('seed', help='Create the schema and fill empty reference tables with demo data')
+    seed.set_defaults(handler=_seed)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
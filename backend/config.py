@@ -0,0 +1,81 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, '') else default
+
+@dataclass(frozen=True)
+class Settings:
+    database_url: str = 'sqlite:////app/spare_parts.db'
+    database_read_url: Optional[str] = None
+    async_db: bool = False
+    auto_migrate: bool = True
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = -1
+    sqlite_journal_mode: str = 'WAL'
+    sqlite_synchronous: str = 'NORMAL'
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size: int = 268435456
+    response_cache_size: int = 256
+    metrics_enabled: bool = True
+    slow_query_ms: float = 0.0
+    log_file: str = 'app.log'
+    log_level: str = 'INFO'
+    log_format: str = 'json'
+    log_queue_size: int = 10000
+    log_sample_rate: float = 1.0
+    log_max_bytes: int = 1000000
+    log_backup_count: int = 5
+    write_queue_enabled: bool = False
+    write_batch_size: int = 64
+    write_batch_delay_ms: float = 2.0
+    write_queue_size: int = 10000
+
+    @classmethod
+    def from_env(cls) -> 'Settings':
+        return cls(
+            database_url=os.getenv('DATABASE_URL', cls.database_url),
+            database_read_url=os.getenv('DATABASE_READ_URL') or None,
+            async_db=_env_bool('ASYNC_DB', cls.async_db),
+            auto_migrate=_env_bool('AUTO_MIGRATE', cls.auto_migrate),
+            pool_size=_env_int('DB_POOL_SIZE', cls.pool_size),
+            max_overflow=_env_int('DB_MAX_OVERFLOW', cls.max_overflow),
+            pool_timeout=_env_float('DB_POOL_TIMEOUT', cls.pool_timeout),
+            pool_recycle=_env_int('DB_POOL_RECYCLE', cls.pool_recycle),
+            sqlite_journal_mode=os.getenv('SQLITE_JOURNAL_MODE', cls.sqlite_journal_mode),
+            sqlite_synchronous=os.getenv('SQLITE_SYNCHRONOUS', cls.sqlite_synchronous),
+            sqlite_busy_timeout_ms=_env_int('SQLITE_BUSY_TIMEOUT_MS', cls.sqlite_busy_timeout_ms),
+            sqlite_cache_size_kib=_env_int('SQLITE_CACHE_SIZE_KIB', cls.sqlite_cache_size_kib),
+            sqlite_mmap_size=_env_int('SQLITE_MMAP_SIZE', cls.sqlite_mmap_size),
+            response_cache_size=_env_int('RESPONSE_CACHE_SIZE', cls.response_cache_size),
+            metrics_enabled=_env_bool('METRICS_ENABLED', cls.metrics_enabled),
+            slow_query_ms=_env_float('SLOW_QUERY_MS', cls.slow_query_ms),
+            log_file=os.getenv('LOG_FILE', cls.log_file),
+            log_level=os.getenv('LOG_LEVEL', cls.log_level),
+            log_format=os.getenv('LOG_FORMAT', cls.log_format),
+            log_queue_size=_env_int('LOG_QUEUE_SIZE', cls.log_queue_size),
+            log_sample_rate=_env_float('LOG_SAMPLE_RATE', cls.log_sample_rate),
+            log_max_bytes=_env_int('LOG_MAX_BYTES', cls.log_max_bytes),
+            log_backup_count=_env_int('LOG_BACKUP_COUNT', cls.log_backup_count),
+            write_queue_enabled=_env_bool('WRITE_QUEUE', cls.write_queue_enabled),
+            write_batch_size=_env_int('WRITE_BATCH_SIZE', cls.write_batch_size),
+            write_batch_delay_ms=_env_float('WRITE_BATCH_DELAY_MS', cls.write_batch_delay_ms),
+            write_queue_size=_env_int('WRITE_QUEUE_SIZE', cls.write_queue_size),
+        )
+
+settings = Settings.from_env()
@@ -1,41 +1,68 @@
+from collections import Counter
 from datetime import date, timedelta
-from typing import List, Optional
+import re
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple
 import logging
-from dateutil.relativedelta import relativedelta
+from functools import lru_cache
+from pydantic import ValidationError
+from sqlalchemy import Date, and_, case, cast, column, delete, func, insert, inspect, select, table, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from .models import Equipment, Part, Workshop, ReplacementType, Replacement
+from .models import Equipment, Part, Workshop, ReplacementType, Replacement, PartState, WearAlert, ReplacementStat
 from .schemas import (
     EquipmentCreate, EquipmentResponse,
-    PartCreate, PartResponse,
+    PartCreate, PartResponse, PartPatch,
     WorkshopCreate, WorkshopResponse,
     ReplacementTypeCreate, ReplacementTypeResponse,
-    ReplacementCreate, ReplacementResponse,
-    WearResponse, ProcurementResponse
+    ReplacementCreate, ReplacementResponse, ReplacementPatch, BulkRowError,
+    WearResponse, FleetWearResponse, ProcurementResponse
 )
 
+# numpy adds tens of milliseconds to every process start and only the
+# forecast and demand calculations need it, so it is imported on first use
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
+def _paginate(query, id_column, cursor: Optional[int] = None, limit: Optional[int] = None):
+    if cursor is not None:
+        query = query.filter(id_column > cursor)
+    query = query.order_by(id_column)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+def _rows(db: Session, stmt) -> List[Dict[str, Any]]:
+    # Column projections straight into dicts: no ORM identity map, no
+    # _sa_instance_state, and nothing for Pydantic to re-validate.
+    result = db.execute(stmt)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
 def create_equipment(db: Session, equipment: EquipmentCreate) -> EquipmentResponse:
     try:
         db_equip = Equipment(**equipment.model_dump())
         db.add(db_equip)
         db.commit()
         db.refresh(db_equip)
-        logger.info(f'Created equipment: {equipment.name}')
+        logger.info('Created equipment: %s', equipment.name)
         return EquipmentResponse(**db_equip.__dict__)
     except Exception:
-        logger.exception(f'Failed to create equipment: {equipment.name}')
+        logger.exception('Failed to create equipment: %s', equipment.name)
         raise
 
-def get_equipments(db: Session) -> List[EquipmentResponse]:
+def get_equipment_rows(db: Session, cursor: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
     try:
-        equipments = db.query(Equipment).all()
-        return [EquipmentResponse(**eq.__dict__) for eq in equipments]
+        return _rows(db, _paginate(select(*Equipment.__table__.c), Equipment.id, cursor, limit))
     except Exception:
         logger.exception('Failed to fetch equipments')
         raise
 
+def get_equipments(db: Session, cursor: Optional[int] = None, limit: Optional[int] = None) -> List[EquipmentResponse]:
+    return [EquipmentResponse.model_construct(**row) for row in get_equipment_rows(db, cursor, limit)]
+
 def get_equipment(db: Session, equipment_id: int) -> Optional[EquipmentResponse]:
     try:
         db_equip = db.query(Equipment).filter(Equipment.id == equipment_id).first()
@@ -43,7 +70,7 @@ def get_equipment(db: Session, equipment_id: int) -> Optional[EquipmentResponse]
             return EquipmentResponse(**db_equip.__dict__)
         return None
     except Exception:
-        logger.exception(f'Failed to fetch equipment with ID: {equipment_id}')
+        logger.exception('Failed to fetch equipment with ID: %s', equipment_id)
         raise
 
 def create_part(db: Session, part: PartCreate) -> PartResponse:
@@ -52,23 +79,106 @@ def create_part(db: Session, part: PartCreate) -> PartResponse:
         db.add(db_part)
         db.commit()
         db.refresh(db_part)
-        logger.info(f'Created part: {part.name}')
+        logger.info('Created part: %s', part.name)
+        return PartResponse(**db_part.__dict__)
+    except Exception:
+        logger.exception('Failed to create part: %s', part.name)
+        raise
+
+def update_part(db: Session, part_id: int, patch: PartPatch) -> Optional[PartResponse]:
+    try:
+        db_part = db.query(Part).filter(Part.id == part_id).first()
+        if not db_part:
+            return None
+        for key, value in patch.model_dump(exclude_unset=True).items():
+            setattr(db_part, key, value)
+        db.flush()
+        # Stock, useful life and procurement time all move the transition dates
+        keys = {tuple(key) for key in db.execute(
+            select(PartState.equipment_id, PartState.part_id).where(PartState.part_id == part_id)
+        )}
+        _refresh_wear_alerts(db, keys)
+        db.commit()
+        db.refresh(db_part)
+        logger.info('Updated part with ID: %s', part_id)
         return PartResponse(**db_part.__dict__)
     except Exception:
-        logger.exception(f'Failed to create part: {part.name}')
+        db.rollback()
+        logger.exception('Failed to update part with ID: %s', part_id)
         raise
 
-def get_parts(db: Session, equipment_id: Optional[int] = None) -> List[PartResponse]:
+def get_part_rows(db: Session, equipment_id: Optional[int] = None, name_prefix: Optional[str] = None,
+                  cursor: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
     try:
-        query = db.query(Part)
+        stmt = select(*Part.__table__.c)
         if equipment_id:
-            query = query.filter(Part.equipment_id == equipment_id)
-        parts = query.all()
-        return [PartResponse(**p.__dict__) for p in parts]
+            stmt = stmt.where(Part.equipment_id == equipment_id)
+        if name_prefix:
+            # A range over the unique name index instead of LIKE, which SQLite can't index
+            stmt = stmt.where(Part.name >= name_prefix, Part.name < name_prefix + '\U0010ffff')
+        return _rows(db, _paginate(stmt, Part.id, cursor, limit))
     except Exception:
-        logger.exception(f'Failed to fetch parts for equipment_id: {equipment_id}')
+        logger.exception('Failed to fetch parts for equipment_id: %s', equipment_id)
         raise
 
+# The FTS5 table created by migration 3; not part of the ORM models
+parts_fts = table('parts_fts', column('rowid'), column('parts_fts'))
+_SEARCH_TERM = re.compile(r'\w+')
+PART_SEARCH_CANDIDATES = 1000
+_part_fts_binds: Set[Any] = set()
+
+def _has_part_fts(db: Session) -> bool:
+    bind = db.get_bind()
+    if bind in _part_fts_binds:
+        return True
+    if bind.dialect.name == 'sqlite' and inspect(bind).has_table('parts_fts'):
+        _part_fts_binds.add(bind)
+        return True
+    return False
+
+def search_part_rows(db: Session, query: str, limit: int, equipment_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Parts whose name has words starting with every word of query, best matches first.
+
+    On SQLite this is a prefix MATCH against the parts_fts index ranked by
+    bm25; other databases (or SQLite without the index) fall back to ILIKE
+    substring matching, which SQLite only folds for ASCII. An empty query
+    lists parts by name.
+    """
+    try:
+        terms = _SEARCH_TERM.findall(query)
+        stmt = select(*Part.__table__.c)
+        if not terms:
+            stmt = stmt.order_by(Part.name)
+        elif _has_part_fts(db):
+            # bm25 is only computed for rows the inner query returns, so capping
+            # the candidates keeps a one-letter query over every part in the
+            # milliseconds; longer queries match fewer rows and rank exactly
+            candidates = select(
+                parts_fts.c.rowid, func.bm25(parts_fts.c.parts_fts).label('score')
+            ).where(
+                parts_fts.c.parts_fts.match(' '.join(f'"{term}"*' for term in terms))
+            ).limit(max(limit, PART_SEARCH_CANDIDATES)).subquery()
+            stmt = stmt.join(candidates, candidates.c.rowid == Part.id).order_by(
+                candidates.c.score, func.length(Part.name), Part.id
+            )
+        else:
+            stmt = stmt.where(
+                *(Part.name.ilike(f'%{term}%') for term in terms)
+            ).order_by(func.length(Part.name), Part.name)
+        if equipment_id:
+            stmt = stmt.where(Part.equipment_id == equipment_id)
+        rows = _rows(db, stmt.limit(limit))
+        logger.info('Part search %r matched %s parts', query, len(rows))
+        return rows
+    except Exception:
+        logger.exception('Failed to search parts for %r', query)
+        raise
+
+def get_parts(db: Session, equipment_id: Optional[int] = None, name_prefix: Optional[str] = None,
+              cursor: Optional[int] = None, limit: Optional[int] = None) -> List[PartResponse]:
+    return [PartResponse.model_construct(**row)
+            for row in get_part_rows(db, equipment_id, name_prefix, cursor, limit)]
+
 def get_part(db: Session, part_id: int) -> Optional[PartResponse]:
     try:
         db_part = db.query(Part).filter(Part.id == part_id).first()
@@ -76,7 +186,7 @@ def get_part(db: Session, part_id: int) -> Optional[PartResponse]:
             return PartResponse(**db_part.__dict__)
         return None
     except Exception:
-        logger.exception(f'Failed to fetch part with ID: {part_id}')
+        logger.exception('Failed to fetch part with ID: %s', part_id)
         raise
 
 def create_workshop(db: Session, workshop: WorkshopCreate) -> WorkshopResponse:
@@ -85,20 +195,22 @@ def create_workshop(db: Session, workshop: WorkshopCreate) -> WorkshopResponse:
         db.add(db_workshop)
         db.commit()
         db.refresh(db_workshop)
-        logger.info(f'Created workshop: {workshop.name}')
+        logger.info('Created workshop: %s', workshop.name)
         return WorkshopResponse(**db_workshop.__dict__)
     except Exception:
-        logger.exception(f'Failed to create workshop: {workshop.name}')
+        logger.exception('Failed to create workshop: %s', workshop.name)
         raise
 
-def get_workshops(db: Session) -> List[WorkshopResponse]:
+def get_workshop_rows(db: Session, cursor: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
     try:
-        workshops = db.query(Workshop).all()
-        return [WorkshopResponse(**ws.__dict__) for ws in workshops]
+        return _rows(db, _paginate(select(*Workshop.__table__.c), Workshop.id, cursor, limit))
     except Exception:
         logger.exception('Failed to fetch workshops')
         raise
 
+def get_workshops(db: Session, cursor: Optional[int] = None, limit: Optional[int] = None) -> List[WorkshopResponse]:
+    return [WorkshopResponse.model_construct(**row) for row in get_workshop_rows(db, cursor, limit)]
+
 def get_workshop(db: Session, workshop_id: int) -> Optional[WorkshopResponse]:
     try:
         db_workshop = db.query(Workshop).filter(Workshop.id == workshop_id).first()
@@ -106,7 +218,7 @@ def get_workshop(db: Session, workshop_id: int) -> Optional[WorkshopResponse]:
             return WorkshopResponse(**db_workshop.__dict__)
         return None
     except Exception:
-        logger.exception(f'Failed to fetch workshop with ID: {workshop_id}')
+        logger.exception('Failed to fetch workshop with ID: %s', workshop_id)
         raise
 
 def create_replacement_type(db: Session, replacement_type: ReplacementTypeCreate) -> ReplacementTypeResponse:
@@ -115,20 +227,24 @@ def create_replacement_type(db: Session, replacement_type: ReplacementTypeCreate
         db.add(db_type)
         db.commit()
         db.refresh(db_type)
-        logger.info(f'Created replacement type: {replacement_type.name}')
+        logger.info('Created replacement type: %s', replacement_type.name)
         return ReplacementTypeResponse(**db_type.__dict__)
     except Exception:
-        logger.exception(f'Failed to create replacement type: {replacement_type.name}')
+        logger.exception('Failed to create replacement type: %s', replacement_type.name)
         raise
 
-def get_replacement_types(db: Session) -> List[ReplacementTypeResponse]:
+def get_replacement_type_rows(db: Session, cursor: Optional[int] = None,
+                              limit: Optional[int] = None) -> List[Dict[str, Any]]:
     try:
-        types = db.query(ReplacementType).all()
-        return [ReplacementTypeResponse(**rt.__dict__) for rt in types]
+        return _rows(db, _paginate(select(*ReplacementType.__table__.c), ReplacementType.id, cursor, limit))
     except Exception:
         logger.exception('Failed to fetch replacement types')
         raise
 
+def get_replacement_types(db: Session, cursor: Optional[int] = None,
+                          limit: Optional[int] = None) -> List[ReplacementTypeResponse]:
+    return [ReplacementTypeResponse.model_construct(**row) for row in get_replacement_type_rows(db, cursor, limit)]
+
 def get_replacement_type(db: Session, type_id: int) -> Optional[ReplacementTypeResponse]:
     try:
         db_type = db.query(ReplacementType).filter(ReplacementType.id == type_id).first()
@@ -136,145 +252,831 @@ def get_replacement_type(db: Session, type_id: int) -> Optional[ReplacementTypeR
             return ReplacementTypeResponse(**db_type.__dict__)
         return None
     except Exception:
-        logger.exception(f'Failed to fetch replacement type with ID: {type_id}')
+        logger.exception('Failed to fetch replacement type with ID: %s', type_id)
+        raise
+
+REPLACEMENT_FIELDS = tuple(ReplacementCreate.model_fields)
+STATE_KEY_BATCH_SIZE = 500
+
+def _replacement_values(db_repl: Replacement) -> Dict[str, Any]:
+    return {field: getattr(db_repl, field) for field in REPLACEMENT_FIELDS}
+
+def _state_key(values: Dict[str, Any]) -> Tuple[int, int]:
+    return values['equipment_id'], values['part_id']
+
+def _record_inserted_replacements(db: Session, added: List[Dict[str, Any]]) -> None:
+    totals: Dict[Tuple[int, int], Tuple[int, date]] = {}
+    for values in added:
+        key = _state_key(values)
+        replacement_date = _as_date(values['replacement_date'])
+        count, latest = totals.get(key, (0, replacement_date))
+        totals[key] = (count + 1, max(latest, replacement_date))
+
+    keys = list(totals)
+    for start in range(0, len(keys), STATE_KEY_BATCH_SIZE):
+        batch = keys[start:start + STATE_KEY_BATCH_SIZE]
+        states = {
+            (state.equipment_id, state.part_id): state
+            for state in db.query(PartState).filter(tuple_(PartState.equipment_id, PartState.part_id).in_(batch))
+        }
+        for key in batch:
+            count, latest = totals[key]
+            state = states.get(key)
+            if state is None:
+                db.add(PartState(equipment_id=key[0], part_id=key[1],
+                                 last_replacement_date=latest, replacement_count=count))
+            else:
+                state.replacement_count += count
+                state.last_replacement_date = max(_as_date(state.last_replacement_date), latest)
+
+def _recompute_part_state(db: Session, keys: Set[Tuple[int, int]]) -> None:
+    keys = sorted(keys)
+    for start in range(0, len(keys), STATE_KEY_BATCH_SIZE):
+        batch = keys[start:start + STATE_KEY_BATCH_SIZE]
+        part_ids = sorted({part_id for _, part_id in batch})
+        # SQLite won't seek on a row-value IN, so both statements also filter on
+        # part_id alone to get an index search instead of a full scan
+        key_filter = and_(
+            Replacement.part_id.in_(part_ids),
+            tuple_(Replacement.equipment_id, Replacement.part_id).in_(batch)
+        )
+        db.execute(
+            delete(PartState).where(
+                PartState.part_id.in_(part_ids),
+                tuple_(PartState.equipment_id, PartState.part_id).in_(batch)
+            ),
+            execution_options={'synchronize_session': False}
+        )
+        db.execute(insert(PartState).from_select(
+            ['equipment_id', 'part_id', 'last_replacement_date', 'replacement_count'],
+            select(
+                Replacement.equipment_id, Replacement.part_id,
+                func.max(Replacement.replacement_date), func.count(Replacement.id)
+            ).where(key_filter).group_by(Replacement.equipment_id, Replacement.part_id)
+        ))
+
+STAT_KEY_FIELDS = ('equipment_id', 'part_id', 'workshop_id', 'replacement_type_id')
+StatKey = Tuple[date, int, int, int, int]
+
+def _stat_key(values: Dict[str, Any]) -> StatKey:
+    return (_as_date(values['replacement_date']).replace(day=1),) + tuple(values[f] for f in STAT_KEY_FIELDS)
+
+def _record_replacement_stats(db: Session, added: List[Dict[str, Any]], removed: List[Dict[str, Any]]) -> None:
+    deltas: Counter = Counter(_stat_key(values) for values in added)
+    deltas.subtract(_stat_key(values) for values in removed)
+    # An edit that keeps month, equipment, part, workshop and type cancels out
+    keys = sorted(key for key, delta in deltas.items() if delta)
+    stat_columns = (ReplacementStat.month,) + tuple(getattr(ReplacementStat, f) for f in STAT_KEY_FIELDS)
+    for start in range(0, len(keys), STATE_KEY_BATCH_SIZE):
+        batch = keys[start:start + STATE_KEY_BATCH_SIZE]
+        # The month filter gives SQLite a primary key range to seek on
+        stats = {
+            (_as_date(stat.month),) + tuple(getattr(stat, f) for f in STAT_KEY_FIELDS): stat
+            for stat in db.query(ReplacementStat).filter(
+                ReplacementStat.month.in_(sorted({key[0] for key in batch})),
+                tuple_(*stat_columns).in_(batch)
+            )
+        }
+        for key in batch:
+            stat = stats.get(key)
+            if stat is None:
+                if deltas[key] > 0:
+                    db.add(ReplacementStat(month=key[0], **dict(zip(STAT_KEY_FIELDS, key[1:])),
+                                           replacement_count=deltas[key]))
+                else:
+                    logger.warning('Replacement stats have no row for %s, rebuild them', key)
+            elif stat.replacement_count + deltas[key] > 0:
+                stat.replacement_count += deltas[key]
+            else:
+                db.delete(stat)
+
+def _apply_replacement_changes(db: Session, added: List[Dict[str, Any]],
+                               removed: Optional[List[Dict[str, Any]]] = None) -> None:
+    # Keeps derived per-part state in step with the journal inside the caller's
+    # transaction. Pure inserts are applied incrementally; edits may move a date
+    # backwards or move a row to another part, so affected keys are recomputed.
+    keys = {_state_key(values) for values in added + (removed or [])}
+    _record_replacement_stats(db, added, removed or [])
+    if not removed:
+        _record_inserted_replacements(db, added)
+    else:
+        db.flush()
+        _recompute_part_state(db, keys)
+    db.flush()
+    _refresh_wear_alerts(db, keys)
+
+def rebuild_part_state(db: Session) -> int:
+    try:
+        db.execute(delete(PartState))
+        db.execute(insert(PartState).from_select(
+            ['equipment_id', 'part_id', 'last_replacement_date', 'replacement_count'],
+            select(
+                Replacement.equipment_id, Replacement.part_id,
+                func.max(Replacement.replacement_date), func.count(Replacement.id)
+            ).group_by(Replacement.equipment_id, Replacement.part_id)
+        ))
+        db.commit()
+        count = db.query(func.count()).select_from(PartState).scalar()
+        logger.info('Rebuilt part state for %s parts', count)
+        return count
+    except Exception:
+        db.rollback()
+        logger.exception('Failed to rebuild part state')
         raise
 
+def add_replacement(db: Session, replacement: ReplacementCreate) -> ReplacementResponse:
+    """Insert a replacement and update its derived state, leaving the commit to the caller."""
+    values = replacement.model_dump()
+    db_repl = Replacement(**values)
+    db.add(db_repl)
+    _apply_replacement_changes(db, [values])
+    return ReplacementResponse(id=db_repl.id, **values)
+
 def create_replacement(db: Session, replacement: ReplacementCreate) -> ReplacementResponse:
     try:
-        db_repl = Replacement(**replacement.model_dump())
-        db.add(db_repl)
+        result = add_replacement(db, replacement)
         db.commit()
-        db.refresh(db_repl)
-        logger.info(f'Created replacement for part_id: {replacement.part_id}')
-        return ReplacementResponse(**db_repl.__dict__)
+        logger.info('Created replacement for part_id: %s', replacement.part_id)
+        return result
     except Exception:
-        logger.exception(f'Failed to create replacement for part_id: {replacement.part_id}')
+        logger.exception('Failed to create replacement for part_id: %s', replacement.part_id)
         raise
 
-def get_replacements(db: Session, equipment_id: Optional[int] = None) -> List[ReplacementResponse]:
+BULK_CHUNK_SIZE = 1000
+
+REFERENCE_MODELS = {
+    'equipment_id': Equipment, 'part_id': Part, 'replacement_type_id': ReplacementType, 'workshop_id': Workshop,
+}
+
+def load_reference_ids(db: Session) -> Dict[str, Set[int]]:
     try:
-        query = db.query(Replacement)
-        if equipment_id:
-            query = query.filter(Replacement.equipment_id == equipment_id)
-        replacements = query.all()
-        return [ReplacementResponse(**r.__dict__) for r in replacements]
+        return {field: {row.id for row in db.query(model.id)} for field, model in REFERENCE_MODELS.items()}
     except Exception:
-        logger.exception(f'Failed to fetch replacements for equipment_id: {equipment_id}')
+        logger.exception('Failed to load reference ids')
         raise
 
-def update_replacement(db: Session, replacement_id: int, data: dict) -> Optional[ReplacementResponse]:
+def find_unknown_references(db: Session, rows: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """Referenced ids in rows that have no equipment, part, type or workshop row.
+
+    Unlike load_reference_ids this only looks up the ids the rows mention, so
+    it stays cheap for a small patch against a large catalogue.
+    """
     try:
-        db_repl = db.query(Replacement).filter(Replacement.id == replacement_id).first()
-        if db_repl:
-            for key, value in data.items():
-                setattr(db_repl, key, value)
+        unknown = {}
+        for field, model in REFERENCE_MODELS.items():
+            ids = sorted({row[field] for row in rows if row.get(field) is not None})
+            for start in range(0, len(ids), STATE_KEY_BATCH_SIZE):
+                batch = ids[start:start + STATE_KEY_BATCH_SIZE]
+                found = set(db.execute(select(model.id).where(model.id.in_(batch))).scalars())
+                missing = [value for value in batch if value not in found]
+                if missing:
+                    unknown.setdefault(field, []).extend(missing)
+        return unknown
+    except Exception:
+        logger.exception('Failed to check referenced ids')
+        raise
+
+def _validation_message(error: ValidationError) -> str:
+    return '; '.join(
+        f"{'.'.join(str(loc) for loc in err['loc']) or 'row'}: {err['msg']}" for err in error.errors()
+    )
+
+def bulk_create_replacements(db: Session, rows: List[Tuple[int, Any]],
+                             reference_ids: Dict[str, Set[int]]) -> Tuple[int, List[BulkRowError]]:
+    errors: List[BulkRowError] = []
+    valid: List[Tuple[int, ReplacementCreate]] = []
+    for row_number, raw in rows:
+        try:
+            replacement = ReplacementCreate.model_validate(raw)
+        except ValidationError as e:
+            errors.append(BulkRowError(row=row_number, error=_validation_message(e)))
+            continue
+        missing = [field for field, ids in reference_ids.items() if getattr(replacement, field) not in ids]
+        if missing:
+            errors.append(BulkRowError(row=row_number, error=f'Unknown {", ".join(missing)}'))
+            continue
+        valid.append((row_number, replacement))
+
+    inserted = 0
+    for start in range(0, len(valid), BULK_CHUNK_SIZE):
+        chunk = valid[start:start + BULK_CHUNK_SIZE]
+        try:
+            values = [replacement.model_dump() for _, replacement in chunk]
+            db.execute(insert(Replacement), values)
+            _apply_replacement_changes(db, values)
             db.commit()
-            db.refresh(db_repl)
-            logger.info(f'Updated replacement with ID: {replacement_id}')
-            return ReplacementResponse(**db_repl.__dict__)
+            inserted += len(chunk)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.exception('Failed to insert replacement chunk starting at row %s', chunk[0][0])
+            errors.extend(BulkRowError(row=row_number, error=f'Database error: {e.__class__.__name__}')
+                          for row_number, _ in chunk)
+
+    logger.info('Bulk inserted %s replacements, %s rows rejected', inserted, len(errors))
+    return inserted, errors
+
+def _replacement_filters(equipment_id: Optional[int] = None, part_id: Optional[int] = None,
+                         workshop_id: Optional[int] = None, replacement_type_id: Optional[int] = None,
+                         date_from: Optional[date] = None, date_to: Optional[date] = None) -> list:
+    conditions = []
+    if equipment_id:
+        conditions.append(Replacement.equipment_id == equipment_id)
+    if part_id:
+        conditions.append(Replacement.part_id == part_id)
+    if workshop_id:
+        conditions.append(Replacement.workshop_id == workshop_id)
+    if replacement_type_id:
+        conditions.append(Replacement.replacement_type_id == replacement_type_id)
+    if date_from:
+        conditions.append(Replacement.replacement_date >= date_from)
+    if date_to:
+        conditions.append(Replacement.replacement_date <= date_to)
+    return conditions
+
+def get_replacement_rows(db: Session, equipment_id: Optional[int] = None, part_id: Optional[int] = None,
+                         workshop_id: Optional[int] = None, replacement_type_id: Optional[int] = None,
+                         date_from: Optional[date] = None, date_to: Optional[date] = None,
+                         cursor: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    try:
+        stmt = select(*Replacement.__table__.c).where(*_replacement_filters(
+            equipment_id, part_id, workshop_id, replacement_type_id, date_from, date_to
+        ))
+        return _rows(db, _paginate(stmt, Replacement.id, cursor, limit))
+    except Exception:
+        logger.exception('Failed to fetch replacements for equipment_id: %s', equipment_id)
+        raise
+
+def get_replacements(db: Session, equipment_id: Optional[int] = None, part_id: Optional[int] = None,
+                     workshop_id: Optional[int] = None, replacement_type_id: Optional[int] = None,
+                     date_from: Optional[date] = None, date_to: Optional[date] = None,
+                     cursor: Optional[int] = None, limit: Optional[int] = None) -> List[ReplacementResponse]:
+    rows = get_replacement_rows(
+        db, equipment_id, part_id, workshop_id, replacement_type_id, date_from, date_to, cursor, limit
+    )
+    return [ReplacementResponse.model_construct(**row) for row in rows]
+
+EXPORT_COLUMNS = ('id',) + REPLACEMENT_FIELDS
+EXPORT_BATCH_SIZE = 1000
+
+def iter_replacement_rows(db: Session, equipment_id: Optional[int] = None, part_id: Optional[int] = None,
+                          workshop_id: Optional[int] = None, replacement_type_id: Optional[int] = None,
+                          date_from: Optional[date] = None, date_to: Optional[date] = None) -> Iterator[tuple]:
+    stmt = select(*(getattr(Replacement, column) for column in EXPORT_COLUMNS)).where(*_replacement_filters(
+        equipment_id, part_id, workshop_id, replacement_type_id, date_from, date_to
+    )).order_by(Replacement.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    try:
+        for row in db.execute(stmt):
+            yield tuple(row)
+    except Exception:
+        logger.exception('Failed to stream replacements for equipment_id: %s', equipment_id)
+        raise
+
+def apply_replacement_update(db: Session, replacement_id: int, data: dict) -> Optional[ReplacementResponse]:
+    """Update a replacement and its derived state, leaving the commit to the caller."""
+    db_repl = db.query(Replacement).filter(Replacement.id == replacement_id).first()
+    if db_repl is None:
         return None
+    before = _replacement_values(db_repl)
+    for key, value in data.items():
+        setattr(db_repl, key, value)
+    after = _replacement_values(db_repl)
+    _apply_replacement_changes(db, [after], [before])
+    return ReplacementResponse(id=replacement_id, **after)
+
+def get_replacement_equipment_ids(db: Session, replacement_ids: List[int]) -> Set[int]:
+    try:
+        return set(db.execute(
+            select(Replacement.equipment_id).where(Replacement.id.in_(replacement_ids)).distinct()
+        ).scalars())
+    except Exception:
+        logger.exception('Failed to fetch equipment of replacements: %s', replacement_ids)
+        raise
+
+def update_replacement(db: Session, replacement_id: int, data: dict) -> Optional[ReplacementResponse]:
+    try:
+        updated = apply_replacement_update(db, replacement_id, data)
+        if updated:
+            db.commit()
+            logger.info('Updated replacement with ID: %s', replacement_id)
+        return updated
     except Exception:
-        logger.exception(f'Failed to update replacement with ID: {replacement_id}')
+        logger.exception('Failed to update replacement with ID: %s', replacement_id)
         raise
 
+BULK_UPDATE_BATCH_SIZE = 500
+
+def bulk_update_replacements(db: Session, patches: List[ReplacementPatch]) -> Optional[List[ReplacementResponse]]:
+    try:
+        changes: Dict[int, Dict[str, Any]] = {}
+        for patch in patches:
+            changes.setdefault(patch.id, {}).update(patch.model_dump(exclude_unset=True, exclude={'id'}))
+        ids = sorted(changes)
+
+        before: List[Dict[str, Any]] = []
+        for start in range(0, len(ids), BULK_UPDATE_BATCH_SIZE):
+            batch_ids = ids[start:start + BULK_UPDATE_BATCH_SIZE]
+            rows = db.query(Replacement.id, *(getattr(Replacement, f) for f in REPLACEMENT_FIELDS)) \
+                .filter(Replacement.id.in_(batch_ids)).all()
+            before.extend({field: getattr(row, field) for field in REPLACEMENT_FIELDS} for row in rows)
+        if len(before) != len(ids):
+            logger.warning('Replacements not found for bulk update: %s of %s ids', len(ids) - len(before), len(ids))
+            return None
+
+        for start in range(0, len(ids), BULK_UPDATE_BATCH_SIZE):
+            batch_ids = ids[start:start + BULK_UPDATE_BATCH_SIZE]
+            values = {}
+            for field in REPLACEMENT_FIELDS:
+                column = getattr(Replacement, field)
+                mapping = {rid: changes[rid][field] for rid in batch_ids if field in changes[rid]}
+                if mapping:
+                    values[field] = case(mapping, value=Replacement.id, else_=column)
+            if values:
+                db.execute(
+                    update(Replacement).where(Replacement.id.in_(batch_ids)).values(values),
+                    execution_options={'synchronize_session': False}
+                )
+
+        updated = []
+        for start in range(0, len(ids), BULK_UPDATE_BATCH_SIZE):
+            batch_ids = ids[start:start + BULK_UPDATE_BATCH_SIZE]
+            rows = db.query(Replacement).filter(Replacement.id.in_(batch_ids)).order_by(Replacement.id).all()
+            updated.extend(ReplacementResponse(**r.__dict__) for r in rows)
+        _apply_replacement_changes(db, [r.model_dump(include=set(REPLACEMENT_FIELDS)) for r in updated], before)
+        db.commit()
+        logger.info('Bulk updated %s replacements', len(updated))
+        return updated
+    except Exception:
+        db.rollback()
+        logger.exception('Failed to bulk update %s replacements', len(patches))
+        raise
+
+def _as_date(value) -> Optional[date]:
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value
+
+# Remaining-life percentages above which a part is still Green / Yellow; at or
+# below YELLOW_THRESHOLD it is Red. Critical overrides all three when the part
+# is out of stock and would wear out before a new one can be procured.
+GREEN_THRESHOLD = 25.0
+YELLOW_THRESHOLD = 10.0
+
+def _wear_zone(useful_life: int, stock_quantity: int, procurement_time: int,
+               last_replacement_date: date, current_date: date) -> Tuple[str, float]:
+    days_used = (current_date - last_replacement_date).days
+    remaining_days = max(0, useful_life - days_used)
+    remaining_percentage = (remaining_days / useful_life * 100) if useful_life > 0 else 0.0
+
+    if remaining_percentage > GREEN_THRESHOLD:
+        zone = 'Green'
+    elif remaining_percentage > YELLOW_THRESHOLD:
+        zone = 'Yellow'
+    else:
+        zone = 'Red'
+
+    if stock_quantity == 0 and remaining_days < procurement_time:
+        zone = 'Critical'
+
+    return zone, round(remaining_percentage, 2)
+
+def _part_wear_rows(db: Session, equipment_ids: Optional[List[int]] = None):
+    stmt = select(
+        Part.equipment_id, Part.id, Part.name, Part.useful_life,
+        Part.stock_quantity, Part.procurement_time, PartState.last_replacement_date
+    ).outerjoin(
+        PartState,
+        and_(PartState.part_id == Part.id, PartState.equipment_id == Part.equipment_id)
+    )
+    if equipment_ids:
+        stmt = stmt.where(Part.equipment_id.in_(equipment_ids))
+    return db.execute(stmt.order_by(Part.equipment_id, Part.id)).all()
+
+def calculate_wear_rows(db: Session, current_date: date, equipment_ids: Optional[List[int]] = None,
+                        zone: Optional[str] = None) -> List[Dict[str, Any]]:
+    try:
+        results: List[Dict[str, Any]] = []
+        for equipment_id, part_id, name, useful_life, stock_quantity, procurement_time, last_date \
+                in _part_wear_rows(db, equipment_ids):
+            last_replacement_date = _as_date(last_date)
+            if not last_replacement_date:
+                part_zone, remaining_percentage = 'Unknown', 0.0
+            else:
+                part_zone, remaining_percentage = _wear_zone(
+                    useful_life, stock_quantity, procurement_time, last_replacement_date, current_date
+                )
+            if zone and part_zone != zone:
+                continue
+            results.append({
+                'equipment_id': equipment_id, 'part_id': part_id, 'part_name': name,
+                'zone': part_zone, 'remaining_percentage': remaining_percentage
+            })
+
+        logger.info('Calculated fleet wear for %s parts', len(results))
+        return results
+    except Exception:
+        logger.exception('Failed to calculate fleet wear for equipment_ids: %s', equipment_ids)
+        raise
+
+def calculate_wear_for_fleet(db: Session, current_date: date, equipment_ids: Optional[List[int]] = None,
+                             zone: Optional[str] = None) -> List[FleetWearResponse]:
+    return [FleetWearResponse.model_construct(**row)
+            for row in calculate_wear_rows(db, current_date, equipment_ids, zone)]
+
 def calculate_wear_for_equipment(db: Session, equipment_id: int, current_date: date = date.today()) -> List[WearResponse]:
     try:
-        equipment = get_equipment(db, equipment_id)
-        if not equipment:
-            logger.warning(f'Equipment not found for wear calculation: {equipment_id}')
+        rows = _part_wear_rows(db, [equipment_id])
+        if not rows:
+            logger.warning('No parts found for wear calculation in equipment_id: %s', equipment_id)
             return []
 
-        parts = get_parts(db, equipment_id)
-        replacements = get_replacements(db, equipment_id)
         results: List[WearResponse] = []
-
-        for part in parts:
-            if not part:
+        for row in rows:
+            last_replacement_date = _as_date(row.last_replacement_date)
+            if not last_replacement_date:
+                logger.warning('No replacements found for part: %s', row.name)
+                results.append(WearResponse(part_name=row.name, zone='Unknown', remaining_percentage=0.0))
                 continue
 
-            part_reps = sorted(
-                [r for r in replacements if r.part_id == part.id],
-                key=lambda r: r.replacement_date,
-                reverse=True
+            zone, remaining_percentage = _wear_zone(
+                row.useful_life, row.stock_quantity, row.procurement_time,
+                last_replacement_date, current_date
             )
+            results.append(WearResponse(part_name=row.name, zone=zone, remaining_percentage=remaining_percentage))
 
-            last_replacement_date = None
-            if part_reps:
-                raw = part_reps[0].replacement_date
-                if isinstance(raw, str):
-                    last_replacement_date = date.fromisoformat(raw)
-                else:
-                    last_replacement_date = raw
+        logger.info('Calculated wear for %s parts in equipment_id: %s', len(results), equipment_id)
+        return results
+    except Exception:
+        logger.exception('Failed to calculate wear for equipment_id: %s', equipment_id)
+        raise
 
-            if not last_replacement_date:
-                logger.warning(f'No replacements found for part: {part.name}')
-                results.append(WearResponse(part_name=part.name, zone='Unknown', remaining_percentage=0.0))
-                continue
+FORECAST_ZONES = ('Green', 'Yellow', 'Red', 'Critical', 'Unknown')
+MAX_FORECAST_POINTS = 3660
+
+def _wear_zone_matrix(useful_life: 'np.ndarray', stock_quantity: 'np.ndarray', procurement_time: 'np.ndarray',
+                      last_ordinals: 'np.ndarray', known: 'np.ndarray',
+                      day_ordinals: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+    """_wear_zone for every (part, day) pair at once; rows are parts, columns are days."""
+    import numpy as np
+
+    days_used = day_ordinals[np.newaxis, :] - last_ordinals[:, np.newaxis]
+    remaining_days = np.maximum(0, useful_life[:, np.newaxis] - days_used)
+    life = np.where(useful_life > 0, useful_life, 1)[:, np.newaxis]
+    remaining_percentage = np.where(useful_life[:, np.newaxis] > 0, remaining_days / life * 100, 0.0)
+
+    codes = np.where(remaining_percentage > GREEN_THRESHOLD, 0,
+                     np.where(remaining_percentage > YELLOW_THRESHOLD, 1, 2))
+    critical = (stock_quantity[:, np.newaxis] == 0) & (remaining_days < procurement_time[:, np.newaxis])
+    codes = np.where(critical, 3, codes)
 
-            days_used = (current_date - last_replacement_date).days
-            remaining_days = max(0, part.useful_life - days_used)
-            remaining_percentage = (remaining_days / part.useful_life * 100) if part.useful_life > 0 else 0.0
+    unknown = ~known
+    codes[unknown] = 4
+    remaining_percentage[unknown] = 0.0
+    return codes, np.round(remaining_percentage, 2)
 
-            if remaining_percentage > 25.0:
-                zone = 'Green'
-            elif remaining_percentage > 10.0:
-                zone = 'Yellow'
+def forecast_wear_for_equipment(db: Session, equipment_id: int, date_from: date, date_to: date,
+                                step_days: int = 1) -> Dict[str, Any]:
+    import numpy as np
+
+    try:
+        if date_to < date_from:
+            raise ValueError('Forecast end date must not be before its start date')
+        if step_days < 1:
+            raise ValueError('Forecast step must be at least one day')
+        points = (date_to - date_from).days // step_days + 1
+        if points > MAX_FORECAST_POINTS:
+            raise ValueError(f'Forecast is limited to {MAX_FORECAST_POINTS} points, requested {points}')
+
+        rows = _part_wear_rows(db, [equipment_id])
+        day_ordinals = date_from.toordinal() + np.arange(points, dtype=np.int64) * step_days
+        dates = [date.fromordinal(int(o)) for o in day_ordinals]
+        if not rows:
+            logger.warning('No parts found for wear forecast in equipment_id: %s', equipment_id)
+            return {'equipment_id': equipment_id, 'dates': dates, 'parts': []}
+
+        last_dates = [_as_date(row.last_replacement_date) for row in rows]
+        codes, remaining = _wear_zone_matrix(
+            np.array([row.useful_life for row in rows], dtype=np.int64),
+            np.array([row.stock_quantity for row in rows], dtype=np.int64),
+            np.array([row.procurement_time for row in rows], dtype=np.int64),
+            np.array([d.toordinal() if d else 0 for d in last_dates], dtype=np.int64),
+            np.array([d is not None for d in last_dates]),
+            day_ordinals,
+        )
+        zones = np.array(FORECAST_ZONES)[codes].tolist()
+        remaining = remaining.tolist()
+        parts = [
+            {'part_id': row.id, 'part_name': row.name, 'remaining_percentage': remaining[i], 'zone': zones[i]}
+            for i, row in enumerate(rows)
+        ]
+        logger.info('Forecast wear for %s parts over %s points in equipment_id: %s', len(parts), points, equipment_id)
+        return {'equipment_id': equipment_id, 'dates': dates, 'parts': parts}
+    except Exception:
+        logger.exception('Failed to forecast wear for equipment_id: %s', equipment_id)
+        raise
+
+ALERT_ZONES = ('Yellow', 'Red', 'Critical')
+ZONE_RANK = {'Green': 0, 'Yellow': 1, 'Red': 2, 'Critical': 3}
+ALERT_INSERT_BATCH_SIZE = 1000
+
+def _zone_transitions(useful_life: int, stock_quantity: int, procurement_time: int,
+                      last_replacement_date: date) -> List[Tuple[str, date]]:
+    """First day each alert zone is reached after the last replacement.
+
+    Zones only ever get worse as a part ages (Critical, once reached, stays),
+    so the first day of each zone is found by binary search over _wear_zone
+    itself and always agrees with the wear endpoints. A zone that is skipped,
+    e.g. Red when the part turns Critical first, has no transition.
+    """
+    def rank_at(offset: int) -> int:
+        zone, _ = _wear_zone(useful_life, stock_quantity, procurement_time,
+                             last_replacement_date, last_replacement_date + timedelta(days=offset))
+        return ZONE_RANK[zone]
+
+    # From useful_life days on nothing changes any more
+    horizon = max(useful_life, 0)
+    transitions = []
+    for zone in ALERT_ZONES:
+        rank = ZONE_RANK[zone]
+        if rank_at(horizon) < rank:
+            continue
+        lo, hi = 0, horizon
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if rank_at(mid) >= rank:
+                hi = mid
             else:
-                zone = 'Red'
+                lo = mid + 1
+        if rank_at(lo) == rank:
+            transitions.append((zone, last_replacement_date + timedelta(days=lo)))
+    return transitions
+
+def _wear_alert_rows(db: Session, key_filter=None) -> List[Dict[str, Any]]:
+    stmt = select(
+        PartState.equipment_id, PartState.part_id, PartState.last_replacement_date,
+        Part.useful_life, Part.stock_quantity, Part.procurement_time
+    ).join(Part, Part.id == PartState.part_id)
+    if key_filter is not None:
+        stmt = stmt.where(key_filter)
+    rows = []
+    for equipment_id, part_id, last_date, useful_life, stock_quantity, procurement_time in db.execute(stmt):
+        for zone, transition_date in _zone_transitions(useful_life, stock_quantity, procurement_time,
+                                                       _as_date(last_date)):
+            rows.append({'equipment_id': equipment_id, 'part_id': part_id,
+                         'zone': zone, 'transition_date': transition_date})
+    return rows
+
+def _insert_wear_alerts(db: Session, rows: List[Dict[str, Any]]) -> None:
+    for start in range(0, len(rows), ALERT_INSERT_BATCH_SIZE):
+        db.execute(insert(WearAlert), rows[start:start + ALERT_INSERT_BATCH_SIZE])
+
+def _refresh_wear_alerts(db: Session, keys: Set[Tuple[int, int]]) -> None:
+    keys = sorted(keys)
+    for start in range(0, len(keys), STATE_KEY_BATCH_SIZE):
+        batch = keys[start:start + STATE_KEY_BATCH_SIZE]
+        db.execute(
+            delete(WearAlert).where(tuple_(WearAlert.equipment_id, WearAlert.part_id).in_(batch)),
+            execution_options={'synchronize_session': False}
+        )
+        _insert_wear_alerts(db, _wear_alert_rows(db, tuple_(PartState.equipment_id, PartState.part_id).in_(batch)))
+
+def rebuild_wear_alerts(db: Session) -> int:
+    try:
+        db.execute(delete(WearAlert))
+        rows = _wear_alert_rows(db)
+        _insert_wear_alerts(db, rows)
+        db.commit()
+        logger.info('Rebuilt %s wear alerts', len(rows))
+        return len(rows)
+    except Exception:
+        db.rollback()
+        logger.exception('Failed to rebuild wear alerts')
+        raise
+
+def get_wear_alert_rows(db: Session, current_date: date, within_days: int, limit: int,
+                        zone: Optional[str] = None) -> List[Dict[str, Any]]:
+    try:
+        stmt = select(
+            WearAlert.equipment_id, WearAlert.part_id, Part.name.label('part_name'),
+            WearAlert.zone, WearAlert.transition_date
+        ).join(Part, Part.id == WearAlert.part_id).where(
+            WearAlert.transition_date >= current_date,
+            WearAlert.transition_date <= current_date + timedelta(days=within_days)
+        )
+        if zone:
+            stmt = stmt.where(WearAlert.zone == zone)
+        stmt = stmt.order_by(WearAlert.transition_date, WearAlert.equipment_id, WearAlert.part_id).limit(limit)
+        return _rows(db, stmt)
+    except Exception:
+        logger.exception('Failed to fetch wear alerts within %s days of %s', within_days, current_date)
+        raise
+
+def _month_start(db: Session, day):
+    if db.get_bind().dialect.name == 'sqlite':
+        return func.date(day, 'start of month')
+    return cast(func.date_trunc('month', day), Date)
+
+def rebuild_replacement_stats(db: Session) -> int:
+    try:
+        month = _month_start(db, Replacement.replacement_date)
+        key_columns = [getattr(Replacement, f) for f in STAT_KEY_FIELDS]
+        db.execute(delete(ReplacementStat))
+        db.execute(insert(ReplacementStat).from_select(
+            ['month', *STAT_KEY_FIELDS, 'replacement_count'],
+            select(month, *key_columns, func.count(Replacement.id)).group_by(month, *key_columns)
+        ))
+        db.commit()
+        count = db.query(func.count()).select_from(ReplacementStat).scalar()
+        logger.info('Rebuilt %s replacement stats rows', count)
+        return count
+    except Exception:
+        db.rollback()
+        logger.exception('Failed to rebuild replacement stats')
+        raise
+
+# group_by dimension -> (id column, name column joined in for display)
+STAT_DIMENSIONS = {
+    'month': (ReplacementStat.month, None),
+    'equipment': (ReplacementStat.equipment_id, Equipment.name.label('equipment_name')),
+    'part': (ReplacementStat.part_id, Part.name.label('part_name')),
+    'workshop': (ReplacementStat.workshop_id, Workshop.name.label('workshop_name')),
+    'replacement_type': (ReplacementStat.replacement_type_id, ReplacementType.name.label('replacement_type_name')),
+}
+STAT_JOINS = {
+    'equipment': (Equipment, Equipment.id == ReplacementStat.equipment_id),
+    'part': (Part, Part.id == ReplacementStat.part_id),
+    'workshop': (Workshop, Workshop.id == ReplacementStat.workshop_id),
+    'replacement_type': (ReplacementType, ReplacementType.id == ReplacementStat.replacement_type_id),
+}
+
+def get_replacement_stats_rows(db: Session, group_by: List[str], date_from: Optional[date] = None,
+                               date_to: Optional[date] = None, equipment_id: Optional[int] = None,
+                               part_id: Optional[int] = None, workshop_id: Optional[int] = None,
+                               replacement_type_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Replacement counts per group, read from the replacement_stats rollup.
+
+    Dates are rounded to whole months: date_from selects from the start of
+    its month, date_to up to the end of its month.
+    """
+    try:
+        dimensions = list(dict.fromkeys(group_by))
+        key_columns = [STAT_DIMENSIONS[d][0] for d in dimensions]
+        name_columns = [STAT_DIMENSIONS[d][1] for d in dimensions if STAT_DIMENSIONS[d][1] is not None]
+        stmt = select(*key_columns, *name_columns,
+                      func.coalesce(func.sum(ReplacementStat.replacement_count), 0).label('replacement_count'))
+        for dimension in dimensions:
+            if dimension in STAT_JOINS:
+                stmt = stmt.join(*STAT_JOINS[dimension])
+        if date_from:
+            stmt = stmt.where(ReplacementStat.month >= date_from.replace(day=1))
+        if date_to:
+            stmt = stmt.where(ReplacementStat.month <= date_to)
+        for field, value in (('equipment_id', equipment_id), ('part_id', part_id), ('workshop_id', workshop_id),
+                             ('replacement_type_id', replacement_type_id)):
+            if value:
+                stmt = stmt.where(getattr(ReplacementStat, field) == value)
+        if key_columns:
+            stmt = stmt.group_by(*key_columns, *name_columns).order_by(*key_columns)
+        return _rows(db, stmt)
+    except Exception:
+        logger.exception('Failed to fetch replacement stats grouped by %s', group_by)
+        raise
+
+def calculate_demand_rows(db: Session, current_date: date, horizon_days: int, equipment_id: Optional[int] = None,
+                          only_shortfall: bool = False) -> List[Dict[str, Any]]:
+    """Fleet consumption of every part over the horizon, vectorized over parts.
+
+    Every installed unit (fleet_quantity * quantity_per_equipment) is assumed
+    to be replaced once per useful_life, with unit ages spread evenly, so a
+    part is consumed at units / useful_life per day. Stock runs out on the
+    first day cumulative consumption exceeds stock_quantity; everything is
+    computed in integers so the stock-out date and shortfall never disagree.
+    """
+    import numpy as np
 
-            if part.stock_quantity == 0 and remaining_days < part.procurement_time:
-                zone = 'Critical'
+    try:
+        if horizon_days < 1:
+            raise ValueError('Horizon must be at least one day')
+        stmt = select(
+            Part.id, Part.name, Part.equipment_id, Part.useful_life, Part.quantity_per_equipment,
+            Part.stock_quantity, Part.procurement_time, Equipment.fleet_quantity
+        ).join(Equipment, Equipment.id == Part.equipment_id)
+        if equipment_id:
+            stmt = stmt.where(Part.equipment_id == equipment_id)
+        rows = db.execute(stmt.order_by(Part.id)).all()
+        if not rows:
+            return []
 
-            results.append(WearResponse(part_name=part.name, zone=zone, remaining_percentage=round(remaining_percentage, 2)))
+        columns = list(zip(*rows))
+        useful_life = np.array(columns[3], dtype=np.int64)
+        stock = np.array(columns[5], dtype=np.int64)
+        procurement_time = np.array(columns[6], dtype=np.int64)
+        units = np.array(columns[7], dtype=np.int64) * np.array(columns[4], dtype=np.int64)
 
-        logger.info(f'Calculated wear for {len(results)} parts in equipment_id: {equipment_id}')
+        daily_demand = units / useful_life
+        needed = -(-units * horizon_days // useful_life)
+        shortfall = np.maximum(0, needed - stock)
+        has_demand = units > 0
+        safe_units = np.where(has_demand, units, 1)
+        coverage_days = np.where(has_demand, stock * useful_life / safe_units, np.inf)
+        stock_out_offset = np.where(has_demand, stock * useful_life // safe_units + 1, horizon_days + 1)
+
+        today = current_date.toordinal()
+        expected = np.round(daily_demand * horizon_days, 2).tolist()
+        coverage_days = np.round(coverage_days, 1).tolist()
+        daily_demand = np.round(daily_demand, 4).tolist()
+        results = []
+        for i, (part_id, name, part_equipment_id, part_units, part_stock, part_shortfall, offset, lead_time,
+                has_part_demand) in enumerate(zip(
+                    columns[0], columns[1], columns[2], units.tolist(), stock.tolist(), shortfall.tolist(),
+                    stock_out_offset.tolist(), procurement_time.tolist(), has_demand.tolist())):
+            if only_shortfall and not part_shortfall:
+                continue
+            stock_out_date = date.fromordinal(today + offset) if offset <= horizon_days else None
+            results.append({
+                'part_id': part_id, 'part_name': name, 'equipment_id': part_equipment_id,
+                'fleet_units': part_units,
+                'daily_demand': daily_demand[i],
+                'expected_replacements': expected[i],
+                'stock_quantity': part_stock,
+                'coverage_days': coverage_days[i] if has_part_demand else None,
+                'stock_out_date': stock_out_date,
+                'shortfall': part_shortfall,
+                'order_by_date': stock_out_date - timedelta(days=lead_time) if stock_out_date else None,
+            })
+        logger.info('Calculated demand for %s parts over %s days', len(results), horizon_days)
         return results
     except Exception:
-        logger.exception(f'Failed to calculate wear for equipment_id: {equipment_id}')
+        logger.exception('Failed to calculate demand over %s days for equipment_id: %s', horizon_days, equipment_id)
         raise
 
+ORDER_DAYS = (10, 25)
+
+@lru_cache(maxsize=4096)
+def _latest_init_date(procurement_time: int, end_date: date, today: date) -> Optional[date]:
+    # A procurement initiated on day X is ordered on the earliest 10th/25th window
+    # of the following month, so the answer is always the last day of the month
+    # before the latest window that still delivers by end_date.
+    latest_order_date = end_date - timedelta(days=int(procurement_time))
+    month_start = latest_order_date.replace(day=1)
+    previous_month_start = (month_start - timedelta(days=1)).replace(day=1)
+
+    for window_month in (month_start, previous_month_start):
+        first_window = min(window_month.replace(day=day) for day in ORDER_DAYS)
+        if first_window <= latest_order_date:
+            candidate = window_month - timedelta(days=1)
+            return candidate if candidate >= today else None
+
+    return None
+
 def calculate_procurement_plan(db: Session, part_id: int, end_date: date) -> ProcurementResponse:
     try:
         if end_date < date.today():
-            logger.error(f'End date {end_date} is in the past')
+            logger.error('End date %s is in the past', end_date)
             raise ValueError('End date cannot be in the past')
 
         part = get_part(db, part_id)
         if not part:
-            logger.warning(f'Part not found for procurement plan: {part_id}')
+            logger.warning('Part not found for procurement plan: %s', part_id)
             return ProcurementResponse(part_name='', latest_init_date=None)
 
-        procurement_days = int(part.procurement_time)
-        candidate = end_date - timedelta(days=procurement_days)
-
-        while candidate >= date.today():
-            next_month = candidate + relativedelta(months=1)
-            try:
-                next_month_start = next_month.replace(day=1)
-            except Exception:
-                next_month_start = date(next_month.year, next_month.month, 1)
-
-            possible_proc_dates = []
-            try:
-                possible_proc_dates.append(next_month_start.replace(day=10))
-            except Exception:
-                pass
-            try:
-                possible_proc_dates.append(next_month_start.replace(day=25))
-            except Exception:
-                pass
-
-            proc_date = min((d for d in possible_proc_dates if d > candidate), default=None)
-            if proc_date:
-                delivery_date = proc_date + timedelta(days=procurement_days)
-                if delivery_date <= end_date:
-                    logger.info(f'Calculated procurement plan for part: {part.name}, latest init date: {candidate}')
-                    return ProcurementResponse(part_name=part.name, latest_init_date=candidate)
-
-            candidate -= timedelta(days=1)
-
-        logger.warning(f'No valid procurement date found for part: {part.name}')
-        return ProcurementResponse(part_name=part.name, latest_init_date=None)
-    except Exception:
-        logger.exception(f'Failed to calculate procurement plan for part_id: {part_id}')
-        raise
\ No newline at end of file
+        latest_init_date = _latest_init_date(part.procurement_time, end_date, date.today())
+        if latest_init_date is None:
+            logger.warning('No valid procurement date found for part: %s', part.name)
+        else:
+            logger.info('Calculated procurement plan for part: %s, latest init date: %s', part.name, latest_init_date)
+        return ProcurementResponse(part_id=part.id, part_name=part.name, latest_init_date=latest_init_date)
+    except Exception:
+        logger.exception('Failed to calculate procurement plan for part_id: %s', part_id)
+        raise
+
+def calculate_procurement_rows(db: Session, end_date: date, part_ids: Optional[List[int]] = None,
+                               equipment_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    try:
+        today = date.today()
+        if end_date < today:
+            logger.error('End date %s is in the past', end_date)
+            raise ValueError('End date cannot be in the past')
+
+        stmt = select(Part.id, Part.name, Part.procurement_time)
+        if part_ids:
+            stmt = stmt.where(Part.id.in_(part_ids))
+        if equipment_id:
+            stmt = stmt.where(Part.equipment_id == equipment_id)
+
+        results = [
+            {
+                'part_id': part_id, 'part_name': name,
+                'latest_init_date': _latest_init_date(procurement_time, end_date, today)
+            }
+            for part_id, name, procurement_time in db.execute(stmt.order_by(Part.id))
+        ]
+        logger.info('Calculated procurement plan for %s parts, end date: %s', len(results), end_date)
+        return results
+    except Exception:
+        logger.exception('Failed to calculate procurement plans for end date: %s', end_date)
+        raise
+
+def calculate_procurement_plans(db: Session, end_date: date, part_ids: Optional[List[int]] = None,
+                                equipment_id: Optional[int] = None) -> List[ProcurementResponse]:
+    return [ProcurementResponse.model_construct(**row)
+            for row in calculate_procurement_rows(db, end_date, part_ids, equipment_id)]
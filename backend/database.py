@@ -1,14 +1,115 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from functools import lru_cache
+from typing import Dict, List
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 import logging
-from .models import Base, Equipment, Part, Workshop, ReplacementType
+from .config import Settings, settings
+from .metrics import instrument_engine
+from .migrations import LATEST_VERSION, migrate, stored_version
+from .models import (
+    Base, Equipment, Part, Workshop, ReplacementType, Replacement, PartState, WearAlert, ReplacementStat
+)
 
 logger = logging.getLogger(__name__)
 
-DATABASE_URL = 'sqlite:////app/spare_parts.db'
+DATABASE_URL = settings.database_url
+DATABASE_READ_URL = settings.database_read_url or DATABASE_URL
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+def async_url(url: str) -> str:
+    scheme, rest = url.split('://', 1)
+    return f"{ASYNC_DRIVERS.get(scheme.split('+')[0], scheme)}://{rest}"
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == 'sqlite'
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and make_url(url).database in (None, '', ':memory:')
+
+def engine_options(url: str, config: Settings, read_only: bool = False) -> dict:
+    options = {}
+    if _is_sqlite(url):
+        options['connect_args'] = {'check_same_thread': False, 'timeout': config.sqlite_busy_timeout_ms / 1000}
+    elif read_only and make_url(url).get_backend_name() == 'postgresql':
+        options['execution_options'] = {'postgresql_readonly': True}
+    if not _is_sqlite_memory(url):
+        options.update(
+            pool_size=config.pool_size,
+            max_overflow=config.max_overflow,
+            pool_timeout=config.pool_timeout,
+            pool_recycle=config.pool_recycle,
+        )
+    return options
+
+def apply_sqlite_profile(engine: Engine, config: Settings, read_only: bool = False) -> None:
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f'PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}')
+            cursor.execute(f'PRAGMA journal_mode={config.sqlite_journal_mode}')
+            cursor.execute(f'PRAGMA synchronous={config.sqlite_synchronous}')
+            cursor.execute(f'PRAGMA cache_size={-int(config.sqlite_cache_size_kib)}')
+            cursor.execute(f'PRAGMA mmap_size={int(config.sqlite_mmap_size)}')
+            if read_only:
+                cursor.execute('PRAGMA query_only=ON')
+        finally:
+            cursor.close()
+
+def build_engine(url: str, config: Settings, read_only: bool = False) -> Engine:
+    engine = create_engine(url, **engine_options(url, config, read_only))
+    if _is_sqlite(url):
+        apply_sqlite_profile(engine, config, read_only)
+    if config.metrics_enabled:
+        instrument_engine(engine, config)
+    return engine
+
+def build_writer_engine(url: str, config: Settings) -> Engine:
+    """Engine for the group-commit writer, whose batches rely on SAVEPOINTs.
+
+    pysqlite defers BEGIN to the first DML statement, so a SAVEPOINT issued
+    first would open (and its RELEASE would commit) the outer transaction.
+    Taking transaction control away from the driver and starting with BEGIN
+    IMMEDIATE makes savepoints nest properly and takes the write lock up front.
+    """
+    engine = build_engine(url, config)
+    if _is_sqlite(url):
+        @event.listens_for(engine, 'connect')
+        def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, 'begin')
+        def _begin_immediate(conn):
+            conn.exec_driver_sql('BEGIN IMMEDIATE')
+    return engine
+
+engine = build_engine(DATABASE_URL, settings)
+if DATABASE_READ_URL == DATABASE_URL and (_is_sqlite_memory(DATABASE_URL) or not _is_sqlite(DATABASE_URL)):
+    # An in-memory database is private to its engine, and without a replica URL a
+    # second server-side pool would buy nothing, so reads share the writer engine.
+    read_engine = engine
+else:
+    read_engine = build_engine(DATABASE_READ_URL, settings, read_only=True)
 
-engine = create_engine(DATABASE_URL, connect_args={'check_same_thread': False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+ASYNC_DATABASE_URL = async_url(DATABASE_READ_URL)
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker:
+    # Built on first use by the ASYNC_DB routes: creating the engine imports the
+    # async driver (aiosqlite, asyncpg), which a sync-only deploy need not install
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, settings, read_only=True)
+    )
+    if _is_sqlite(ASYNC_DATABASE_URL):
+        apply_sqlite_profile(async_engine.sync_engine, settings, read_only=True)
+    if settings.metrics_enabled:
+        instrument_engine(async_engine.sync_engine, settings)
+    return async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 def get_db():
     db = SessionLocal()
@@ -17,72 +118,115 @@ def get_db():
     finally:
         db.close()
 
-def init_db():
+def get_read_db():
+    db = ReadSessionLocal()
     try:
-        Base.metadata.create_all(bind=engine)
-        logger.info('Database tables created successfully')
+        yield db
+    finally:
+        db.close()
 
-        db = SessionLocal()
-        try:
-            if db.query(Equipment).count() == 0:
-                equipments = [
-                    Equipment(name='Грузовик A', fleet_quantity=15),
-                    Equipment(name='Экскаватор B', fleet_quantity=8),
-                    Equipment(name='Погрузчик C', fleet_quantity=12),
-                    Equipment(name='Кран D', fleet_quantity=5),
-                    Equipment(name='Бульдозер E', fleet_quantity=10),
-                ]
-                db.add_all(equipments)
-                db.commit()
-                logger.info('Initialized 5 equipment records')
-
-            if db.query(Part).count() == 0:
-                equipments = db.query(Equipment).all()
-                parts = []
-                for eq in equipments:
-                    for i in range(1, 6):
-                        parts.append(Part(
-                            name=f'Запчасть {i} для {eq.name}',
-                            useful_life=365 * i,
-                            equipment_id=eq.id,
-                            quantity_per_equipment=2 + i % 3,
-                            stock_quantity=10 + i,
-                            procurement_time=7 + i * 3
-                        ))
-                db.add_all(parts)
-                db.commit()
-                logger.info(f'Initialized {len(parts)} part records')
-
-            if db.query(Workshop).count() == 0:
-                workshops = [
-                    Workshop(name='Центральный Гараж', address='Москва, ул. Ленина, 1'),
-                    Workshop(name='Северный Ремонт', address='Санкт-Петербург, Невский пр., 2'),
-                    Workshop(name='Южная Мастерская', address='Краснодар, ул. Мира, 3'),
-                    Workshop(name='Восточный Сервис', address='Владивосток, ул. Океанская, 4'),
-                    Workshop(name='Западный Депо', address='Калининград, ул. Канта, 5'),
-                ]
-                db.add_all(workshops)
-                db.commit()
-                logger.info('Initialized 5 workshop records')
-
-            if db.query(ReplacementType).count() == 0:
-                types = [
-                    ReplacementType(name='ремонт'),
-                    ReplacementType(name='плановая замена'),
-                    ReplacementType(name='внеплановая замена'),
-                    ReplacementType(name='профилактика'),
-                    ReplacementType(name='модернизация'),
-                ]
-                db.add_all(types)
-                db.commit()
-                logger.info('Initialized 5 replacement type records')
-
-        except Exception:
-            db.rollback()
-            logger.exception('Failed to initialize database with default data')
-            raise
-        finally:
-            db.close()
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+def init_schema(bind: Engine = None) -> List[int]:
+    """Create missing tables and apply pending migrations; returns the versions applied."""
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    applied = migrate(bind)
+    logger.info('Database schema is at version %s', LATEST_VERSION)
+    return applied
+
+def ensure_schema(bind: Engine = None, config: Settings = settings) -> int:
+    """Startup check: one cheap version lookup when the schema is current.
+
+    An outdated schema is migrated in place when AUTO_MIGRATE is on (the
+    default); otherwise startup fails and points at the CLI.
+    """
+    bind = bind or engine
+    version = stored_version(bind)
+    if version >= LATEST_VERSION:
+        return version
+    if not config.auto_migrate:
+        raise RuntimeError(
+            f'Database schema is at version {version}, expected {LATEST_VERSION}; '
+            'run `python -m backend.cli migrate`'
+        )
+    logger.warning('Database schema is at version %s, migrating to %s', version, LATEST_VERSION)
+    init_schema(bind)
+    return LATEST_VERSION
+
+SEED_EQUIPMENT = (
+    ('Грузовик A', 15),
+    ('Экскаватор B', 8),
+    ('Погрузчик C', 12),
+    ('Кран D', 5),
+    ('Бульдозер E', 10),
+)
+SEED_WORKSHOPS = (
+    ('Центральный Гараж', 'Москва, ул. Ленина, 1'),
+    ('Северный Ремонт', 'Санкт-Петербург, Невский пр., 2'),
+    ('Южная Мастерская', 'Краснодар, ул. Мира, 3'),
+    ('Восточный Сервис', 'Владивосток, ул. Океанская, 4'),
+    ('Западный Депо', 'Калининград, ул. Канта, 5'),
+)
+SEED_REPLACEMENT_TYPES = ('ремонт', 'плановая замена', 'внеплановая замена', 'профилактика', 'модернизация')
+SEED_PARTS_PER_EQUIPMENT = 5
+
+def _is_empty(db: Session, model) -> bool:
+    return db.execute(select(model).limit(1)).first() is None
+
+def seed_database(db: Session) -> Dict[str, int]:
+    """Fill empty reference tables with the demo data set.
+
+    Idempotent: a table that already has rows is left alone, so running it on
+    every deploy is safe. Each table is written with one executemany insert.
+    Derived tables (part_state, wear_alerts, replacement_stats) are rebuilt
+    when they are empty but the journal is not.
+    """
+    from .crud import rebuild_part_state, rebuild_replacement_stats, rebuild_wear_alerts
+
+    seeded: Dict[str, int] = {}
+    try:
+        if _is_empty(db, Equipment):
+            rows = [{'name': name, 'fleet_quantity': quantity} for name, quantity in SEED_EQUIPMENT]
+            db.execute(insert(Equipment), rows)
+            seeded['equipment'] = len(rows)
+
+        if _is_empty(db, Part):
+            rows = [
+                {
+                    'name': f'Запчасть {i} для {name}', 'useful_life': 365 * i, 'equipment_id': equipment_id,
+                    'quantity_per_equipment': 2 + i % 3, 'stock_quantity': 10 + i, 'procurement_time': 7 + i * 3,
+                }
+                for equipment_id, name in db.execute(select(Equipment.id, Equipment.name).order_by(Equipment.id))
+                for i in range(1, SEED_PARTS_PER_EQUIPMENT + 1)
+            ]
+            if rows:
+                db.execute(insert(Part), rows)
+                seeded['parts'] = len(rows)
+
+        if _is_empty(db, Workshop):
+            rows = [{'name': name, 'address': address} for name, address in SEED_WORKSHOPS]
+            db.execute(insert(Workshop), rows)
+            seeded['workshops'] = len(rows)
+
+        if _is_empty(db, ReplacementType):
+            rows = [{'name': name} for name in SEED_REPLACEMENT_TYPES]
+            db.execute(insert(ReplacementType), rows)
+            seeded['replacement_types'] = len(rows)
+        db.commit()
+        for table, count in seeded.items():
+            logger.info('Seeded %s %s records', count, table)
+
+        if _is_empty(db, PartState) and not _is_empty(db, Replacement):
+            seeded['part_state'] = rebuild_part_state(db)
+        if _is_empty(db, WearAlert) and not _is_empty(db, PartState):
+            seeded['wear_alerts'] = rebuild_wear_alerts(db)
+        if _is_empty(db, ReplacementStat) and not _is_empty(db, Replacement):
+            seeded['replacement_stats'] = rebuild_replacement_stats(db)
+        return seeded
     except Exception:
-        logger.exception('Failed to create database tables')
-        raise
\ No newline at end of file
+        db.rollback()
+        logger.exception('Failed to seed database')
+        raise
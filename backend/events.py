@@ -0,0 +1,104 @@
+import asyncio
+import itertools
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+RESYNC_EVENT = 'resync'
+HEARTBEAT = b': keep-alive\n\n'
+
+def sse_frame(event_id: int, event_type: str, data: Any) -> bytes:
+    return b'id: %d\nevent: %s\ndata: %s\n\n' % (event_id, event_type.encode(), orjson.dumps(data))
+
+class Subscription:
+    """One client's bounded buffer of encoded SSE frames.
+
+    A subscriber that falls behind by more than buffer_size frames loses its
+    backlog and gets a single resync event instead, telling it to refetch;
+    publishers never wait on a slow client.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, buffer_size: int):
+        self.loop = loop
+        self.dropped = 0
+        self._frames: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+
+    def offer(self, frame: bytes) -> None:
+        # Always runs on the subscriber's loop, so the queue needs no lock
+        try:
+            self._frames.put_nowait(frame)
+        except asyncio.QueueFull:
+            while not self._frames.empty():
+                self._frames.get_nowait()
+                self.dropped += 1
+            self._frames.put_nowait(sse_frame(0, RESYNC_EVENT, {'dropped': self.dropped}))
+
+    async def get(self) -> bytes:
+        return await self._frames.get()
+
+class EventBroker:
+    """In-process pub/sub fan-out for the /events stream.
+
+    publish() may be called from any thread: the event is encoded once and
+    handed to each subscriber's loop with call_soon_threadsafe. Publishers
+    check has_subscribers first so that nothing is computed for an empty room.
+    """
+
+    def __init__(self, buffer_size: int = 256):
+        self.buffer_size = buffer_size
+        self._subscribers: Set[Subscription] = set()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> Subscription:
+        subscription = Subscription(loop or asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        logger.info('Event subscriber connected, %s active', len(self._subscribers))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+        logger.info('Event subscriber disconnected, %s active', len(self._subscribers))
+
+    def publish(self, event_type: str, data: Any) -> int:
+        with self._lock:
+            subscribers = list(self._subscribers)
+            event_id = next(self._ids)
+        if not subscribers:
+            return 0
+        frame = sse_frame(event_id, event_type, data)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, frame)
+            except RuntimeError:
+                # The subscriber's loop is closed; its stream cleanup will unsubscribe it
+                pass
+        return len(subscribers)
+
+WearKey = Tuple[int, int]
+
+def zone_changes(before: Iterable[Dict[str, Any]], after: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Wear rows (as returned by calculate_wear_rows) whose zone differs between two snapshots."""
+    previous: Dict[WearKey, str] = {(row['equipment_id'], row['part_id']): row['zone'] for row in before}
+    changes = []
+    for row in after:
+        previous_zone = previous.get((row['equipment_id'], row['part_id']))
+        if previous_zone != row['zone']:
+            changes.append({**row, 'previous_zone': previous_zone})
+    return changes
+
+event_broker = EventBroker()
@@ -0,0 +1,47 @@
+import csv
+import io
+import json
+import logging
+from typing import Any, Dict, Iterator
+
+from .crud import EXPORT_COLUMNS, EXPORT_BATCH_SIZE, iter_replacement_rows
+from .database import ReadSessionLocal
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv; charset=utf-8'}
+
+def _ndjson_lines(rows: Iterator[tuple]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str, ensure_ascii=False) + '\n'
+
+def _csv_lines(rows: Iterator[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def stream_replacements(export_format: str, filters: Dict[str, Any]) -> Iterator[bytes]:
+    # The generator owns its session: it is consumed after the request's
+    # dependencies have been torn down, and must stay open for the whole export.
+    db = ReadSessionLocal()
+    try:
+        rows = iter_replacement_rows(db, **filters)
+        lines = _csv_lines(rows) if export_format == 'csv' else _ndjson_lines(rows)
+        chunk = []
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= EXPORT_BATCH_SIZE:
+                yield ''.join(chunk).encode('utf-8')
+                chunk = []
+        if chunk:
+            yield ''.join(chunk).encode('utf-8')
+        logger.info('Finished streaming %s export with filters: %s', export_format, filters)
+    finally:
+        db.close()
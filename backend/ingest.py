@@ -0,0 +1,98 @@
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, List, Tuple
+
+JSON_CONTENT_TYPES = {'application/json'}
+NDJSON_CONTENT_TYPES = {'application/x-ndjson', 'application/ndjson', 'application/jsonl'}
+CSV_CONTENT_TYPES = {'text/csv', 'application/csv'}
+
+class RowParseError(ValueError):
+    pass
+
+class UnsupportedMediaType(ValueError):
+    pass
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer = ''
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split('\n')
+        for line in lines:
+            yield line.rstrip('\r')
+    buffer += decoder.decode(b'', final=True)
+    if buffer:
+        yield buffer.rstrip('\r')
+
+async def _iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    row_number = 0
+    async for line in _iter_lines(chunks):
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            yield row_number, json.loads(line)
+        except ValueError as e:
+            yield row_number, RowParseError(f'Invalid JSON: {e}')
+
+async def _iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # Quoted fields may contain newlines, so a record ends only on a line that
+    # leaves the running quote count even.
+    record: List[str] = []
+    quotes = 0
+    async for line in _iter_lines(chunks):
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield '\n'.join(record)
+            record, quotes = [], 0
+    if record:
+        yield '\n'.join(record)
+
+async def _iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    header = None
+    row_number = 0
+    async for text in _iter_csv_records(chunks):
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, RowParseError(f'Expected {len(header)} columns, got {len(values)}')
+            continue
+        yield row_number, dict(zip(header, values))
+
+async def _iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    body = b''.join([chunk async for chunk in chunks])
+    try:
+        records = json.loads(body)
+    except ValueError as e:
+        raise RowParseError(f'Invalid JSON: {e}')
+    if not isinstance(records, list):
+        raise RowParseError('Expected a JSON array of replacements')
+    for row_number, record in enumerate(records, start=1):
+        yield row_number, record
+
+def iter_records(content_type: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    media_type = content_type.split(';')[0].strip().lower()
+    if media_type in JSON_CONTENT_TYPES:
+        return _iter_json_array(chunks)
+    if media_type in NDJSON_CONTENT_TYPES:
+        return _iter_ndjson(chunks)
+    if media_type in CSV_CONTENT_TYPES:
+        return _iter_csv(chunks)
+    raise UnsupportedMediaType(f'Unsupported content type: {media_type or "none"}')
+
+async def iter_batches(records: AsyncIterator[Tuple[int, Any]], size: int) -> AsyncIterator[List[Tuple[int, Any]]]:
+    batch: List[Tuple[int, Any]] = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
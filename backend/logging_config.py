@@ -0,0 +1,139 @@
+import atexit
+import logging
+import queue
+import random
+import threading
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+import orjson
+
+from .config import Settings
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_REQUEST_ID_KEY = REQUEST_ID_HEADER.lower().encode()
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
+
+request_id_var: ContextVar[str] = ContextVar('request_id', default='-')
+
+class RequestIdFilter(logging.Filter):
+    # Runs on the calling thread, where the request context is still available
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of records at or below max_level; everything above always passes."""
+
+    def __init__(self, rate: float, max_level: int = logging.INFO):
+        super().__init__()
+        self.rate = rate
+        self.max_level = max_level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > self.max_level or self.rate >= 1 or random.random() < self.rate
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller.
+
+    Records are handed over unformatted, so %-interpolation and JSON encoding
+    happen on the listener thread. When the queue is full because the disk
+    can't keep up, the record is dropped and counted instead.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str).decode()
+
+_queue_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+def configure_logging(config: Settings, logger_name: str = 'backend') -> DroppingQueueHandler:
+    """Route the backend's loggers through a bounded queue to a background writer.
+
+    Safe to call more than once; only the first call installs handlers.
+    """
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        return _queue_handler
+
+    file_handler = RotatingFileHandler(
+        config.log_file, maxBytes=config.log_max_bytes, backupCount=config.log_backup_count, encoding='utf-8'
+    )
+    file_handler.setFormatter(JsonFormatter() if config.log_format == 'json' else logging.Formatter(TEXT_FORMAT))
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=config.log_queue_size))
+    handler.addFilter(RequestIdFilter())
+    if config.log_sample_rate < 1:
+        handler.addFilter(SamplingFilter(config.log_sample_rate))
+
+    logger = logging.getLogger(logger_name)
+    logger.setLevel(config.log_level.upper())
+    logger.addHandler(handler)
+
+    _listener = QueueListener(handler.queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    _queue_handler = handler
+    return handler
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+class RequestIdMiddleware:
+    """Takes X-Request-ID from the client (or generates one), exposes it to log
+    records through request_id_var and echoes it on the response."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope['headers']:
+            if name == _REQUEST_ID_KEY:
+                request_id = value.decode('latin-1')[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = [*message.get('headers', []), (_REQUEST_ID_KEY, request_id.encode('latin-1'))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
@@ -1,37 +1,125 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from .database import init_db, get_db
+from .cache import ResponseCache
+from .config import settings
+from .database import DATABASE_URL, ReadSessionLocal, build_writer_engine, ensure_schema, get_db, get_read_db
+from .events import HEARTBEAT, event_broker, zone_changes
+from .export import MEDIA_TYPES, stream_replacements
+from .logging_config import RequestIdMiddleware, configure_logging
+from .metrics import MetricsMiddleware, metrics
+from .ingest import RowParseError, UnsupportedMediaType, iter_records, iter_batches
+from .write_queue import WriteQueue, WriteQueueFull
 from .crud import (
-    create_equipment, get_equipments, get_equipment,
-    create_part, get_parts, get_part,
-    create_workshop, get_workshops, get_workshop,
-    create_replacement_type, get_replacement_types, get_replacement_type,
-    create_replacement, get_replacements, update_replacement,
-    calculate_wear_for_equipment, calculate_procurement_plan
+    create_equipment, get_equipment_rows, get_equipment,
+    create_part, get_part_rows, get_part, update_part, search_part_rows,
+    create_workshop, get_workshop_rows, get_workshop,
+    create_replacement_type, get_replacement_type_rows, get_replacement_type,
+    create_replacement, add_replacement, get_replacement_rows, update_replacement, apply_replacement_update,
+    get_replacement_equipment_ids,
+    load_reference_ids, find_unknown_references, bulk_create_replacements, BULK_CHUNK_SIZE, bulk_update_replacements,
+    calculate_wear_for_equipment, calculate_wear_rows, forecast_wear_for_equipment, get_wear_alert_rows,
+    calculate_procurement_plan, calculate_procurement_rows, calculate_demand_rows, get_replacement_stats_rows
 )
 from .schemas import (
     EquipmentCreate, EquipmentResponse,
-    PartCreate, PartResponse,
+    PartCreate, PartResponse, PartPatch,
     WorkshopCreate, WorkshopResponse,
     ReplacementTypeCreate, ReplacementTypeResponse,
-    ReplacementCreate, ReplacementResponse,
-    WearResponse, ProcurementResponse
+    ReplacementCreate, ReplacementResponse, ReplacementPatch, BulkInsertResponse,
+    WearResponse, WearZone, FleetWearResponse, WearForecastResponse,
+    AlertZone, WearAlertResponse, DemandResponse, StatsDimension, ReplacementStatsResponse, ProcurementResponse
 )
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import Dict, List, Literal, Optional, Tuple
 from datetime import date
 import logging
-from logging.handlers import RotatingFileHandler
+import orjson
 from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+import asyncio
 
+configure_logging(settings)
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-handler = RotatingFileHandler('app.log', maxBytes=1000000, backupCount=5)
-handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-logger.addHandler(handler)
 
-app = FastAPI(title='Spare Parts Journal API')
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Only a schema-version lookup runs here; table creation and demo data
+    # are `python -m backend.cli migrate` and `seed`, run once per deploy
+    # instead of in every worker.
+    version = await run_in_threadpool(ensure_schema)
+    logger.info('Startup complete, schema version %s', version)
+    yield
+    if write_queue is not None:
+        await run_in_threadpool(write_queue.stop)
 
-init_db()
+app = FastAPI(title='Spare Parts Journal API', lifespan=lifespan)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
+
+if settings.async_db:
+    # Registered first so these async handlers shadow the sync ones below
+    from .async_api import router as async_router
+    app.include_router(async_router)
+
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+response_cache = ResponseCache(settings.response_cache_size)
+
+# With WRITE_QUEUE=1 single-replacement writes are committed in groups by one
+# writer thread per process instead of one transaction per request.
+write_queue: Optional[WriteQueue] = None
+if settings.write_queue_enabled:
+    write_queue = WriteQueue(
+        sessionmaker(autocommit=False, autoflush=False, bind=build_writer_engine(DATABASE_URL, settings)),
+        settings.write_batch_size, settings.write_batch_delay_ms, settings.write_queue_size
+    )
+
+async def queued_write(fn, *args):
+    try:
+        future = write_queue.submit(fn, *args)
+    except WriteQueueFull:
+        logger.warning('Write queue is full, rejecting %s', fn.__name__)
+        raise HTTPException(status_code=503, detail='Too many pending writes, retry later')
+    return await asyncio.wrap_future(future)
+
+EVENT_HEARTBEAT_SECONDS = 15
+
+def wear_snapshot(equipment_ids) -> Optional[List[dict]]:
+    # Zone diffs cost two wear reads per write, so they are only computed
+    # while somebody is listening on /events
+    if not event_broker.has_subscribers or not equipment_ids:
+        return None
+    with ReadSessionLocal() as db:
+        return calculate_wear_rows(db, date.today(), sorted(set(equipment_ids)))
+
+def replacement_equipment_ids(replacement_ids: List[int]) -> List[int]:
+    if not event_broker.has_subscribers:
+        return []
+    with ReadSessionLocal() as db:
+        return sorted(get_replacement_equipment_ids(db, replacement_ids))
+
+def publish_replacement_events(event_type: str, replacements, equipment_ids, wear_before: Optional[List[dict]]) -> None:
+    for replacement in replacements:
+        event_broker.publish(event_type, replacement.model_dump())
+    if wear_before is not None:
+        for change in zone_changes(wear_before, wear_snapshot(equipment_ids) or []):
+            event_broker.publish('wear.zone_changed', change)
+
+# List and calculation endpoints read plain dict rows from crud and serialize
+# them with orjson directly; the rows already have the response schema's shape,
+# so running them through response_model validation again would only cost time.
+
+def next_cursor_headers(rows: List[dict], limit: Optional[int]) -> Dict[str, str]:
+    if limit is not None and len(rows) == limit:
+        return {NEXT_CURSOR_HEADER: str(rows[-1]['id'])}
+    return {}
+
+def page_body(rows: List[dict], limit: Optional[int]) -> Tuple[bytes, Dict[str, str]]:
+    return orjson.dumps(rows), next_cursor_headers(rows, limit)
 
 @app.get('/')
 def read_root():
@@ -39,7 +127,7 @@ def read_root():
     return {'message': 'Welcome to Spare Parts Journal API. Use /docs for API documentation.'}
 
 @app.get('/health')
-def health_check(db: Session = Depends(get_db)):
+def health_check(db: Session = Depends(get_read_db)):
     try:
         db.execute(text('SELECT 1'))
         logger.info('Health check: database is healthy')
@@ -48,197 +136,521 @@ def health_check(db: Session = Depends(get_db)):
         logger.exception('Health check failed: database connection error')
         raise HTTPException(status_code=500, detail='Database connection error')
 
+@app.get('/metrics', include_in_schema=False)
+def metrics_endpoint():
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail='Metrics are disabled')
+    return Response(metrics.render(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.post('/equipment/', response_model=EquipmentResponse)
 def api_create_equipment(equipment: EquipmentCreate, db: Session = Depends(get_db)):
     try:
         result = create_equipment(db, equipment)
-        logger.info(f'Successfully created equipment: {equipment.name}')
+        response_cache.bump('equipment')
+        logger.info('Successfully created equipment: %s', equipment.name)
         return result
     except Exception:
-        logger.exception(f'Error creating equipment: {equipment.name}')
+        logger.exception('Error creating equipment: %s', equipment.name)
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.get('/equipment/', response_model=List[EquipmentResponse])
-def api_get_equipments(db: Session = Depends(get_db)):
+def api_get_equipments(
+    request: Request,
+    cursor: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db)
+):
+    def load():
+        equipments = get_equipment_rows(db, cursor, limit)
+        logger.info('Fetched %s equipments', len(equipments))
+        return page_body(equipments, limit)
+
     try:
-        equipments = get_equipments(db)
-        logger.info(f'Fetched {len(equipments)} equipments')
-        return equipments
+        return response_cache.respond(request, 'equipment', load)
     except Exception:
         logger.exception('Error fetching equipments')
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.get('/equipment/{equipment_id}', response_model=EquipmentResponse)
-def api_get_equipment(equipment_id: int, db: Session = Depends(get_db)):
+def api_get_equipment(equipment_id: int, db: Session = Depends(get_read_db)):
     try:
         db_equip = get_equipment(db, equipment_id)
         if not db_equip:
-            logger.error(f'Equipment not found with ID: {equipment_id}')
+            logger.error('Equipment not found with ID: %s', equipment_id)
             raise HTTPException(status_code=404, detail='Equipment not found')
         return db_equip
     except HTTPException:
         raise
     except Exception:
-        logger.exception(f'Error fetching equipment with ID: {equipment_id}')
+        logger.exception('Error fetching equipment with ID: %s', equipment_id)
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.post('/parts/', response_model=PartResponse)
 def api_create_part(part: PartCreate, db: Session = Depends(get_db)):
     try:
         result = create_part(db, part)
-        logger.info(f'Successfully created part: {part.name}')
+        response_cache.bump('parts')
+        logger.info('Successfully created part: %s', part.name)
         return result
     except Exception:
-        logger.exception(f'Error creating part: {part.name}')
+        logger.exception('Error creating part: %s', part.name)
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.get('/parts/', response_model=List[PartResponse])
-def api_get_parts(equipment_id: Optional[int] = None, db: Session = Depends(get_db)):
+def api_get_parts(
+    request: Request,
+    equipment_id: Optional[int] = None,
+    name_prefix: Optional[str] = None,
+    cursor: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db)
+):
+    def load():
+        parts = get_part_rows(db, equipment_id, name_prefix, cursor, limit)
+        logger.info('Fetched %s parts for equipment_id: %s', len(parts), equipment_id)
+        return page_body(parts, limit)
+
     try:
-        parts = get_parts(db, equipment_id)
-        logger.info(f'Fetched {len(parts)} parts for equipment_id: {equipment_id}')
-        return parts
+        return response_cache.respond(request, 'parts', load)
     except Exception:
-        logger.exception(f'Error fetching parts for equipment_id: {equipment_id}')
+        logger.exception('Error fetching parts for equipment_id: %s', equipment_id)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+MAX_SEARCH_RESULTS = 100
+
+# Declared before /parts/{part_id} so that 'search' is not parsed as an id
+@app.get('/parts/search', response_model=List[PartResponse])
+def api_search_parts(
+    q: str = Query('', max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    equipment_id: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
+    # Not put in response_cache: every keystroke is a new key and would push
+    # the reference lists out of the LRU, and the FTS lookup is cheap anyway
+    try:
+        return ORJSONResponse(search_part_rows(db, q, limit, equipment_id))
+    except Exception:
+        logger.exception('Error searching parts for %r', q)
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.get('/parts/{part_id}', response_model=PartResponse)
-def api_get_part(part_id: int, db: Session = Depends(get_db)):
+def api_get_part(part_id: int, db: Session = Depends(get_read_db)):
     try:
         db_part = get_part(db, part_id)
         if not db_part:
-            logger.error(f'Part not found with ID: {part_id}')
+            logger.error('Part not found with ID: %s', part_id)
             raise HTTPException(status_code=404, detail='Part not found')
         return db_part
     except HTTPException:
         raise
     except Exception:
-        logger.exception(f'Error fetching part with ID: {part_id}')
+        logger.exception('Error fetching part with ID: %s', part_id)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@app.patch('/parts/{part_id}', response_model=PartResponse)
+def api_update_part(part_id: int, patch: PartPatch, db: Session = Depends(get_db)):
+    try:
+        updated = update_part(db, part_id, patch)
+        if not updated:
+            logger.error('Part not found with ID: %s', part_id)
+            raise HTTPException(status_code=404, detail='Part not found')
+        response_cache.bump('parts')
+        return updated
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception('Error updating part with ID: %s', part_id)
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.post('/workshops/', response_model=WorkshopResponse)
 def api_create_workshop(workshop: WorkshopCreate, db: Session = Depends(get_db)):
     try:
         result = create_workshop(db, workshop)
-        logger.info(f'Successfully created workshop: {workshop.name}')
+        response_cache.bump('workshops')
+        logger.info('Successfully created workshop: %s', workshop.name)
         return result
     except Exception:
-        logger.exception(f'Error creating workshop: {workshop.name}')
+        logger.exception('Error creating workshop: %s', workshop.name)
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.get('/workshops/', response_model=List[WorkshopResponse])
-def api_get_workshops(db: Session = Depends(get_db)):
+def api_get_workshops(
+    request: Request,
+    cursor: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db)
+):
+    def load():
+        workshops = get_workshop_rows(db, cursor, limit)
+        logger.info('Fetched %s workshops', len(workshops))
+        return page_body(workshops, limit)
+
     try:
-        workshops = get_workshops(db)
-        logger.info(f'Fetched {len(workshops)} workshops')
-        return workshops
+        return response_cache.respond(request, 'workshops', load)
     except Exception:
         logger.exception('Error fetching workshops')
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.get('/workshops/{workshop_id}', response_model=WorkshopResponse)
-def api_get_workshop(workshop_id: int, db: Session = Depends(get_db)):
+def api_get_workshop(workshop_id: int, db: Session = Depends(get_read_db)):
     try:
         db_workshop = get_workshop(db, workshop_id)
         if not db_workshop:
-            logger.error(f'Workshop not found with ID: {workshop_id}')
+            logger.error('Workshop not found with ID: %s', workshop_id)
             raise HTTPException(status_code=404, detail='Workshop not found')
         return db_workshop
     except HTTPException:
         raise
     except Exception:
-        logger.exception(f'Error fetching workshop with ID: {workshop_id}')
+        logger.exception('Error fetching workshop with ID: %s', workshop_id)
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.post('/replacement_types/', response_model=ReplacementTypeResponse)
 def api_create_replacement_type(replacement_type: ReplacementTypeCreate, db: Session = Depends(get_db)):
     try:
         result = create_replacement_type(db, replacement_type)
-        logger.info(f'Successfully created replacement type: {replacement_type.name}')
+        response_cache.bump('replacement_types')
+        logger.info('Successfully created replacement type: %s', replacement_type.name)
         return result
     except Exception:
-        logger.exception(f'Error creating replacement type: {replacement_type.name}')
+        logger.exception('Error creating replacement type: %s', replacement_type.name)
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.get('/replacement_types/', response_model=List[ReplacementTypeResponse])
-def api_get_replacement_types(db: Session = Depends(get_db)):
+def api_get_replacement_types(
+    request: Request,
+    cursor: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db)
+):
+    def load():
+        types = get_replacement_type_rows(db, cursor, limit)
+        logger.info('Fetched %s replacement types', len(types))
+        return page_body(types, limit)
+
     try:
-        types = get_replacement_types(db)
-        logger.info(f'Fetched {len(types)} replacement types')
-        return types
+        return response_cache.respond(request, 'replacement_types', load)
     except Exception:
         logger.exception('Error fetching replacement types')
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.get('/replacement_types/{type_id}', response_model=ReplacementTypeResponse)
-def api_get_replacement_type(type_id: int, db: Session = Depends(get_db)):
+def api_get_replacement_type(type_id: int, db: Session = Depends(get_read_db)):
     try:
         db_type = get_replacement_type(db, type_id)
         if not db_type:
-            logger.error(f'Replacement type not found with ID: {type_id}')
+            logger.error('Replacement type not found with ID: %s', type_id)
             raise HTTPException(status_code=404, detail='Replacement type not found')
         return db_type
     except HTTPException:
         raise
     except Exception:
-        logger.exception(f'Error fetching replacement type with ID: {type_id}')
+        logger.exception('Error fetching replacement type with ID: %s', type_id)
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.post('/replacements/', response_model=ReplacementResponse)
-def api_create_replacement(replacement: ReplacementCreate, db: Session = Depends(get_db)):
+async def api_create_replacement(replacement: ReplacementCreate, db: Session = Depends(get_db)):
     try:
-        result = create_replacement(db, replacement)
-        logger.info(f'Successfully created replacement for part_id: {replacement.part_id}')
+        wear_before = await run_in_threadpool(wear_snapshot, [replacement.equipment_id])
+        if write_queue is not None:
+            result = await queued_write(add_replacement, replacement)
+        else:
+            result = await run_in_threadpool(create_replacement, db, replacement)
+        logger.info('Successfully created replacement for part_id: %s', replacement.part_id)
+        await run_in_threadpool(
+            publish_replacement_events, 'replacement.created', [result], [replacement.equipment_id], wear_before
+        )
         return result
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception('Error creating replacement for part_id: %s', replacement.part_id)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@app.post('/replacements/bulk', response_model=BulkInsertResponse)
+async def api_bulk_create_replacements(request: Request, db: Session = Depends(get_db)):
+    try:
+        records = iter_records(request.headers.get('content-type', ''), request.stream())
+        reference_ids = await run_in_threadpool(load_reference_ids, db)
+        inserted = 0
+        errors = []
+        async for batch in iter_batches(records, BULK_CHUNK_SIZE):
+            rows = []
+            for row_number, record in batch:
+                if isinstance(record, RowParseError):
+                    errors.append({'row': row_number, 'error': str(record)})
+                else:
+                    rows.append((row_number, record))
+            batch_inserted, batch_errors = await run_in_threadpool(bulk_create_replacements, db, rows, reference_ids)
+            inserted += batch_inserted
+            errors.extend(error.model_dump() for error in batch_errors)
+        errors.sort(key=lambda error: error['row'])
+        logger.info('Bulk upload finished: %s inserted, %s rejected', inserted, len(errors))
+        if inserted:
+            # Rows are streamed and not kept, so subscribers get a summary and refetch
+            event_broker.publish('replacements.bulk_created', {'inserted': inserted})
+        return {'inserted': inserted, 'errors': errors}
+    except UnsupportedMediaType as e:
+        logger.error('Invalid bulk replacement payload: %s', e)
+        raise HTTPException(status_code=415, detail=str(e))
+    except RowParseError as e:
+        logger.error('Invalid bulk replacement payload: %s', e)
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception:
-        logger.exception(f'Error creating replacement for part_id: {replacement.part_id}')
+        logger.exception('Error bulk creating replacements')
         raise HTTPException(status_code=500, detail='Internal server error')
 
+@app.get('/replacements/export')
+def api_export_replacements(
+    export_format: Literal['ndjson', 'csv'] = Query('ndjson', alias='format'),
+    equipment_id: Optional[int] = None,
+    part_id: Optional[int] = None,
+    workshop_id: Optional[int] = None,
+    replacement_type_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+):
+    filters = {
+        'equipment_id': equipment_id, 'part_id': part_id, 'workshop_id': workshop_id,
+        'replacement_type_id': replacement_type_id, 'date_from': date_from, 'date_to': date_to
+    }
+    logger.info('Starting %s export of replacements with filters: %s', export_format, filters)
+    return StreamingResponse(
+        stream_replacements(export_format, filters),
+        media_type=MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="replacements.{export_format}"'}
+    )
+
 @app.get('/replacements/', response_model=List[ReplacementResponse])
-def api_get_replacements(equipment_id: Optional[int] = None, db: Session = Depends(get_db)):
+def api_get_replacements(
+    equipment_id: Optional[int] = None,
+    part_id: Optional[int] = None,
+    workshop_id: Optional[int] = None,
+    replacement_type_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    cursor: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db)
+):
+    try:
+        replacements = get_replacement_rows(
+            db, equipment_id, part_id, workshop_id, replacement_type_id,
+            date_from, date_to, cursor, limit
+        )
+        logger.info('Fetched %s replacements for equipment_id: %s', len(replacements), equipment_id)
+        return ORJSONResponse(replacements, headers=next_cursor_headers(replacements, limit))
+    except Exception:
+        logger.exception('Error fetching replacements for equipment_id: %s', equipment_id)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@app.patch('/replacements/', response_model=List[ReplacementResponse])
+def api_bulk_update_replacements(patches: List[ReplacementPatch], db: Session = Depends(get_db)):
     try:
-        replacements = get_replacements(db, equipment_id)
-        logger.info(f'Fetched {len(replacements)} replacements for equipment_id: {equipment_id}')
-        return replacements
+        if not patches:
+            return []
+        unknown = find_unknown_references(db, [p.model_dump(exclude_unset=True) for p in patches])
+        if unknown:
+            logger.error('Bulk update references unknown ids: %s', unknown)
+            raise HTTPException(status_code=422, detail=', '.join(
+                f'Unknown {field}: {ids}' for field, ids in unknown.items()
+            ))
+        equipment_ids = replacement_equipment_ids([p.id for p in patches])
+        equipment_ids += [p.equipment_id for p in patches if p.equipment_id is not None]
+        wear_before = wear_snapshot(equipment_ids)
+        updated = bulk_update_replacements(db, patches)
+        if updated is None:
+            logger.error('Bulk update references unknown replacements: %s', [p.id for p in patches])
+            raise HTTPException(status_code=404, detail='Replacement not found')
+        logger.info('Successfully updated %s replacements', len(updated))
+        publish_replacement_events('replacement.updated', updated, equipment_ids, wear_before)
+        return updated
+    except HTTPException:
+        raise
     except Exception:
-        logger.exception(f'Error fetching replacements for equipment_id: {equipment_id}')
+        logger.exception('Error bulk updating %s replacements', len(patches))
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.put('/replacements/{replacement_id}', response_model=ReplacementResponse)
-def api_update_replacement(replacement_id: int, replacement: ReplacementCreate, db: Session = Depends(get_db)):
+async def api_update_replacement(replacement_id: int, replacement: ReplacementCreate, db: Session = Depends(get_db)):
     try:
-        updated = update_replacement(db, replacement_id, replacement.model_dump())
+        equipment_ids = await run_in_threadpool(replacement_equipment_ids, [replacement_id])
+        equipment_ids.append(replacement.equipment_id)
+        wear_before = await run_in_threadpool(wear_snapshot, equipment_ids)
+        if write_queue is not None:
+            updated = await queued_write(apply_replacement_update, replacement_id, replacement.model_dump())
+        else:
+            updated = await run_in_threadpool(update_replacement, db, replacement_id, replacement.model_dump())
         if not updated:
-            logger.error(f'Replacement not found with ID: {replacement_id}')
+            logger.error('Replacement not found with ID: %s', replacement_id)
             raise HTTPException(status_code=404, detail='Replacement not found')
+        await run_in_threadpool(publish_replacement_events, 'replacement.updated', [updated], equipment_ids, wear_before)
         return updated
     except HTTPException:
         raise
     except Exception:
-        logger.exception(f'Error updating replacement with ID: {replacement_id}')
+        logger.exception('Error updating replacement with ID: %s', replacement_id)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@app.get('/events')
+async def api_events():
+    # Event types: replacement.created, replacement.updated, replacements.bulk_created,
+    # wear.zone_changed, and resync when this client fell behind and must refetch
+    subscription = event_broker.subscribe()
+
+    async def stream():
+        try:
+            yield b'retry: 3000\n\n'
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscription.get(), EVENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(), media_type='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.get('/wear/', response_model=List[FleetWearResponse])
+def api_get_fleet_wear(
+    equipment_ids: Optional[List[int]] = Query(None),
+    zone: Optional[WearZone] = None,
+    current_date: Optional[date] = None,
+    db: Session = Depends(get_read_db)
+):
+    try:
+        if current_date is None:
+            current_date = date.today()
+        wear = calculate_wear_rows(db, current_date, equipment_ids, zone)
+        logger.info('Calculated fleet wear for %s parts', len(wear))
+        return ORJSONResponse(wear)
+    except Exception:
+        logger.exception('Error calculating fleet wear for equipment_ids: %s', equipment_ids)
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.get('/wear/{equipment_id}', response_model=List[WearResponse])
-def api_get_wear(equipment_id: int, current_date: Optional[date] = None, db: Session = Depends(get_db)):
+def api_get_wear(equipment_id: int, current_date: Optional[date] = None, db: Session = Depends(get_read_db)):
     try:
         if current_date is None:
             current_date = date.today()
         wear = calculate_wear_for_equipment(db, equipment_id, current_date)
-        logger.info(f'Calculated wear for equipment_id: {equipment_id}')
+        logger.info('Calculated wear for equipment_id: %s', equipment_id)
         return wear
     except Exception:
-        logger.exception(f'Error calculating wear for equipment_id: {equipment_id}')
+        logger.exception('Error calculating wear for equipment_id: %s', equipment_id)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@app.get('/wear/{equipment_id}/forecast', response_model=WearForecastResponse)
+def api_get_wear_forecast(
+    equipment_id: int,
+    date_to: date = Query(..., alias='to'),
+    date_from: Optional[date] = Query(None, alias='from'),
+    step: int = Query(1, ge=1),
+    db: Session = Depends(get_read_db)
+):
+    try:
+        if date_from is None:
+            date_from = date.today()
+        forecast = forecast_wear_for_equipment(db, equipment_id, date_from, date_to, step)
+        logger.info('Forecast wear for equipment_id: %s', equipment_id)
+        return ORJSONResponse(forecast)
+    except ValueError as ve:
+        logger.error('Invalid input for wear forecast: %s', ve)
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception:
+        logger.exception('Error forecasting wear for equipment_id: %s', equipment_id)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@app.get('/alerts/', response_model=List[WearAlertResponse])
+def api_get_wear_alerts(
+    within_days: int = Query(30, ge=0, le=3660),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    zone: Optional[AlertZone] = None,
+    current_date: Optional[date] = None,
+    db: Session = Depends(get_read_db)
+):
+    try:
+        if current_date is None:
+            current_date = date.today()
+        alerts = get_wear_alert_rows(db, current_date, within_days, limit, zone)
+        logger.info('Fetched %s wear alerts within %s days', len(alerts), within_days)
+        return ORJSONResponse(alerts)
+    except Exception:
+        logger.exception('Error fetching wear alerts within %s days', within_days)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@app.get('/demand/', response_model=List[DemandResponse])
+def api_get_demand(
+    horizon_days: int = Query(365, ge=1, le=3660),
+    equipment_id: Optional[int] = None,
+    only_shortfall: bool = False,
+    current_date: Optional[date] = None,
+    db: Session = Depends(get_read_db)
+):
+    try:
+        if current_date is None:
+            current_date = date.today()
+        demand = calculate_demand_rows(db, current_date, horizon_days, equipment_id, only_shortfall)
+        logger.info('Calculated demand for %s parts over %s days', len(demand), horizon_days)
+        return ORJSONResponse(demand)
+    except ValueError as ve:
+        logger.error('Invalid input for demand calculation: %s', ve)
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception:
+        logger.exception('Error calculating demand over %s days', horizon_days)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@app.get('/stats/replacements', response_model=List[ReplacementStatsResponse])
+def api_get_replacement_stats(
+    group_by: List[StatsDimension] = Query(['month']),
+    date_from: Optional[date] = Query(None, alias='from'),
+    date_to: Optional[date] = Query(None, alias='to'),
+    equipment_id: Optional[int] = None,
+    part_id: Optional[int] = None,
+    workshop_id: Optional[int] = None,
+    replacement_type_id: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
+    try:
+        stats = get_replacement_stats_rows(
+            db, group_by, date_from, date_to, equipment_id, part_id, workshop_id, replacement_type_id
+        )
+        logger.info('Fetched %s replacement stats rows grouped by %s', len(stats), group_by)
+        return ORJSONResponse(stats)
+    except Exception:
+        logger.exception('Error fetching replacement stats grouped by %s', group_by)
+        raise HTTPException(status_code=500, detail='Internal server error')
+
+@app.get('/procurement/', response_model=List[ProcurementResponse])
+def api_get_procurement_plans(
+    end_date: date,
+    part_ids: Optional[List[int]] = Query(None),
+    equipment_id: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
+    try:
+        plans = calculate_procurement_rows(db, end_date, part_ids, equipment_id)
+        logger.info('Calculated procurement plans for %s parts', len(plans))
+        return ORJSONResponse(plans)
+    except ValueError as ve:
+        logger.error('Invalid input for procurement calculation: %s', ve)
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception:
+        logger.exception('Error calculating procurement plans for end_date: %s', end_date)
         raise HTTPException(status_code=500, detail='Internal server error')
 
 @app.get('/procurement/{part_id}', response_model=ProcurementResponse)
-def api_get_procurement(part_id: int, end_date: date, db: Session = Depends(get_db)):
+def api_get_procurement(part_id: int, end_date: date, db: Session = Depends(get_read_db)):
     try:
         procurement = calculate_procurement_plan(db, part_id, end_date)
-        logger.info(f'Calculated procurement plan for part_id: {part_id}')
+        logger.info('Calculated procurement plan for part_id: %s', part_id)
         return procurement
     except ValueError as ve:
-        logger.error(f'Invalid input for procurement calculation: {ve}')
+        logger.error('Invalid input for procurement calculation: %s', ve)
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception:
-        logger.exception(f'Error calculating procurement for part_id: {part_id}')
+        logger.exception('Error calculating procurement for part_id: %s', part_id)
         raise HTTPException(status_code=500, detail='Internal server error')
\ No newline at end of file
@@ -0,0 +1,201 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import Settings
+from .logging_config import dropped_records
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+UNMATCHED_ROUTE = '<unmatched>'
+
+Labels = Tuple[str, ...]
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+# Set by the middleware for the duration of a request. The stats object is
+# mutated in place, so queries issued from threadpool workers (which run in a
+# copy of the request context) still land on the request that caused them.
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar('request_stats', default=None)
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts: Dict[Labels, List[int]] = {}
+        self.sums: Dict[Labels, float] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        counts = self.counts.get(labels)
+        if counts is None:
+            counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+            self.sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[labels] += value
+
+class MetricsRegistry:
+    """Request and database metrics rendered in the Prometheus text format.
+
+    Everything is kept in plain dicts behind one lock; label sets are bounded
+    because routes are recorded by their template, not the concrete path.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.in_flight = 0
+            self.requests: Dict[Labels, int] = {}
+            self.latency = Histogram(LATENCY_BUCKETS)
+            self.queries: Dict[Labels, int] = {}
+            self.db_seconds: Dict[Labels, float] = {}
+            self.queries_per_request = Histogram(QUERY_COUNT_BUCKETS)
+            self.slow_queries = 0
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        labels = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            status_labels = (method, route, str(status))
+            self.requests[status_labels] = self.requests.get(status_labels, 0) + 1
+            self.latency.observe(labels, seconds)
+            self.queries[labels] = self.queries.get(labels, 0) + stats.queries
+            self.db_seconds[labels] = self.db_seconds.get(labels, 0.0) + stats.db_seconds
+            self.queries_per_request.observe(labels, stats.queries)
+
+    def slow_query(self) -> None:
+        with self._lock:
+            self.slow_queries += 1
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            _header(lines, 'spare_parts_http_requests_in_flight', 'gauge', 'Requests currently being served')
+            lines.append(f'spare_parts_http_requests_in_flight {self.in_flight}')
+
+            _header(lines, 'spare_parts_http_requests_total', 'counter', 'Finished requests by route and status')
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f'spare_parts_http_requests_total{_labels(method=method, route=route, status=status)} {count}')
+
+            _histogram(lines, 'spare_parts_http_request_duration_seconds', 'Request latency by route', self.latency)
+
+            _header(lines, 'spare_parts_db_queries_total', 'counter', 'SQL statements issued by route')
+            for (method, route), count in sorted(self.queries.items()):
+                lines.append(f'spare_parts_db_queries_total{_labels(method=method, route=route)} {count}')
+
+            _header(lines, 'spare_parts_db_query_seconds_total', 'counter', 'Time spent in SQL statements by route')
+            for (method, route), seconds in sorted(self.db_seconds.items()):
+                lines.append(f'spare_parts_db_query_seconds_total{_labels(method=method, route=route)} {seconds:.6f}')
+
+            _histogram(lines, 'spare_parts_db_queries_per_request', 'SQL statements per request by route',
+                       self.queries_per_request)
+
+            _header(lines, 'spare_parts_db_slow_queries_total', 'counter', 'Statements slower than SLOW_QUERY_MS')
+            lines.append(f'spare_parts_db_slow_queries_total {self.slow_queries}')
+
+            _header(lines, 'spare_parts_log_records_dropped_total', 'counter', 'Log records dropped on a full queue')
+            lines.append(f'spare_parts_log_records_dropped_total {dropped_records()}')
+        return '\n'.join(lines) + '\n'
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(**labels: str) -> str:
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+def _header(lines: List[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {kind}')
+
+def _histogram(lines: List[str], name: str, help_text: str, histogram: Histogram) -> None:
+    _header(lines, name, 'histogram', help_text)
+    for (method, route), counts in sorted(histogram.counts.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else f'{bound:g}'
+            lines.append(f'{name}_bucket{_labels(method=method, route=route, le=le)} {cumulative}')
+        lines.append(f'{name}_sum{_labels(method=method, route=route)} {histogram.sums[(method, route)]:.6f}')
+        lines.append(f'{name}_count{_labels(method=method, route=route)} {cumulative}')
+
+metrics = MetricsRegistry()
+
+def instrument_engine(engine: Engine, config: Settings, registry: MetricsRegistry = metrics) -> None:
+    """Count statements and DB time for the current request and log slow ones."""
+    slow_seconds = config.slow_query_ms / 1000 if config.slow_query_ms > 0 else None
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        if slow_seconds is not None and elapsed >= slow_seconds:
+            registry.slow_query()
+            logger.warning('Slow query (%.1f ms): %s', elapsed * 1000, ' '.join(statement.split()))
+
+    @event.listens_for(engine, 'handle_error')
+    def _handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        started = exception_context.connection.info.get('query_started') if exception_context.connection else None
+        if started:
+            started.pop()
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so it adds no task or thread hop per request."""
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        self.registry.request_started()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get('route')
+            self.registry.request_finished(
+                scope['method'], getattr(route, 'path', UNMATCHED_ROUTE), status,
+                time.perf_counter() - started, stats
+            )
+            _request_stats.reset(token)
@@ -0,0 +1,131 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+# Kept out of Base.metadata on purpose: the version table belongs to the
+# migration runner, not to the application schema.
+schema_version = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('name', String, nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    statements: Tuple[str, ...]
+    # Statements only run on this dialect; elsewhere the version is just recorded
+    dialect: Optional[str] = None
+
+# Every statement must be idempotent (IF [NOT] EXISTS) so a migration can be
+# re-run on a database that got part of the way, or that create_all already
+# built from the current models. Tables come from create_all, which
+# init_schema runs first; migrations only evolve what create_all cannot touch
+# on an existing database: indexes, and filling newly added derived tables.
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, 'baseline_indexes', (
+        'CREATE INDEX IF NOT EXISTS idx_part_equipment_id ON parts (equipment_id)',
+        'CREATE INDEX IF NOT EXISTS idx_replacement_workshop_id ON replacements (workshop_id)',
+        'CREATE INDEX IF NOT EXISTS idx_replacement_type_id ON replacements (replacement_type_id)',
+        'CREATE INDEX IF NOT EXISTS idx_replacement_date ON replacements (replacement_date)',
+        'CREATE INDEX IF NOT EXISTS idx_part_state_part_id ON part_state (part_id)',
+        'CREATE INDEX IF NOT EXISTS idx_wear_alert_transition ON wear_alerts (transition_date, equipment_id, part_id)',
+    )),
+    Migration(2, 'composite_replacement_indexes', (
+        # Latest replacement per part and per-part date ranges
+        'CREATE INDEX IF NOT EXISTS idx_replacement_part_date ON replacements (part_id, replacement_date)',
+        # part_state recomputation groups by (equipment_id, part_id) and takes max(replacement_date)
+        'CREATE INDEX IF NOT EXISTS idx_replacement_equipment_part_date '
+        'ON replacements (equipment_id, part_id, replacement_date)',
+        # Superseded for filtering by the composites above; keyset pages need
+        # (column, id) order, which migration 5 adds
+        'DROP INDEX IF EXISTS idx_replacement_part_id',
+        'DROP INDEX IF EXISTS idx_replacement_equipment_id',
+    )),
+    Migration(3, 'part_name_fts', (
+        # External-content FTS5 index over parts.name for /parts/search. unicode61
+        # case-folds Cyrillic; remove_diacritics 0 keeps й and и apart. The prefix
+        # option adds 2- and 3-character prefix indexes for typeahead queries.
+        "CREATE VIRTUAL TABLE IF NOT EXISTS parts_fts USING fts5(name, content='parts', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 0', prefix='2 3')",
+        # Triggers keep the index in step with every write path, ORM or bulk
+        'CREATE TRIGGER IF NOT EXISTS parts_fts_insert AFTER INSERT ON parts BEGIN '
+        'INSERT INTO parts_fts(rowid, name) VALUES (new.id, new.name); END',
+        'CREATE TRIGGER IF NOT EXISTS parts_fts_delete AFTER DELETE ON parts BEGIN '
+        "INSERT INTO parts_fts(parts_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+        'CREATE TRIGGER IF NOT EXISTS parts_fts_update AFTER UPDATE OF name ON parts BEGIN '
+        "INSERT INTO parts_fts(parts_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+        'INSERT INTO parts_fts(rowid, name) VALUES (new.id, new.name); END',
+        "INSERT INTO parts_fts(parts_fts) VALUES ('rebuild')",
+    ), dialect='sqlite'),
+    Migration(4, 'replacement_stats_backfill', (
+        # replacement_stats itself comes from create_all; this fills it once from
+        # the existing journal. Other dialects: python -m backend.cli rebuild-replacement-stats
+        'INSERT INTO replacement_stats (month, equipment_id, part_id, workshop_id, replacement_type_id, '
+        'replacement_count) '
+        "SELECT date(replacement_date, 'start of month'), equipment_id, part_id, workshop_id, "
+        'replacement_type_id, count(*) FROM replacements '
+        'WHERE NOT EXISTS (SELECT 1 FROM replacement_stats) '
+        'GROUP BY 1, 2, 3, 4, 5',
+    ), dialect='sqlite'),
+    Migration(5, 'replacement_keyset_indexes', (
+        # Keyset pages filter on part or equipment and continue from the last id;
+        # the (column, replacement_date) composites would make every page sort
+        # the whole history of that part or equipment
+        'CREATE INDEX IF NOT EXISTS idx_replacement_part_keyset ON replacements (part_id, id)',
+        'CREATE INDEX IF NOT EXISTS idx_replacement_equipment_keyset ON replacements (equipment_id, id)',
+    )),
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+def _applied_versions(conn: Connection) -> List[int]:
+    return [row[0] for row in conn.execute(select(schema_version.c.version))]
+
+def stored_version(engine: Engine) -> int:
+    """Schema version without creating anything; 0 for a database that was never migrated."""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(schema_version.name):
+            return 0
+        return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+def current_version(engine: Engine) -> int:
+    schema_version.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        return max(_applied_versions(conn), default=0)
+
+def migrate(engine: Engine) -> List[int]:
+    """Apply pending migrations in order, each in its own transaction.
+
+    Returns the versions applied by this call. A concurrent runner that wins
+    the race for a version makes the loser's insert fail; the loser's
+    idempotent statements are rolled back and the version is skipped.
+    """
+    schema_version.create(bind=engine, checkfirst=True)
+    applied: List[int] = []
+    for migration in MIGRATIONS:
+        try:
+            with engine.begin() as conn:
+                if migration.version in _applied_versions(conn):
+                    continue
+                if migration.dialect in (None, conn.dialect.name):
+                    for statement in migration.statements:
+                        conn.execute(text(statement))
+                conn.execute(insert(schema_version).values(
+                    version=migration.version, name=migration.name, applied_at=datetime.now(timezone.utc)
+                ))
+        except IntegrityError:
+            logger.info('Migration %s was applied concurrently, skipping', migration.version)
+            continue
+        applied.append(migration.version)
+        logger.info('Applied migration %s: %s', migration.version, migration.name)
+    return applied
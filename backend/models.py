@@ -48,6 +48,47 @@ class Replacement(Base):
     workshop = relationship('Workshop')
 
     __table_args__ = (
-        Index('idx_replacement_equipment_id', 'equipment_id'),
-        Index('idx_replacement_part_id', 'part_id'),
-    )
\ No newline at end of file
+        Index('idx_replacement_part_date', 'part_id', 'replacement_date'),
+        Index('idx_replacement_equipment_part_date', 'equipment_id', 'part_id', 'replacement_date'),
+        Index('idx_replacement_part_keyset', 'part_id', 'id'),
+        Index('idx_replacement_equipment_keyset', 'equipment_id', 'id'),
+        Index('idx_replacement_workshop_id', 'workshop_id'),
+        Index('idx_replacement_type_id', 'replacement_type_id'),
+        Index('idx_replacement_date', 'replacement_date'),
+    )
+
+class PartState(Base):
+    __tablename__ = 'part_state'
+    equipment_id = Column(Integer, ForeignKey('equipment.id'), primary_key=True)
+    part_id = Column(Integer, ForeignKey('parts.id'), primary_key=True)
+    last_replacement_date = Column(Date, nullable=False)
+    replacement_count = Column(Integer, nullable=False)
+
+    __table_args__ = (Index('idx_part_state_part_id', 'part_id'),)
+
+class WearAlert(Base):
+    __tablename__ = 'wear_alerts'
+    equipment_id = Column(Integer, ForeignKey('equipment.id'), primary_key=True)
+    part_id = Column(Integer, ForeignKey('parts.id'), primary_key=True)
+    zone = Column(String, primary_key=True)
+    transition_date = Column(Date, nullable=False)
+
+    __table_args__ = (Index('idx_wear_alert_transition', 'transition_date', 'equipment_id', 'part_id'),)
+
+class ReplacementStat(Base):
+    __tablename__ = 'replacement_stats'
+    # month is the first day of the month; leading the key with it makes
+    # dashboard date ranges an index range read
+    month = Column(Date, primary_key=True)
+    equipment_id = Column(Integer, ForeignKey('equipment.id'), primary_key=True)
+    part_id = Column(Integer, ForeignKey('parts.id'), primary_key=True)
+    workshop_id = Column(Integer, ForeignKey('workshops.id'), primary_key=True)
+    replacement_type_id = Column(Integer, ForeignKey('replacement_types.id'), primary_key=True)
+    replacement_count = Column(Integer, nullable=False)
+
+    # Dashboard drill-downs filter on one of these and a month range
+    __table_args__ = (
+        Index('idx_replacement_stat_equipment_month', 'equipment_id', 'month'),
+        Index('idx_replacement_stat_part_month', 'part_id', 'month'),
+        Index('idx_replacement_stat_workshop_month', 'workshop_id', 'month'),
+    )
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import List, Literal, Optional
 from datetime import date
 
 class EquipmentBase(BaseModel):
@@ -24,6 +24,13 @@ class PartBase(BaseModel):
 class PartCreate(PartBase):
     pass
 
+class PartPatch(BaseModel):
+    name: Optional[str] = Field(None, min_length=1)
+    useful_life: Optional[int] = Field(None, ge=1)
+    quantity_per_equipment: Optional[int] = Field(None, ge=1)
+    stock_quantity: Optional[int] = Field(None, ge=0)
+    procurement_time: Optional[int] = Field(None, ge=1)
+
 class PartResponse(PartBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
@@ -63,11 +70,91 @@ class ReplacementResponse(ReplacementBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
 
+class ReplacementPatch(BaseModel):
+    id: int = Field(..., ge=1)
+    equipment_id: Optional[int] = Field(None, ge=1)
+    part_id: Optional[int] = Field(None, ge=1)
+    replacement_date: Optional[date] = None
+    replacement_type_id: Optional[int] = Field(None, ge=1)
+    workshop_id: Optional[int] = Field(None, ge=1)
+
+    @field_validator('equipment_id', 'part_id', 'replacement_date', 'replacement_type_id', 'workshop_id',
+                     mode='before')
+    @classmethod
+    def reject_null(cls, value):
+        # Leave a field out to keep it; every replacement column is NOT NULL
+        if value is None:
+            raise ValueError('may be omitted but not null')
+        return value
+
+class BulkRowError(BaseModel):
+    row: int = Field(..., description='1-based row number in the uploaded payload')
+    error: str
+
+class BulkInsertResponse(BaseModel):
+    inserted: int
+    errors: List[BulkRowError]
+
+WearZone = Literal['Unknown', 'Green', 'Yellow', 'Red', 'Critical']
+
 class WearResponse(BaseModel):
     part_name: str
     zone: str
     remaining_percentage: float
 
+class FleetWearResponse(WearResponse):
+    equipment_id: int
+    part_id: int
+
+class PartWearForecast(BaseModel):
+    part_id: int
+    part_name: str
+    remaining_percentage: List[float]
+    zone: List[WearZone]
+
+class WearForecastResponse(BaseModel):
+    equipment_id: int
+    dates: List[date]
+    parts: List[PartWearForecast]
+
+AlertZone = Literal['Yellow', 'Red', 'Critical']
+
+class WearAlertResponse(BaseModel):
+    equipment_id: int
+    part_id: int
+    part_name: str
+    zone: AlertZone
+    transition_date: date
+
+class DemandResponse(BaseModel):
+    part_id: int
+    part_name: str
+    equipment_id: int
+    fleet_units: int = Field(..., description='Installed units across the fleet')
+    daily_demand: float
+    expected_replacements: float = Field(..., description='Units consumed over the horizon')
+    stock_quantity: int
+    coverage_days: Optional[float] = Field(None, description='Days the current stock lasts, None without demand')
+    stock_out_date: Optional[date] = Field(None, description='First day without stock, None if it lasts the horizon')
+    shortfall: int = Field(..., description='Units missing to cover the horizon')
+    order_by_date: Optional[date] = Field(None, description='Latest order date to restock before the stock-out')
+
+StatsDimension = Literal['month', 'equipment', 'part', 'workshop', 'replacement_type']
+
+class ReplacementStatsResponse(BaseModel):
+    # Only the columns of the requested group_by dimensions are present
+    month: Optional[date] = Field(None, description='First day of the month')
+    equipment_id: Optional[int] = None
+    equipment_name: Optional[str] = None
+    part_id: Optional[int] = None
+    part_name: Optional[str] = None
+    workshop_id: Optional[int] = None
+    workshop_name: Optional[str] = None
+    replacement_type_id: Optional[int] = None
+    replacement_type_name: Optional[str] = None
+    replacement_count: int
+
 class ProcurementResponse(BaseModel):
+    part_id: Optional[int] = None
     part_name: str
     latest_init_date: Optional[date] = Field(None, description='Latest date to initiate procurement, None if not possible')
\ No newline at end of file
@@ -1,10 +1,22 @@
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from backend import crud
 from backend.models import Base
+from backend.schemas import EquipmentCreate, PartCreate, WorkshopCreate, ReplacementTypeCreate, ReplacementCreate
 
 TEST_DATABASE_URL = 'sqlite:///:memory:'
 
+@pytest.fixture(scope='session', autouse=True)
+def seeded_database():
+    # The API tests run against the configured database without the app's
+    # lifespan, so the schema and demo data are prepared here the way
+    # `python -m backend.cli seed` does on deploy.
+    from backend.database import SessionLocal, init_schema, seed_database
+    init_schema()
+    with SessionLocal() as db:
+        seed_database(db)
+
 @pytest.fixture(scope='function')
 def db_session():
     engine = create_engine(TEST_DATABASE_URL, connect_args={'check_same_thread': False})
@@ -17,6 +29,28 @@ def db_session():
         db.close()
         Base.metadata.drop_all(bind=engine)
 
+@pytest.fixture
+def fleet(db_session):
+    """Three trucks with two 100-day filters, one workshop and one replacement type."""
+    equipment = crud.create_equipment(db_session, EquipmentCreate(name='Грузовик', fleet_quantity=3))
+    parts = [
+        crud.create_part(db_session, PartCreate(name=f'Фильтр {i}', useful_life=100, equipment_id=equipment.id,
+                                                quantity_per_equipment=1, stock_quantity=5, procurement_time=10))
+        for i in (1, 2)
+    ]
+    workshop = crud.create_workshop(db_session, WorkshopCreate(name='Гараж', address='Москва'))
+    rtype = crud.create_replacement_type(db_session, ReplacementTypeCreate(name='ремонт'))
+    return equipment, parts, workshop, rtype
+
+@pytest.fixture
+def make_replacement(fleet):
+    equipment, _, workshop, rtype = fleet
+
+    def _replacement(part, replacement_date):
+        return ReplacementCreate(equipment_id=equipment.id, part_id=part.id, replacement_date=replacement_date,
+                                 replacement_type_id=rtype.id, workshop_id=workshop.id)
+    return _replacement
+
 @pytest.fixture(autouse=True)
 def override_get_db(monkeypatch, db_session):
     def test_get_db():
@@ -1,6 +1,9 @@
 from fastapi.testclient import TestClient
 from backend.main import app
+import json
 import uuid
+import pytest
+from datetime import date, timedelta
 
 client = TestClient(app)
 
@@ -79,4 +82,404 @@ def test_procurement_plan():
     response = client.get(f'/procurement/{part["id"]}?end_date=2025-12-31')
     assert response.status_code == 200
     data = response.json()
-    assert 'part_name' in data
\ No newline at end of file
+    assert 'part_name' in data
+def test_fleet_wear_calculation():
+    equipment = client.get('/equipment/').json()[0]
+    response = client.get('/wear/', params={'equipment_ids': [equipment['id']]})
+    assert response.status_code == 200
+    data = response.json()
+    assert {row['equipment_id'] for row in data} == {equipment['id']}
+
+    per_equipment = client.get(f'/wear/{equipment["id"]}').json()
+    assert [(w['part_name'], w['zone']) for w in per_equipment] == [(w['part_name'], w['zone']) for w in data]
+
+    response = client.get('/wear/', params={'zone': 'Unknown'})
+    assert response.status_code == 200
+    assert all(row['zone'] == 'Unknown' for row in response.json())
+
+def test_procurement_plans_batch():
+    end_date = (date.today() + timedelta(days=365)).isoformat()
+    parts = client.get('/parts/').json()[:3]
+    part_ids = [p['id'] for p in parts]
+    response = client.get('/procurement/', params={'end_date': end_date, 'part_ids': part_ids})
+    assert response.status_code == 200
+    data = response.json()
+    assert [row['part_id'] for row in data] == sorted(part_ids)
+
+    for row in data:
+        single = client.get(f'/procurement/{row["part_id"]}', params={'end_date': end_date}).json()
+        assert single['latest_init_date'] == row['latest_init_date']
+
+    response = client.get('/procurement/', params={'end_date': '2000-01-01'})
+    assert response.status_code == 400
+
+def test_keyset_pagination():
+    all_parts = client.get('/parts/').json()
+    assert len(all_parts) > 2
+
+    seen = []
+    params = {'limit': 2}
+    while True:
+        response = client.get('/parts/', params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(p['id'] for p in page)
+        next_cursor = response.headers.get('X-Next-Cursor')
+        if next_cursor is None:
+            break
+        params['cursor'] = int(next_cursor)
+    assert seen == sorted(p['id'] for p in all_parts)
+
+    response = client.get('/replacements/', params={'limit': 0})
+    assert response.status_code == 422
+
+def test_replacement_filters():
+    equipment = client.get('/equipment/').json()[0]
+    part = client.get(f'/parts/?equipment_id={equipment["id"]}').json()[0]
+    workshop = client.get('/workshops/').json()[0]
+    rtype = client.get('/replacement_types/').json()[0]
+    created = client.post('/replacements/', json={
+        'equipment_id': equipment['id'],
+        'part_id': part['id'],
+        'replacement_date': '2019-03-15',
+        'replacement_type_id': rtype['id'],
+        'workshop_id': workshop['id']
+    }).json()
+
+    response = client.get('/replacements/', params={
+        'part_id': part['id'], 'workshop_id': workshop['id'], 'replacement_type_id': rtype['id'],
+        'date_from': '2019-03-15', 'date_to': '2019-03-15'
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert created['id'] in [r['id'] for r in data]
+    assert all(r['replacement_date'] == '2019-03-15' and r['part_id'] == part['id'] for r in data)
+
+    prefix = part['name'][:8]
+    parts = client.get('/parts/', params={'name_prefix': prefix}).json()
+    assert part['id'] in [p['id'] for p in parts]
+    assert all(p['name'].startswith(prefix) for p in parts)
+
+def _replacement_refs():
+    equipment = client.get('/equipment/').json()[0]
+    part = client.get(f'/parts/?equipment_id={equipment["id"]}').json()[0]
+    workshop = client.get('/workshops/').json()[0]
+    rtype = client.get('/replacement_types/').json()[0]
+    return {
+        'equipment_id': equipment['id'],
+        'part_id': part['id'],
+        'replacement_type_id': rtype['id'],
+        'workshop_id': workshop['id']
+    }
+
+def test_bulk_create_replacements_json_and_ndjson():
+    refs = _replacement_refs()
+    rows = [
+        {**refs, 'replacement_date': '2018-01-01'},
+        {**refs, 'replacement_date': 'not-a-date'},
+        {**refs, 'part_id': 10 ** 9, 'replacement_date': '2018-01-02'},
+    ]
+    response = client.post('/replacements/bulk', json=rows)
+    assert response.status_code == 200
+    data = response.json()
+    assert data['inserted'] == 1
+    assert [e['row'] for e in data['errors']] == [2, 3]
+    assert 'part_id' in data['errors'][1]['error']
+
+    ndjson = '\n'.join(json.dumps({**refs, 'replacement_date': f'2018-02-0{i}'}) for i in range(1, 4)) + '\n{broken\n'
+    response = client.post('/replacements/bulk', content=ndjson, headers={'Content-Type': 'application/x-ndjson'})
+    assert response.status_code == 200
+    data = response.json()
+    assert data['inserted'] == 3
+    assert [e['row'] for e in data['errors']] == [4]
+
+def test_bulk_create_replacements_csv():
+    refs = _replacement_refs()
+    header = 'equipment_id,part_id,replacement_date,replacement_type_id,workshop_id'
+    line = f"{refs['equipment_id']},{refs['part_id']},2018-03-01,{refs['replacement_type_id']},{refs['workshop_id']}"
+    response = client.post('/replacements/bulk', content=f'{header}\n{line}\n{line},9\n',
+                           headers={'Content-Type': 'text/csv'})
+    assert response.status_code == 200
+    data = response.json()
+    assert data['inserted'] == 1
+    assert data['errors'][0]['row'] == 2
+
+    response = client.post('/replacements/bulk', content='x', headers={'Content-Type': 'text/plain'})
+    assert response.status_code == 415
+
+def test_bulk_update_replacements():
+    refs = _replacement_refs()
+    created = [client.post('/replacements/', json={**refs, 'replacement_date': f'2017-05-0{i}'}).json() for i in (1, 2)]
+    workshops = client.get('/workshops/').json()
+
+    response = client.patch('/replacements/', json=[
+        {'id': created[0]['id'], 'replacement_date': '2017-06-01'},
+        {'id': created[1]['id'], 'workshop_id': workshops[-1]['id']},
+    ])
+    assert response.status_code == 200
+    data = {r['id']: r for r in response.json()}
+    assert data[created[0]['id']]['replacement_date'] == '2017-06-01'
+    assert data[created[0]['id']]['workshop_id'] == refs['workshop_id']
+    assert data[created[1]['id']]['replacement_date'] == '2017-05-02'
+    assert data[created[1]['id']]['workshop_id'] == workshops[-1]['id']
+
+    response = client.patch('/replacements/', json=[
+        {'id': created[0]['id'], 'replacement_date': '2017-07-01'},
+        {'id': 10 ** 9, 'replacement_date': '2017-07-01'},
+    ])
+    assert response.status_code == 404
+    unchanged = client.get('/replacements/', params={'part_id': refs['part_id'], 'date_from': '2017-06-01',
+                                                     'date_to': '2017-06-01'}).json()
+    assert created[0]['id'] in [r['id'] for r in unchanged]
+
+    null_date = client.patch('/replacements/', json=[{'id': created[0]['id'], 'replacement_date': None}])
+    assert null_date.status_code == 422
+    unknown_part = client.patch('/replacements/', json=[{'id': created[0]['id'], 'part_id': 10 ** 9}])
+    assert unknown_part.status_code == 422
+    assert unknown_part.json()['detail'] == f'Unknown part_id: [{10 ** 9}]'
+    stored = client.get('/replacements/', params={'part_id': refs['part_id'], 'date_from': '2017-06-01',
+                                                  'date_to': '2017-06-01'}).json()
+    assert created[0]['id'] in [r['id'] for r in stored]
+
+def test_async_router_matches_sync_endpoints():
+    from fastapi import FastAPI
+    from backend.async_api import router
+
+    async_app = FastAPI()
+    async_app.include_router(router)
+    async_client = TestClient(async_app)
+
+    assert async_client.get('/health').json() == client.get('/health').json()
+    assert async_client.get('/wear/').json() == client.get('/wear/').json()
+
+    end_date = (date.today() + timedelta(days=200)).isoformat()
+    params = {'end_date': end_date}
+    assert async_client.get('/procurement/', params=params).json() == client.get('/procurement/', params=params).json()
+    assert async_client.get('/procurement/1', params={'end_date': '2000-01-01'}).status_code == 400
+
+def test_sqlite_profile_and_read_only_sessions():
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+    from backend.database import SessionLocal, ReadSessionLocal
+
+    with SessionLocal() as db:
+        assert db.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert db.execute(text('PRAGMA synchronous')).scalar() == 1
+    with ReadSessionLocal() as db:
+        assert db.execute(text('PRAGMA query_only')).scalar() == 1
+        with pytest.raises(OperationalError):
+            db.execute(text('UPDATE equipment SET name = name'))
+
+def test_reference_lists_use_etag_cache(monkeypatch):
+    import backend.main as main
+
+    first = client.get('/workshops/')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    def fail(*args, **kwargs):
+        raise AssertionError('database must not be queried')
+    monkeypatch.setattr(main, 'get_workshop_rows', fail)
+
+    cached = client.get('/workshops/')
+    assert cached.json() == first.json()
+    assert cached.headers['ETag'] == etag
+    not_modified = client.get('/workshops/', headers={'If-None-Match': etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b''
+
+    monkeypatch.undo()
+    client.post('/workshops/', json={'name': f'Мастерская {uuid.uuid4()}', 'address': 'Тула'})
+    refreshed = client.get('/workshops/', headers={'If-None-Match': etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers['ETag'] != etag
+    assert len(refreshed.json()) == len(first.json()) + 1
+
+def test_export_replacements_streams_ndjson_and_csv():
+    refs = _replacement_refs()
+    created = client.post('/replacements/', json={**refs, 'replacement_date': '2016-02-29'}).json()
+    params = {'part_id': refs['part_id'], 'date_from': '2016-02-29', 'date_to': '2016-02-29'}
+
+    response = client.get('/replacements/export', params=params)
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert created in rows
+    assert rows == client.get('/replacements/', params=params).json()
+
+    response = client.get('/replacements/export', params={**params, 'format': 'csv'})
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == 'id,equipment_id,part_id,replacement_date,replacement_type_id,workshop_id'
+    assert len(lines) == len(rows) + 1
+    assert f"{created['id']},{refs['equipment_id']},{refs['part_id']},2016-02-29," in response.text
+
+    assert client.get('/replacements/export', params={'format': 'xml'}).status_code == 422
+
+def test_metrics_endpoint_reports_routes_and_queries():
+    client.get('/wear/1')
+    client.get('/equipment/999999999')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    lines = response.text.splitlines()
+    assert 'spare_parts_http_requests_in_flight 1' in lines
+    assert any(line.startswith('spare_parts_http_requests_total{method="GET",route="/equipment/{equipment_id}",status="404"}')
+               for line in lines)
+    assert any(line.startswith('spare_parts_http_request_duration_seconds_bucket{method="GET",route="/wear/{equipment_id}",le="+Inf"}')
+               for line in lines)
+    wear_queries = next(line for line in lines
+                        if line.startswith('spare_parts_db_queries_total{method="GET",route="/wear/{equipment_id}"}'))
+    assert int(wear_queries.rsplit(' ', 1)[1]) >= 1
+
+def test_slow_queries_are_counted_and_logged(caplog):
+    from dataclasses import replace
+    from sqlalchemy import create_engine, text
+    from backend.config import settings
+    from backend.metrics import MetricsRegistry, RequestStats, _request_stats, instrument_engine
+
+    registry = MetricsRegistry()
+    engine = create_engine('sqlite://')
+    instrument_engine(engine, replace(settings, slow_query_ms=1e-9), registry)
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        with engine.connect() as conn, caplog.at_level('WARNING', logger='backend.metrics'):
+            conn.execute(text('SELECT 1'))
+    finally:
+        _request_stats.reset(token)
+
+    assert stats.queries == 1 and stats.db_seconds > 0
+    assert registry.slow_queries == 1
+    assert 'Slow query' in caplog.text and 'SELECT 1' in caplog.text
+
+def test_wear_forecast_endpoint():
+    response = client.get('/wear/1/forecast', params={'from': '2030-01-01', 'to': '2030-12-31', 'step': 7})
+    assert response.status_code == 200
+    data = response.json()
+    assert data['equipment_id'] == 1
+    assert data['dates'][0] == '2030-01-01' and len(data['dates']) == 53
+    for part in data['parts']:
+        assert len(part['zone']) == len(part['remaining_percentage']) == 53
+
+    assert client.get('/wear/1/forecast', params={'from': '2030-02-01', 'to': '2030-01-01'}).status_code == 400
+
+def test_alerts_follow_part_stock_changes():
+    equipment = client.get('/equipment/').json()[0]
+    part = client.post('/parts/', json={
+        'name': f'Тестовая запчасть {uuid.uuid4()}', 'useful_life': 100, 'equipment_id': equipment['id'],
+        'quantity_per_equipment': 1, 'stock_quantity': 3, 'procurement_time': 20
+    }).json()
+    refs = _replacement_refs()
+    client.post('/replacements/', json={**refs, 'equipment_id': equipment['id'], 'part_id': part['id'],
+                                        'replacement_date': '2031-01-01'})
+
+    params = {'current_date': '2031-03-01', 'within_days': 60, 'limit': 1000}
+    alerts = [a for a in client.get('/alerts/', params=params).json() if a['part_id'] == part['id']]
+    assert [(a['zone'], a['transition_date']) for a in alerts] == [('Yellow', '2031-03-17'), ('Red', '2031-04-01')]
+
+    patched = client.patch(f"/parts/{part['id']}", json={'stock_quantity': 0})
+    assert patched.status_code == 200 and patched.json()['stock_quantity'] == 0
+    alerts = [a for a in client.get('/alerts/', params={**params, 'zone': 'Critical'}).json()
+              if a['part_id'] == part['id']]
+    assert [(a['zone'], a['transition_date']) for a in alerts] == [('Critical', '2031-03-23')]
+
+    assert client.patch('/parts/999999999', json={'stock_quantity': 1}).status_code == 404
+
+def test_alerts_window_is_bounded():
+    assert client.get('/alerts/', params={'within_days': 3660}).status_code == 200
+    assert client.get('/alerts/', params={'within_days': 10 ** 9}).status_code == 422
+
+def test_demand_endpoint():
+    response = client.get('/demand/', params={'horizon_days': 90})
+    assert response.status_code == 200
+    demand = response.json()
+    assert demand
+    for row in demand:
+        assert (row['shortfall'] > 0) == (row['stock_out_date'] is not None)
+
+    shortfalls = client.get('/demand/', params={'horizon_days': 90, 'only_shortfall': True}).json()
+    assert shortfalls == [row for row in demand if row['shortfall'] > 0]
+    assert client.get('/demand/', params={'horizon_days': 0}).status_code == 422
+
+def test_replacement_stats_endpoint():
+    suffix = uuid.uuid4().hex[:8]
+    equipment = client.post('/equipment/', json={'name': f'Stats Crane {suffix}', 'fleet_quantity': 1}).json()
+    part = client.post('/parts/', json={
+        'name': f'Stats Hook {suffix}', 'useful_life': 100, 'equipment_id': equipment['id'],
+        'quantity_per_equipment': 1, 'stock_quantity': 5, 'procurement_time': 3
+    }).json()
+    workshop = client.get('/workshops/').json()[0]
+    replacement_type = client.get('/replacement_types/').json()[0]
+    for day in ('2024-04-02', '2024-04-28', '2024-05-10'):
+        client.post('/replacements/', json={
+            'equipment_id': equipment['id'], 'part_id': part['id'], 'replacement_date': day,
+            'replacement_type_id': replacement_type['id'], 'workshop_id': workshop['id']
+        })
+
+    response = client.get('/stats/replacements', params={
+        'group_by': ['month', 'workshop'], 'from': '2024-04-15', 'to': '2024-05-01', 'equipment_id': equipment['id']
+    })
+    assert response.status_code == 200
+    assert response.json() == [
+        {'month': '2024-04-01', 'workshop_id': workshop['id'], 'workshop_name': workshop['name'],
+         'replacement_count': 2},
+        {'month': '2024-05-01', 'workshop_id': workshop['id'], 'workshop_name': workshop['name'],
+         'replacement_count': 1},
+    ]
+    by_part = client.get('/stats/replacements', params={'group_by': 'part', 'part_id': part['id']}).json()
+    assert by_part == [{'part_id': part['id'], 'part_name': part['name'], 'replacement_count': 3}]
+    assert client.get('/stats/replacements', params={'group_by': 'week'}).status_code == 422
+
+def test_replacement_writes_through_write_queue(monkeypatch):
+    from sqlalchemy.orm import sessionmaker
+    from backend import main
+    from backend.config import settings
+    from backend.database import DATABASE_URL, build_writer_engine
+    from backend.write_queue import WriteQueue
+
+    engine = build_writer_engine(DATABASE_URL, settings)
+    write_queue = WriteQueue(sessionmaker(autocommit=False, autoflush=False, bind=engine), max_delay_ms=5)
+    monkeypatch.setattr(main, 'write_queue', write_queue)
+    try:
+        refs = _replacement_refs()
+        created = client.post('/replacements/', json={**refs, 'replacement_date': '2015-07-01'})
+        assert created.status_code == 200
+        replacement_id = created.json()['id']
+        updated = client.put(f'/replacements/{replacement_id}', json={**refs, 'replacement_date': '2015-07-02'})
+        assert updated.json() == {**refs, 'id': replacement_id, 'replacement_date': '2015-07-02'}
+        assert client.put('/replacements/999999999', json={**refs, 'replacement_date': '2015-07-02'}).status_code == 404
+        assert write_queue.jobs == 3
+    finally:
+        write_queue.stop()
+        engine.dispose()
+
+    rows = client.get('/replacements/', params={'part_id': refs['part_id'], 'date_from': '2015-07-02',
+                                                'date_to': '2015-07-02'}).json()
+    assert replacement_id in [row['id'] for row in rows]
+
+def test_part_search_is_prefix_ranked_and_case_insensitive():
+    suffix = uuid.uuid4().hex[:8]
+    equipment = client.post('/equipment/', json={'name': f'Search Truck {suffix}', 'fleet_quantity': 1}).json()
+    names = [f'Фильтр масляный {suffix}', f'Фильтр воздушный {suffix}', f'Масляный насос {suffix}']
+    for name in names:
+        client.post('/parts/', json={'name': name, 'useful_life': 100, 'equipment_id': equipment['id'],
+                                     'quantity_per_equipment': 1, 'stock_quantity': 1, 'procurement_time': 1})
+
+    def search(q, **params):
+        response = client.get('/parts/search', params={'q': q, 'equipment_id': equipment['id'], **params})
+        assert response.status_code == 200
+        return [part['name'] for part in response.json()]
+
+    assert search('фил') == names[:2]
+    assert sorted(search('МАСЛ')) == sorted([names[0], names[2]])
+    assert search(f'фильтр масл {suffix}') == [names[0]]
+    assert search('филтр') == []
+    assert search('', limit=2) == sorted(names)[:2]
+
+    [pump] = client.get('/parts/search', params={'q': f'насос {suffix}'}).json()
+    client.patch(f"/parts/{pump['id']}", json={'name': f'Помпа {suffix}'})
+    assert search('насос') == []
+    assert search('помпа') == [f'Помпа {suffix}']
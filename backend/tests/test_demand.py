@@ -0,0 +1,25 @@
+from datetime import date
+
+from backend import crud
+from backend.schemas import PartPatch
+
+def test_demand_reports_stock_out_and_shortfall(db_session, fleet):
+    _, parts, _, _ = fleet
+    crud.update_part(db_session, parts[1].id, PartPatch(stock_quantity=0))
+
+    # 3 trucks x 1 unit, useful_life 100: 0.03 units/day
+    demand = crud.calculate_demand_rows(db_session, date(2024, 1, 1), horizon_days=365)
+    first, second = demand
+    assert first['fleet_units'] == 3 and first['expected_replacements'] == 10.95
+    assert first['coverage_days'] == 166.7
+    assert first['stock_out_date'] == date(2024, 6, 16)  # day 167
+    assert first['order_by_date'] == date(2024, 6, 6)
+    assert first['shortfall'] == 11 - 5
+    assert second['stock_out_date'] == date(2024, 1, 2) and second['shortfall'] == 11
+
+    assert crud.calculate_demand_rows(db_session, date(2024, 1, 1), horizon_days=166) == [
+        {**first, 'expected_replacements': 4.98, 'stock_out_date': None, 'order_by_date': None, 'shortfall': 0},
+        {**second, 'expected_replacements': 4.98, 'shortfall': 5},
+    ]
+    only = crud.calculate_demand_rows(db_session, date(2024, 1, 1), horizon_days=166, only_shortfall=True)
+    assert [d['part_id'] for d in only] == [parts[1].id]
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import uuid
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from backend.events import EventBroker, event_broker, zone_changes
+from backend.main import api_events, app
+
+client = TestClient(app)
+
+def _drain(loop, subscription):
+    async def frames():
+        collected = []
+        while True:
+            try:
+                collected.append(await asyncio.wait_for(subscription.get(), 0.05))
+            except asyncio.TimeoutError:
+                return collected
+    return loop.run_until_complete(frames())
+
+def test_publish_fans_out_from_any_thread():
+    broker = EventBroker(buffer_size=8)
+    loop = asyncio.new_event_loop()
+    try:
+        first, second = broker.subscribe(loop), broker.subscribe(loop)
+        publisher = threading.Thread(target=broker.publish, args=('replacement.created', {'id': 7}))
+        publisher.start()
+        publisher.join()
+
+        expected = [b'id: 1\nevent: replacement.created\ndata: {"id":7}\n\n']
+        assert _drain(loop, first) == expected
+        assert _drain(loop, second) == expected
+
+        broker.unsubscribe(second)
+        assert broker.publish('replacement.created', {'id': 8}) == 1
+        assert not _drain(loop, second)
+    finally:
+        loop.close()
+
+def test_slow_subscriber_gets_resync_instead_of_blocking():
+    broker = EventBroker(buffer_size=3)
+    loop = asyncio.new_event_loop()
+    try:
+        subscription = broker.subscribe(loop)
+        for i in range(5):
+            broker.publish('replacement.created', {'id': i})
+        frames = _drain(loop, subscription)
+        assert frames[0].startswith(b'id: 0\nevent: resync\n')
+        assert frames[1:] == [b'id: 5\nevent: replacement.created\ndata: {"id":4}\n\n']
+        assert subscription.dropped == 3
+    finally:
+        loop.close()
+
+def test_zone_changes_reports_only_moved_parts():
+    before = [{'equipment_id': 1, 'part_id': 1, 'zone': 'Green'}, {'equipment_id': 1, 'part_id': 2, 'zone': 'Red'}]
+    after = [{'equipment_id': 1, 'part_id': 1, 'zone': 'Green'}, {'equipment_id': 1, 'part_id': 2, 'zone': 'Green'}]
+    assert zone_changes(before, after) == [
+        {'equipment_id': 1, 'part_id': 2, 'zone': 'Green', 'previous_zone': 'Red'}
+    ]
+
+def test_event_stream_sends_published_frames():
+    async def read():
+        response = await api_events()
+        frames = response.body_iterator
+        retry = await frames.__anext__()
+        assert event_broker.has_subscribers
+        event_broker.publish('replacements.bulk_created', {'inserted': 3})
+        event = await asyncio.wait_for(frames.__anext__(), 1)
+        await frames.aclose()
+        return retry, event
+
+    retry, event = asyncio.run(read())
+    assert retry == b'retry: 3000\n\n'
+    assert event.endswith(b'event: replacements.bulk_created\ndata: {"inserted":3}\n\n')
+    assert not event_broker.has_subscribers
+
+def test_replacement_writes_publish_wear_zone_changes():
+    suffix = uuid.uuid4().hex[:8]
+    equipment = client.post('/equipment/', json={'name': f'SSE Loader {suffix}', 'fleet_quantity': 1}).json()
+    part = client.post('/parts/', json={
+        'name': f'SSE Filter {suffix}', 'useful_life': 100, 'equipment_id': equipment['id'],
+        'quantity_per_equipment': 1, 'stock_quantity': 5, 'procurement_time': 3
+    }).json()
+    workshop = client.get('/workshops/').json()[0]
+    replacement_type = client.get('/replacement_types/').json()[0]
+    payload = {'equipment_id': equipment['id'], 'part_id': part['id'], 'replacement_type_id': replacement_type['id'],
+               'workshop_id': workshop['id'], 'replacement_date': date.today().isoformat()}
+
+    loop = asyncio.new_event_loop()
+    subscription = event_broker.subscribe(loop)
+    try:
+        created = client.post('/replacements/', json=payload).json()
+        client.put(f"/replacements/{created['id']}", json={**payload, 'replacement_date': '2000-01-01'})
+        frames = b''.join(_drain(loop, subscription)).decode()
+    finally:
+        event_broker.unsubscribe(subscription)
+        loop.close()
+
+    assert f'event: replacement.created\ndata: {{"equipment_id":{equipment["id"]}' in frames
+    assert 'event: replacement.updated\n' in frames
+    assert f'"part_id":{part["id"]},"part_name":"SSE Filter {suffix}","zone":"Green"' in frames
+    assert '"previous_zone":"Unknown"' in frames
+    assert '"zone":"Red","remaining_percentage":0.0,"previous_zone":"Green"' in frames
@@ -0,0 +1,13 @@
+from datetime import date
+
+from backend import crud
+from backend.schemas import PartResponse, FleetWearResponse
+
+def test_lean_rows_match_response_schemas(db_session, fleet, make_replacement):
+    _, parts, _, _ = fleet
+    created = crud.create_replacement(db_session, make_replacement(parts[0], date(2024, 1, 1)))
+
+    assert crud.get_replacement_rows(db_session) == [created.model_dump()]
+    assert [PartResponse(**row) for row in crud.get_part_rows(db_session)] == crud.get_parts(db_session)
+    wear = crud.calculate_wear_rows(db_session, date(2024, 3, 21))
+    assert [FleetWearResponse(**row) for row in wear] == crud.calculate_wear_for_fleet(db_session, date(2024, 3, 21))
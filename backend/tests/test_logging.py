@@ -0,0 +1,48 @@
+import json
+import logging
+import queue
+
+from fastapi.testclient import TestClient
+
+from backend.logging_config import (
+    DroppingQueueHandler, JsonFormatter, RequestIdFilter, SamplingFilter, request_id_var
+)
+from backend.main import app
+
+client = TestClient(app)
+
+def _record(level=logging.INFO, msg='Fetched %s parts', args=(3,)):
+    return logging.LogRecord('backend.test', level, __file__, 1, msg, args, None)
+
+def test_request_id_is_echoed_or_generated():
+    assert client.get('/health', headers={'X-Request-ID': 'abc-123'}).headers['X-Request-ID'] == 'abc-123'
+    generated = client.get('/health').headers['X-Request-ID']
+    assert len(generated) == 32
+
+def test_json_formatter_renders_lazy_message_with_request_id():
+    record = _record()
+    token = request_id_var.set('req-1')
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload['message'] == 'Fetched 3 parts'
+    assert payload['request_id'] == 'req-1'
+    assert payload['level'] == 'INFO'
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    for _ in range(5):
+        handler.handle(_record())
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    # Formatting is left to the listener thread
+    assert handler.queue.get_nowait().args == (3,)
+
+def test_sampling_only_thins_info_records():
+    sampler = SamplingFilter(0.0)
+    assert not sampler.filter(_record(logging.INFO))
+    assert sampler.filter(_record(logging.WARNING))
+    assert SamplingFilter(1.0).filter(_record(logging.INFO))
@@ -0,0 +1,8 @@
+from backend import crud
+
+def test_part_search_falls_back_without_fts_index(db_session, fleet):
+    _, parts, _, _ = fleet
+    # db_session is built by create_all alone, so parts_fts does not exist
+    assert not crud._has_part_fts(db_session)
+    assert [row['name'] for row in crud.search_part_rows(db_session, 'Фильтр 2', 10)] == [parts[1].name]
+    assert [row['id'] for row in crud.search_part_rows(db_session, '', 1)] == [parts[0].id]
@@ -0,0 +1,40 @@
+from datetime import date
+
+from backend import crud
+from backend.models import PartState
+from backend.schemas import ReplacementPatch
+
+def _states(db):
+    return {
+        (s.equipment_id, s.part_id): (s.last_replacement_date, s.replacement_count)
+        for s in db.query(PartState).all()
+    }
+
+def test_part_state_follows_every_write_path(db_session, fleet, make_replacement):
+    equipment, parts, _, _ = fleet
+    first = crud.create_replacement(db_session, make_replacement(parts[0], date(2024, 1, 1)))
+    latest = crud.create_replacement(db_session, make_replacement(parts[0], date(2024, 6, 1)))
+    assert _states(db_session) == {(equipment.id, parts[0].id): (date(2024, 6, 1), 2)}
+
+    crud.update_replacement(db_session, latest.id, {'replacement_date': date(2023, 12, 1)})
+    assert _states(db_session)[(equipment.id, parts[0].id)] == (date(2024, 1, 1), 2)
+
+    rows = [(1, make_replacement(parts[1], date(2024, 3, d)).model_dump()) for d in (1, 5)]
+    inserted, errors = crud.bulk_create_replacements(db_session, rows, crud.load_reference_ids(db_session))
+    assert (inserted, errors) == (2, [])
+    assert _states(db_session)[(equipment.id, parts[1].id)] == (date(2024, 3, 5), 2)
+
+    crud.bulk_update_replacements(db_session, [ReplacementPatch(id=first.id, part_id=parts[1].id)])
+    states = _states(db_session)
+    assert states[(equipment.id, parts[0].id)] == (date(2023, 12, 1), 1)
+    assert states[(equipment.id, parts[1].id)] == (date(2024, 3, 5), 3)
+
+    assert crud.rebuild_part_state(db_session) == 2
+    assert _states(db_session) == states
+
+def test_wear_reads_part_state(db_session, fleet, make_replacement):
+    equipment, parts, _, _ = fleet
+    crud.create_replacement(db_session, make_replacement(parts[0], date(2024, 1, 1)))
+
+    wear = crud.calculate_wear_for_equipment(db_session, equipment.id, date(2024, 3, 21))
+    assert [(w.zone, w.remaining_percentage) for w in wear] == [('Yellow', 20.0), ('Unknown', 0.0)]
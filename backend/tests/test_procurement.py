@@ -0,0 +1,62 @@
+import random
+from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta
+
+from backend.crud import _latest_init_date
+
+def reference_latest_init_date(procurement_time, end_date, today):
+    procurement_days = int(procurement_time)
+    candidate = end_date - timedelta(days=procurement_days)
+
+    while candidate >= today:
+        next_month = candidate + relativedelta(months=1)
+        try:
+            next_month_start = next_month.replace(day=1)
+        except Exception:
+            next_month_start = date(next_month.year, next_month.month, 1)
+
+        possible_proc_dates = []
+        try:
+            possible_proc_dates.append(next_month_start.replace(day=10))
+        except Exception:
+            pass
+        try:
+            possible_proc_dates.append(next_month_start.replace(day=25))
+        except Exception:
+            pass
+
+        proc_date = min((d for d in possible_proc_dates if d > candidate), default=None)
+        if proc_date:
+            delivery_date = proc_date + timedelta(days=procurement_days)
+            if delivery_date <= end_date:
+                return candidate
+
+        candidate -= timedelta(days=1)
+
+    return None
+
+def test_latest_init_date_matches_reference_on_random_inputs():
+    rng = random.Random(20241001)
+    for _ in range(5000):
+        today = date(2023, 1, 1) + timedelta(days=rng.randint(0, 4 * 365))
+        end_date = today + timedelta(days=rng.randint(0, 900))
+        procurement_time = rng.randint(1, 400)
+        assert _latest_init_date(procurement_time, end_date, today) == \
+            reference_latest_init_date(procurement_time, end_date, today), (procurement_time, end_date, today)
+
+def test_latest_init_date_matches_reference_around_month_boundaries():
+    today = date(2024, 1, 1)
+    for month_offset in range(26):
+        month_start = today + relativedelta(months=month_offset)
+        for day in (1, 9, 10, 11, 24, 25, 26, 28):
+            for tail in (0, 1, 2, 3):
+                end_date = month_start.replace(day=day) + timedelta(days=tail)
+                for procurement_time in (1, 5, 10, 15, 16, 30, 31, 45, 60):
+                    assert _latest_init_date(procurement_time, end_date, today) == \
+                        reference_latest_init_date(procurement_time, end_date, today), (procurement_time, end_date)
+
+def test_latest_init_date_is_none_when_no_window_fits():
+    today = date(2024, 5, 20)
+    assert _latest_init_date(10, today + timedelta(days=5), today) is None
+    assert _latest_init_date(1, date(2024, 6, 10), today) is None
+    assert _latest_init_date(1, date(2024, 6, 11), today) == date(2024, 5, 31)
@@ -0,0 +1,110 @@
+import re
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from backend import crud
+from backend.migrations import LATEST_VERSION, current_version, migrate
+from backend.models import Base
+
+HOT_TABLES = ('replacements', 'parts', 'part_state', 'wear_alerts', 'replacement_stats')
+FULL_SCAN = re.compile(r'\bSCAN (%s)\b' % '|'.join(HOT_TABLES))
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    return engine
+
+def _plans(engine, call):
+    """Run call(db) and return EXPLAIN QUERY PLAN details for every statement that reads rows."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and re.match(r'\s*(SELECT|UPDATE|DELETE)|\s*INSERT .* SELECT ', statement, re.S | re.I):
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        with sessionmaker(bind=engine)() as db:
+            call(db)
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+            plans.append((statement, [row[-1] for row in rows]))
+    return plans
+
+HOT_QUERIES = {
+    'replacements by part and date range': lambda db: crud.get_replacement_rows(
+        db, part_id=1, date_from=date(2024, 1, 1), date_to=date(2024, 12, 31)),
+    'replacements by equipment and part': lambda db: crud.get_replacement_rows(db, equipment_id=1, part_id=1),
+    'replacements by equipment': lambda db: crud.get_replacement_rows(db, equipment_id=1, limit=100),
+    'replacements by equipment, next page': lambda db: crud.get_replacement_rows(
+        db, equipment_id=1, cursor=500, limit=100),
+    'replacements by part, next page': lambda db: crud.get_replacement_rows(db, part_id=1, cursor=500, limit=100),
+    'replacements by workshop, next page': lambda db: crud.get_replacement_rows(
+        db, workshop_id=1, cursor=500, limit=100),
+    'replacements by date range': lambda db: crud.get_replacement_rows(
+        db, date_from=date(2024, 1, 1), date_to=date(2024, 1, 31)),
+    'replacements by workshop': lambda db: crud.get_replacement_rows(db, workshop_id=1),
+    'parts by equipment': lambda db: crud.get_part_rows(db, equipment_id=1),
+    'parts by name prefix': lambda db: crud.get_part_rows(db, name_prefix='Фильтр'),
+    'wear for one equipment': lambda db: crud.calculate_wear_rows(db, date(2024, 6, 1), [1]),
+    'upcoming alerts': lambda db: crud.get_wear_alert_rows(db, date(2024, 6, 1), 30, 100),
+    'part state recompute': lambda db: crud._recompute_part_state(db, {(1, 1), (1, 2)}),
+    'part name search': lambda db: crud.search_part_rows(db, 'фильтр мас', 20),
+    'replacement stats by month range': lambda db: crud.get_replacement_stats_rows(
+        db, ['workshop', 'month'], date(2024, 1, 1), date(2024, 12, 31)),
+    'replacement stats by equipment': lambda db: crud.get_replacement_stats_rows(db, ['month'], equipment_id=1),
+    'replacement stats maintenance': lambda db: crud._record_replacement_stats(db, [], [
+        {'equipment_id': 1, 'part_id': 1, 'workshop_id': 1, 'replacement_type_id': 1,
+         'replacement_date': date(2024, 1, 1)}]),
+}
+
+@pytest.mark.parametrize('name', sorted(HOT_QUERIES))
+def test_hot_queries_use_indexes(engine, name):
+    plans = _plans(engine, HOT_QUERIES[name])
+    assert plans
+    for statement, details in plans:
+        scans = [detail for detail in details if FULL_SCAN.search(detail)]
+        assert not scans, f'{name} falls back to a full scan: {scans}\n{statement}'
+
+KEYSET_QUERIES = ('replacements by equipment', 'replacements by equipment, next page',
+                  'replacements by part, next page', 'replacements by workshop, next page')
+
+@pytest.mark.parametrize('name', KEYSET_QUERIES)
+def test_keyset_pages_are_read_in_id_order(engine, name):
+    # A temp b-tree means every page sorts the whole filtered history
+    [(statement, details)] = _plans(engine, HOT_QUERIES[name])
+    assert not [detail for detail in details if 'TEMP B-TREE' in detail], details
+
+def test_upcoming_alerts_are_read_in_index_order(engine):
+    [(statement, details)] = _plans(engine, HOT_QUERIES['upcoming alerts'])
+    assert not [detail for detail in details if 'TEMP B-TREE' in detail], details
+
+def test_migrations_bring_an_old_database_to_the_model_indexes():
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        # The schema as it was before migrations existed
+        conn.execute(text('CREATE TABLE replacements (id INTEGER PRIMARY KEY, equipment_id INTEGER, part_id INTEGER, '
+                          'replacement_date DATE, replacement_type_id INTEGER, workshop_id INTEGER)'))
+        conn.execute(text('CREATE INDEX idx_replacement_equipment_id ON replacements (equipment_id)'))
+        conn.execute(text('CREATE INDEX idx_replacement_part_id ON replacements (part_id)'))
+    Base.metadata.create_all(bind=engine)
+
+    assert migrate(engine) == [version for version in range(1, LATEST_VERSION + 1)]
+    assert migrate(engine) == []
+    assert current_version(engine) == LATEST_VERSION
+
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        actual = {index['name']: tuple(index['column_names']) for index in inspector.get_indexes(table.name)}
+        expected = {index.name: tuple(column.name for column in index.columns) for index in table.indexes}
+        assert actual == expected, table.name
@@ -0,0 +1,40 @@
+from datetime import date
+
+from backend import crud
+from backend.models import ReplacementStat
+from backend.schemas import WorkshopCreate, ReplacementPatch
+
+def _stats(db):
+    return {
+        (s.month, s.part_id, s.workshop_id): s.replacement_count
+        for s in db.query(ReplacementStat).all()
+    }
+
+def test_replacement_stats_follow_every_write_path(db_session, fleet, make_replacement):
+    equipment, parts, workshop, _ = fleet
+    other = crud.create_workshop(db_session, WorkshopCreate(name='Депо', address='Казань'))
+    first = crud.create_replacement(db_session, make_replacement(parts[0], date(2024, 1, 5)))
+    crud.create_replacement(db_session, make_replacement(parts[0], date(2024, 1, 20)))
+    assert _stats(db_session) == {(date(2024, 1, 1), parts[0].id, workshop.id): 2}
+
+    crud.update_replacement(db_session, first.id, {'replacement_date': date(2024, 2, 1), 'workshop_id': other.id})
+    rows = [(1, make_replacement(parts[1], date(2024, 2, d)).model_dump()) for d in (1, 9)]
+    crud.bulk_create_replacements(db_session, rows, crud.load_reference_ids(db_session))
+    crud.bulk_update_replacements(db_session, [ReplacementPatch(id=first.id, workshop_id=workshop.id)])
+    stats = _stats(db_session)
+    assert stats == {
+        (date(2024, 1, 1), parts[0].id, workshop.id): 1,
+        (date(2024, 2, 1), parts[0].id, workshop.id): 1,
+        (date(2024, 2, 1), parts[1].id, workshop.id): 2,
+    }
+
+    assert crud.rebuild_replacement_stats(db_session) == 3
+    assert _stats(db_session) == stats
+
+    by_month = crud.get_replacement_stats_rows(db_session, ['month'], date(2024, 2, 15), date(2024, 2, 20))
+    assert by_month == [{'month': date(2024, 2, 1), 'replacement_count': 3}]
+    by_part = crud.get_replacement_stats_rows(db_session, ['part', 'workshop'], equipment_id=equipment.id)
+    assert [(row['part_name'], row['workshop_name'], row['replacement_count']) for row in by_part] == [
+        ('Фильтр 1', 'Гараж', 2), ('Фильтр 2', 'Гараж', 2)
+    ]
+    assert crud.get_replacement_stats_rows(db_session, []) == [{'replacement_count': 4}]
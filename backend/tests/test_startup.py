@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.config import Settings
+from backend.database import ensure_schema, init_schema, seed_database
+from backend.main import app
+from backend.migrations import LATEST_VERSION, stored_version
+from backend.models import Equipment, Part, ReplacementType, Workshop
+
+def test_seed_is_idempotent():
+    engine = create_engine('sqlite://')
+    init_schema(engine)
+    with sessionmaker(bind=engine)() as db:
+        assert seed_database(db) == {'equipment': 5, 'parts': 25, 'workshops': 5, 'replacement_types': 5}
+        assert seed_database(db) == {}
+        counts = [db.execute(select(func.count()).select_from(model)).scalar()
+                  for model in (Equipment, Part, Workshop, ReplacementType)]
+    assert counts == [5, 25, 5, 5]
+
+def test_startup_check_migrates_or_refuses_an_outdated_schema():
+    engine = create_engine('sqlite://')
+    assert stored_version(engine) == 0
+
+    with pytest.raises(RuntimeError, match='backend.cli migrate'):
+        ensure_schema(engine, Settings(auto_migrate=False))
+    assert stored_version(engine) == 0
+
+    assert ensure_schema(engine, Settings(auto_migrate=True)) == LATEST_VERSION
+    assert stored_version(engine) == LATEST_VERSION
+    assert ensure_schema(engine, Settings(auto_migrate=False)) == LATEST_VERSION
+
+def test_lifespan_serves_requests():
+    with TestClient(app) as client:
+        assert client.get('/health').status_code == 200
+
+def test_import_does_not_load_numpy():
+    code = 'import sys, backend.main; print("numpy" in sys.modules)'
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    assert output.strip() == 'False'
+
+def test_import_does_not_load_the_async_driver():
+    # Sync-only deploys need not install aiosqlite or asyncpg
+    code = 'import sys, backend.main; print("aiosqlite" in sys.modules)'
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    assert output.strip() == 'False'
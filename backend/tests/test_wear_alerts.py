@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+from backend import crud
+from backend.models import WearAlert
+from backend.schemas import PartPatch
+
+def _alerts(db):
+    return {(a.part_id, a.zone): a.transition_date for a in db.query(WearAlert).all()}
+
+def test_zone_transitions_agree_with_wear_zone():
+    last = date(2024, 1, 1)
+    for useful_life, stock, procurement in [(100, 5, 10), (100, 0, 10), (100, 0, 60), (7, 0, 30), (1, 3, 1)]:
+        transitions = dict(crud._zone_transitions(useful_life, stock, procurement, last))
+        for zone, day in transitions.items():
+            assert crud._wear_zone(useful_life, stock, procurement, last, day)[0] == zone
+            if day > last:
+                assert crud._wear_zone(useful_life, stock, procurement, last, day - timedelta(days=1))[0] != zone
+        assert crud._wear_zone(useful_life, stock, procurement, last, last + timedelta(days=useful_life))[0] in transitions
+
+def test_wear_alerts_follow_replacements_and_stock(db_session, fleet, make_replacement):
+    _, parts, _, _ = fleet
+    repl = crud.create_replacement(db_session, make_replacement(parts[0], date(2024, 1, 1)))
+    # useful_life 100: Yellow from 25% left (day 75), Red from 10% left (day 90)
+    assert _alerts(db_session) == {(parts[0].id, 'Yellow'): date(2024, 3, 16), (parts[0].id, 'Red'): date(2024, 3, 31)}
+
+    crud.update_replacement(db_session, repl.id, {'replacement_date': date(2024, 2, 1)})
+    assert _alerts(db_session)[(parts[0].id, 'Red')] == date(2024, 5, 1)
+
+    # Out of stock with 20 days to procure: Critical from day 81, before Red would start
+    crud.update_part(db_session, parts[0].id, PartPatch(stock_quantity=0, procurement_time=20))
+    alerts = _alerts(db_session)
+    assert alerts[(parts[0].id, 'Critical')] == date(2024, 4, 22)
+    assert (parts[0].id, 'Red') not in alerts
+
+    upcoming = crud.get_wear_alert_rows(db_session, date(2024, 4, 1), within_days=30, limit=10)
+    assert [(a['part_id'], a['zone'], a['transition_date']) for a in upcoming] == \
+        [(parts[0].id, 'Yellow', date(2024, 4, 16)), (parts[0].id, 'Critical', date(2024, 4, 22))]
+
+    assert crud.rebuild_wear_alerts(db_session) == len(alerts)
+    assert _alerts(db_session) == alerts
@@ -0,0 +1,20 @@
+from datetime import date
+
+from backend import crud
+from backend.schemas import PartCreate
+
+def test_wear_forecast_matches_daily_wear(db_session, fleet, make_replacement):
+    equipment, parts, _, _ = fleet
+    parts.append(crud.create_part(db_session, PartCreate(name='Ремень', useful_life=40, equipment_id=equipment.id,
+                                                         quantity_per_equipment=1, stock_quantity=0,
+                                                         procurement_time=15)))
+    crud.create_replacement(db_session, make_replacement(parts[0], date(2024, 1, 1)))
+    crud.create_replacement(db_session, make_replacement(parts[2], date(2024, 1, 20)))
+
+    forecast = crud.forecast_wear_for_equipment(db_session, equipment.id, date(2024, 1, 1), date(2024, 5, 1), 3)
+    assert forecast['dates'][:2] == [date(2024, 1, 1), date(2024, 1, 4)]
+    assert [p['part_id'] for p in forecast['parts']] == [p.id for p in parts]
+    for i, day in enumerate(forecast['dates']):
+        daily = crud.calculate_wear_for_equipment(db_session, equipment.id, day)
+        assert [(p['zone'][i], p['remaining_percentage'][i]) for p in forecast['parts']] == \
+            [(w.zone, w.remaining_percentage) for w in daily]
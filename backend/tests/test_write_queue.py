@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend import crud
+from backend.config import settings
+from backend.database import build_writer_engine, init_schema, seed_database
+from backend.models import PartState, Replacement
+from backend.schemas import ReplacementCreate
+from backend.write_queue import WriteQueue, WriteQueueFull
+
+@pytest.fixture
+def writer(tmp_path):
+    engine = build_writer_engine(f'sqlite:///{tmp_path / "writes.db"}', settings)
+    init_schema(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with session_factory() as db:
+        seed_database(db)
+    write_queue = WriteQueue(session_factory, max_batch=16, max_delay_ms=20)
+    yield write_queue, session_factory
+    write_queue.stop()
+    engine.dispose()
+
+def _replacement(part_id: int, day: int) -> ReplacementCreate:
+    return ReplacementCreate(equipment_id=1, part_id=part_id, replacement_date=date(2024, 1, day),
+                             replacement_type_id=1, workshop_id=1)
+
+def _fail(db, message):
+    crud.add_replacement(db, _replacement(1, 28))
+    raise ValueError(message)
+
+def test_concurrent_writes_are_group_committed(writer):
+    write_queue, session_factory = writer
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = list(pool.map(
+            lambda i: write_queue.submit(crud.add_replacement, _replacement(i % 5 + 1, i % 27 + 1)), range(64)
+        ))
+    results = [future.result(timeout=10) for future in futures]
+
+    assert len({result.id for result in results}) == 64
+    assert write_queue.jobs == 64
+    assert write_queue.batches < 64
+    with session_factory() as db:
+        assert db.execute(select(func.count()).select_from(Replacement)).scalar() == 64
+        assert db.execute(select(func.sum(PartState.replacement_count))).scalar() == 64
+
+def test_failed_write_only_fails_its_own_caller(writer):
+    write_queue, session_factory = writer
+    release = threading.Event()
+    # Holding the writer on a first job makes the next three land in one batch
+    blocker = write_queue.submit(lambda db: release.wait(5))
+    ok_before = write_queue.submit(crud.add_replacement, _replacement(1, 1))
+    failing = write_queue.submit(_fail, 'bad row')
+    ok_after = write_queue.submit(crud.apply_replacement_update, 10 ** 9, {'workshop_id': 2})
+    release.set()
+
+    assert blocker.result(timeout=10) is True
+    created = ok_before.result(timeout=10)
+    with pytest.raises(ValueError, match='bad row'):
+        failing.result(timeout=10)
+    assert ok_after.result(timeout=10) is None
+    with session_factory() as db:
+        dates = db.execute(select(Replacement.replacement_date)).scalars().all()
+    assert dates == [date(2024, 1, 1)]
+    assert created.id
+
+def test_full_queue_rejects_writes(writer):
+    _, session_factory = writer
+    write_queue = WriteQueue(session_factory, max_pending=1)
+    started, release = threading.Event(), threading.Event()
+    blocker = write_queue.submit(lambda db: started.set() or release.wait(5))
+    try:
+        assert started.wait(5)
+        write_queue.submit(lambda db: None)
+        with pytest.raises(WriteQueueFull):
+            write_queue.submit(lambda db: None)
+    finally:
+        release.set()
+        blocker.result(timeout=10)
+        write_queue.stop()
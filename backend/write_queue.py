@@ -0,0 +1,121 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+class WriteQueueFull(Exception):
+    pass
+
+@dataclass
+class _Job:
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    future: Future
+
+_STOP = object()
+
+class WriteQueue:
+    """Coalesces concurrent small writes into group commits on one thread.
+
+    Callers submit fn(db, *args) and get a Future. A single writer thread
+    takes up to max_batch jobs, waiting at most max_delay_ms after the first
+    one for more to arrive, and runs each inside its own SAVEPOINT of one
+    shared transaction. A job that raises only rolls back its savepoint and
+    fails its own future; results are delivered once the group commit
+    succeeds, so a caller never sees a result that was not persisted.
+    """
+
+    def __init__(self, session_factory: sessionmaker, max_batch: int = 64, max_delay_ms: float = 2.0,
+                 max_pending: int = 10000):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.batches = 0
+        self.jobs = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        self._ensure_started()
+        future: Future = Future()
+        try:
+            self._queue.put_nowait(_Job(fn, args, future))
+        except queue.Full:
+            raise WriteQueueFull(f'Write queue is full ({self._queue.maxsize} pending writes)')
+        return future
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Commit everything already queued, then stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='write-queue', daemon=True)
+                self._thread.start()
+
+    def _next_batch(self) -> Tuple[List[_Job], bool]:
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is _STOP:
+                return batch, True
+            batch.append(job)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._commit(batch)
+            if stopping:
+                return
+
+    def _commit(self, batch: List[_Job]) -> None:
+        done: List[Tuple[_Job, Any]] = []
+        with self.session_factory() as db:
+            try:
+                for job in batch:
+                    if not job.future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with db.begin_nested():
+                            result = job.fn(db, *job.args)
+                    except Exception as exc:
+                        job.future.set_exception(exc)
+                    else:
+                        done.append((job, result))
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                logger.exception('Group commit of %s writes failed', len(done))
+                for job, _ in done:
+                    job.future.set_exception(exc)
+                return
+        self.batches += 1
+        self.jobs += len(batch)
+        logger.debug('Group commit of %s writes', len(done))
+        for job, result in done:
+            job.future.set_result(result)
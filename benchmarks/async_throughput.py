@@ -0,0 +1,110 @@
+"""Compare sync and async database paths under concurrent load.
+
+Fills a scratch SQLite database with benchmarks.datagen, starts uvicorn
+against it twice, once with ASYNC_DB=0 and once with ASYNC_DB=1, fires
+concurrent requests at the read endpoints and prints requests per second for
+each mode as JSON.
+
+    python -m benchmarks.async_throughput --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import create_engine
+
+from benchmarks.datagen import SIZES, populate
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _start_server(database_url: str, async_db: bool, port: int) -> subprocess.Popen:
+    env = {**os.environ, 'DATABASE_URL': database_url, 'ASYNC_DB': '1' if async_db else '0'}
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'backend.main:app', '--port', str(port), '--log-level', 'warning'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+def _wait_until_healthy(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f'{base_url}/health').status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f'Server at {base_url} did not become healthy')
+
+async def _load(base_url: str, paths, total: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def one(i):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(paths[i % len(paths)])
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': total,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(total / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+def run(total: int, concurrency: int, size: str = 'small') -> dict:
+    end_date = (date.today() + timedelta(days=365)).isoformat()
+    paths = ['/wear/', '/wear/1', f'/procurement/?end_date={end_date}', f'/procurement/1?end_date={end_date}']
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+        engine = create_engine(database_url)
+        populate(engine, SIZES[size])
+        engine.dispose()
+        for mode, async_db in (('sync', False), ('async', True)):
+            port = _free_port()
+            server = _start_server(database_url, async_db, port)
+            try:
+                base_url = f'http://127.0.0.1:{port}'
+                _wait_until_healthy(base_url)
+                results[mode] = asyncio.run(_load(base_url, paths, total, concurrency))
+            finally:
+                server.terminate()
+                server.wait()
+    results['speedup'] = round(results['async']['requests_per_second'] / results['sync']['requests_per_second'], 2)
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--size', choices=sorted(SIZES), default='small')
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests, args.concurrency, args.size), indent=2))
+
+if __name__ == '__main__':
+    main()
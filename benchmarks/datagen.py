@@ -0,0 +1,172 @@
+"""Deterministic synthetic fleet generator.
+
+Builds a parameterized dataset (equipment, parts, workshops, replacement
+types and replacement history) from a seed, so the same spec always produces
+the same rows. Replacement history is spread backwards from a fixed end date:
+short-lived parts are replaced more often, and the most recent replacement of
+each part falls somewhere within its useful life, so wear zones come out
+mixed instead of uniformly green or red.
+
+    python -m benchmarks.datagen --database-url sqlite:///fleet.db --size large
+    python -m benchmarks.datagen --database-url sqlite:///fleet.db \\
+        --equipment 10000 --parts 100000 --replacements 5000000 --seed 7
+"""
+import argparse
+import json
+import random
+import time
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from backend.crud import rebuild_part_state, rebuild_replacement_stats, rebuild_wear_alerts
+from backend.migrations import migrate
+from backend.models import Base, Equipment, Part, Replacement, ReplacementType, Workshop
+
+USEFUL_LIFE_DAYS = (90, 180, 365, 730, 1095, 1825)
+
+@dataclass(frozen=True)
+class FleetSpec:
+    equipment: int = 50
+    parts: int = 500
+    replacements: int = 20_000
+    workshops: int = 20
+    replacement_types: int = 5
+    seed: int = 42
+    end_date: date = date(2026, 1, 1)
+    history_days: int = 10 * 365
+
+SIZES = {
+    'tiny': FleetSpec(equipment=5, parts=25, replacements=500),
+    'small': FleetSpec(),
+    'medium': FleetSpec(equipment=1_000, parts=10_000, replacements=500_000),
+    'large': FleetSpec(equipment=10_000, parts=100_000, replacements=5_000_000),
+}
+
+def _rng(spec: FleetSpec, table: str) -> random.Random:
+    # One stream per table keeps each table stable when another one is resized
+    return random.Random(f'{spec.seed}:{table}')
+
+def equipment_rows(spec: FleetSpec) -> List[Dict[str, Any]]:
+    rng = _rng(spec, 'equipment')
+    return [
+        {'id': i, 'name': f'Техника {i:06d}', 'fleet_quantity': rng.randint(1, 40)}
+        for i in range(1, spec.equipment + 1)
+    ]
+
+def part_rows(spec: FleetSpec) -> List[Dict[str, Any]]:
+    rng = _rng(spec, 'parts')
+    return [
+        {
+            'id': i, 'name': f'Запчасть {i:07d}', 'equipment_id': (i - 1) % spec.equipment + 1,
+            'useful_life': rng.choice(USEFUL_LIFE_DAYS), 'quantity_per_equipment': rng.randint(1, 6),
+            'stock_quantity': rng.choice((0, 0, 1, 2, 5, 10, 20, 50)), 'procurement_time': rng.randint(3, 90),
+        }
+        for i in range(1, spec.parts + 1)
+    ]
+
+def workshop_rows(spec: FleetSpec) -> List[Dict[str, Any]]:
+    return [{'id': i, 'name': f'Мастерская {i:04d}', 'address': f'Город {i}'} for i in range(1, spec.workshops + 1)]
+
+def replacement_type_rows(spec: FleetSpec) -> List[Dict[str, Any]]:
+    return [{'id': i, 'name': f'Тип замены {i}'} for i in range(1, spec.replacement_types + 1)]
+
+def _replacement_counts(spec: FleetSpec, parts: List[Dict[str, Any]]) -> List[int]:
+    weights = [1 / part['useful_life'] for part in parts]
+    total_weight = sum(weights)
+    counts = [int(spec.replacements * w / total_weight) for w in weights]
+    for i in range(spec.replacements - sum(counts)):
+        counts[i % len(counts)] += 1
+    return counts
+
+def replacement_rows(spec: FleetSpec, parts: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    if not parts:
+        return
+    rng = _rng(spec, 'replacements')
+    for part, count in zip(parts, _replacement_counts(spec, parts)):
+        if not count:
+            continue
+        spacing = spec.history_days / count
+        offset = rng.uniform(0, min(spec.history_days, part['useful_life'] * 1.2))
+        for _ in range(count):
+            yield {
+                'equipment_id': part['equipment_id'], 'part_id': part['id'],
+                'replacement_date': spec.end_date - timedelta(days=int(offset)),
+                'replacement_type_id': rng.randint(1, spec.replacement_types),
+                'workshop_id': rng.randint(1, spec.workshops),
+            }
+            offset += spacing * rng.uniform(0.7, 1.3)
+
+def _chunks(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def populate(engine: Engine, spec: FleetSpec, chunk_size: int = 10_000) -> Dict[str, int]:
+    """Create the schema on an empty database and fill it according to spec."""
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    with Session(engine) as db:
+        if db.execute(select(func.count()).select_from(Equipment)).scalar():
+            raise ValueError('populate() needs an empty database')
+
+        parts = part_rows(spec)
+        for model, rows in ((Equipment, equipment_rows(spec)), (Part, parts), (Workshop, workshop_rows(spec)),
+                            (ReplacementType, replacement_type_rows(spec))):
+            for chunk in _chunks(iter(rows), chunk_size):
+                db.execute(insert(model), chunk)
+        db.commit()
+
+        inserted = 0
+        for chunk in _chunks(replacement_rows(spec, parts), chunk_size):
+            db.execute(insert(Replacement), chunk)
+            db.commit()
+            inserted += len(chunk)
+
+        states = rebuild_part_state(db)
+        alerts = rebuild_wear_alerts(db)
+        stats = rebuild_replacement_stats(db)
+    return {
+        'equipment': spec.equipment, 'parts': spec.parts, 'workshops': spec.workshops,
+        'replacement_types': spec.replacement_types, 'replacements': inserted, 'part_states': states,
+        'wear_alerts': alerts, 'replacement_stats': stats,
+    }
+
+def spec_from_args(args: argparse.Namespace) -> FleetSpec:
+    spec = SIZES[args.size]
+    overrides = {
+        name: getattr(args, name)
+        for name in ('equipment', 'parts', 'replacements', 'workshops', 'replacement_types', 'seed')
+        if getattr(args, name) is not None
+    }
+    return replace(spec, **overrides)
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--size', choices=sorted(SIZES), default='small')
+    for name in ('equipment', 'parts', 'replacements', 'workshops', 'replacement_types', 'seed'):
+        parser.add_argument(f'--{name.replace("_", "-")}', dest=name, type=int)
+
+def main() -> None:
+    from sqlalchemy import create_engine
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', required=True)
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    started = time.perf_counter()
+    counts = populate(create_engine(args.database_url), spec)
+    print(json.dumps({**counts, 'seconds': round(time.perf_counter() - started, 2)}, indent=2))
+
+if __name__ == '__main__':
+    main()
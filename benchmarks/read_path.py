@@ -0,0 +1,72 @@
+"""Measure the per-row cost of serving the replacement journal.
+
+Fills an in-memory SQLite database with benchmarks.datagen and times two ways of turning a page of
+replacements into a JSON body: the ORM path (hydrate Replacement objects,
+copy them into ReplacementResponse, validate again as response_model and
+dump) and the lean path (column projection into dicts, dumped by orjson).
+Prints microseconds per row for both as JSON.
+
+    python -m benchmarks.read_path --rows 20000 --repeat 5
+"""
+import argparse
+import json
+import time
+from dataclasses import replace
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend import crud
+from backend.models import Replacement
+from backend.schemas import ReplacementResponse
+from benchmarks.datagen import SIZES, populate
+
+RESPONSE_ADAPTER = TypeAdapter(List[ReplacementResponse])
+
+def orm_path(db) -> bytes:
+    replacements = db.query(Replacement).order_by(Replacement.id).all()
+    items = [ReplacementResponse(**r.__dict__) for r in replacements]
+    return RESPONSE_ADAPTER.dump_json(RESPONSE_ADAPTER.validate_python(items))
+
+def lean_path(db) -> bytes:
+    return orjson.dumps(crud.get_replacement_rows(db))
+
+def _time(fn, session_factory, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            fn(db)
+            best = min(best, time.perf_counter() - started)
+        finally:
+            db.close()
+    return best
+
+def run(rows: int, repeat: int) -> dict:
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    populate(engine, replace(SIZES['small'], replacements=rows))
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        assert orjson.loads(orm_path(db)) == orjson.loads(lean_path(db))
+
+    results = {'rows': rows}
+    for name, fn in (('orm', orm_path), ('lean', lean_path)):
+        seconds = _time(fn, session_factory, repeat)
+        results[name] = {'seconds': round(seconds, 4), 'us_per_row': round(seconds / rows * 1e6, 2)}
+    results['speedup'] = round(results['orm']['seconds'] / results['lean']['seconds'], 2)
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.repeat), indent=2))
+
+if __name__ == '__main__':
+    main()
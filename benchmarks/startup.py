@@ -0,0 +1,77 @@
+"""Measure backend cold start.
+
+Fills a scratch SQLite database with benchmarks.datagen, then repeatedly
+starts a fresh interpreter and reports, as JSON, how long it takes to import
+backend.main and how long uvicorn takes from process spawn to the first
+successful /health response.
+
+    python -m benchmarks.startup --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine
+
+from benchmarks.async_throughput import _free_port, _start_server
+from benchmarks.datagen import SIZES, populate
+
+IMPORT_SNIPPET = 'import time; t = time.perf_counter(); import backend.main; print(time.perf_counter() - t)'
+
+def _import_seconds(env: dict) -> float:
+    output = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+def _first_request_seconds(database_url: str, timeout: float = 30.0) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    server = _start_server(database_url, False, port)
+    try:
+        with httpx.Client(base_url=f'http://127.0.0.1:{port}') as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    if client.get('/health').status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+    finally:
+        server.terminate()
+        server.wait()
+    raise RuntimeError(f'Server did not answer /health within {timeout} seconds')
+
+def _summary(samples) -> dict:
+    return {
+        'min_ms': round(min(samples) * 1000, 1),
+        'median_ms': round(statistics.median(samples) * 1000, 1),
+        'max_ms': round(max(samples) * 1000, 1),
+    }
+
+def run(runs: int, size: str = 'tiny') -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+        engine = create_engine(database_url)
+        populate(engine, SIZES[size])
+        engine.dispose()
+
+        env = {**os.environ, 'DATABASE_URL': database_url, 'LOG_FILE': os.path.join(tmp, 'app.log')}
+        imports = [_import_seconds(env) for _ in range(runs)]
+        first_requests = [_first_request_seconds(database_url) for _ in range(runs)]
+    return {'runs': runs, 'import_backend_main': _summary(imports), 'spawn_to_first_request': _summary(first_requests)}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--size', choices=sorted(SIZES), default='tiny')
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, args.size), indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""Micro-benchmark suite for crud functions and API endpoints.
+
+For every requested dataset size a SQLite database is generated with
+benchmarks.datagen, then each crud/calculation function is timed on a
+session and each endpoint is timed through TestClient (with the reference
+list cache cleared before every call, so the cold path is what gets
+measured). Results are written as JSON; pass an earlier result with
+--compare to get per-case ratios of the best runs and a non-zero exit code
+on regressions.
+
+    python -m benchmarks.suite --sizes tiny small --output bench.json
+    python -m benchmarks.suite --sizes small --compare bench.json
+    python -m benchmarks.suite --sizes large --workdir /tmp/fleets  # reuse generated databases
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.datagen import SIZES, FleetSpec, populate
+
+REGRESSION_THRESHOLD = 1.2
+MIN_REGRESSION_MS = 0.5
+
+def measure(fn: Callable[[], Any], repeat: int, setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    timings = []
+    for attempt in range(repeat + 1):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        if attempt:  # the first call only warms caches and connections
+            timings.append(elapsed * 1000)
+    return {
+        'runs': repeat,
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+def crud_cases(end_date: date) -> List[Tuple[str, Callable]]:
+    from backend import crud
+
+    today = date.today()
+    return [
+        ('get_equipment_rows', lambda db: crud.get_equipment_rows(db)),
+        ('get_part_rows[limit=1000]', lambda db: crud.get_part_rows(db, limit=1000)),
+        ('get_parts[equipment_id=1]', lambda db: crud.get_parts(db, equipment_id=1)),
+        ("search_part_rows['запчасть 00001']", lambda db: crud.search_part_rows(db, 'запчасть 00001', 20)),
+        ('get_replacement_rows[limit=1000]', lambda db: crud.get_replacement_rows(db, limit=1000)),
+        ('get_replacement_rows[part_id=1]', lambda db: crud.get_replacement_rows(db, part_id=1)),
+        ('get_replacements[part_id=1]', lambda db: crud.get_replacements(db, part_id=1)),
+        ('calculate_wear_for_equipment[1]', lambda db: crud.calculate_wear_for_equipment(db, 1, today)),
+        ('calculate_wear_rows[fleet]', lambda db: crud.calculate_wear_rows(db, today)),
+        ('forecast_wear_for_equipment[1, 365 days]',
+         lambda db: crud.forecast_wear_for_equipment(db, 1, today, today + timedelta(days=365))),
+        ('calculate_procurement_plan[1]', lambda db: crud.calculate_procurement_plan(db, 1, end_date)),
+        ('calculate_procurement_rows[all]', lambda db: crud.calculate_procurement_rows(db, end_date)),
+        ('calculate_demand_rows[365 days]', lambda db: crud.calculate_demand_rows(db, today, 365)),
+        ('get_replacement_stats_rows[workshop x month, 1 year]', lambda db: crud.get_replacement_stats_rows(
+            db, ['workshop', 'month'], today - timedelta(days=365), today)),
+        ('get_replacement_stats_rows[month, equipment_id=1]',
+         lambda db: crud.get_replacement_stats_rows(db, ['month'], equipment_id=1)),
+    ]
+
+def endpoint_cases(end_date: date) -> List[Tuple[str, str]]:
+    return [
+        ('GET /equipment/?limit=1000', '/equipment/?limit=1000'),
+        ('GET /parts/?limit=1000', '/parts/?limit=1000'),
+        ('GET /parts/search?q=запч 0001', '/parts/search?q=запч%200001&limit=20'),
+        ('GET /replacements/?limit=1000', '/replacements/?limit=1000'),
+        ('GET /replacements/?part_id=1', '/replacements/?part_id=1'),
+        ('GET /replacements/export?part_id=1', '/replacements/export?part_id=1'),
+        ('GET /wear/1', '/wear/1'),
+        ('GET /wear/?equipment_ids=1', '/wear/?equipment_ids=1'),
+        ('GET /wear/', '/wear/'),
+        ('GET /wear/1/forecast[365 days]', f'/wear/1/forecast?to={date.today() + timedelta(days=365)}'),
+        ('GET /procurement/1', f'/procurement/1?end_date={end_date}'),
+        ('GET /procurement/', f'/procurement/?end_date={end_date}'),
+        ('GET /demand/?horizon_days=365', '/demand/?horizon_days=365'),
+        ('GET /stats/replacements[month x workshop]', '/stats/replacements?group_by=month&group_by=workshop'),
+    ]
+
+def _database_path(workdir: str, size: str, spec: FleetSpec) -> str:
+    digest = hashlib.sha1(repr(spec).encode()).hexdigest()[:10]
+    return os.path.join(workdir, f'fleet-{size}-{digest}.db')
+
+def run_size(size: str, spec: FleetSpec, workdir: str, repeat: int) -> Dict[str, Any]:
+    from fastapi.testclient import TestClient
+    from sqlalchemy.orm import sessionmaker
+
+    from backend import database, export, main
+    from backend.config import settings
+
+    path = _database_path(workdir, size, spec)
+    url = f'sqlite:///{path}'
+    engine = database.build_engine(url, settings)
+    result: Dict[str, Any] = {'spec': {**asdict(spec), 'end_date': spec.end_date.isoformat()}}
+    if not os.path.exists(path):
+        started = time.perf_counter()
+        result['rows'] = populate(engine, spec)
+        result['populate_seconds'] = round(time.perf_counter() - started, 2)
+    else:
+        # Databases cached by an older revision may miss later tables and indexes
+        database.init_schema(engine)
+
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    end_date = date.today() + timedelta(days=365)
+
+    result['crud'] = {}
+    for name, case in crud_cases(end_date):
+        with session_factory() as db:
+            result['crud'][name] = measure(lambda: case(db), repeat)
+
+    def override_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    main.app.dependency_overrides[database.get_db] = override_db
+    main.app.dependency_overrides[database.get_read_db] = override_db
+    export_sessions = export.ReadSessionLocal
+    export.ReadSessionLocal = session_factory
+    try:
+        with TestClient(main.app) as client:
+            result['endpoints'] = {}
+            for name, path_query in endpoint_cases(end_date):
+                def call():
+                    response = client.get(path_query)
+                    response.raise_for_status()
+                result['endpoints'][name] = measure(call, repeat, setup=main.response_cache.clear)
+    finally:
+        main.app.dependency_overrides.clear()
+        export.ReadSessionLocal = export_sessions
+        engine.dispose()
+    return result
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(sizes: List[str], repeat: int, workdir: str) -> Dict[str, Any]:
+    # backend.main initializes its configured database on import; keep that
+    # away from any real database when the caller did not choose one.
+    os.environ.setdefault('DATABASE_URL', f'sqlite:///{os.path.join(workdir, "app.db")}')
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'repeat': repeat,
+        },
+        'sizes': {size: run_size(size, SIZES[size], workdir, repeat) for size in sizes},
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = REGRESSION_THRESHOLD) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Best-run ratios for every case present in both results.
+
+    The minimum is the least noisy statistic for short timings; a case only
+    counts as a regression when it is slower by the threshold ratio and by
+    more than MIN_REGRESSION_MS in absolute terms.
+    """
+    rows, regressions = [], []
+    for size, groups in current['sizes'].items():
+        for group in ('crud', 'endpoints'):
+            for name, stats in groups.get(group, {}).items():
+                before = baseline.get('sizes', {}).get(size, {}).get(group, {}).get(name)
+                if not before or not before['min_ms']:
+                    continue
+                ratio = round(stats['min_ms'] / before['min_ms'], 2)
+                key = f'{size}/{group}/{name}'
+                rows.append({'case': key, 'baseline_ms': before['min_ms'],
+                             'current_ms': stats['min_ms'], 'ratio': ratio})
+                if ratio > threshold and stats['min_ms'] - before['min_ms'] > MIN_REGRESSION_MS:
+                    regressions.append(key)
+    return rows, regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', choices=sorted(SIZES), default=['tiny', 'small'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write results to this JSON file instead of stdout')
+    parser.add_argument('--compare', help='earlier result JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument('--workdir', help='keep generated databases here and reuse them across runs')
+    args = parser.parse_args()
+
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        results = run(args.sizes, args.repeat, args.workdir)
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            results = run(args.sizes, args.repeat, workdir)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            rows, regressions = compare(results, json.load(f), args.threshold)
+        print(json.dumps({'comparison': rows, 'regressions': regressions}, indent=2, ensure_ascii=False),
+              file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
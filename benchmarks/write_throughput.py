@@ -0,0 +1,103 @@
+"""Compare per-request commits with the group-commit write queue.
+
+Fills a scratch SQLite database with benchmarks.datagen, starts uvicorn
+against it twice, once with WRITE_QUEUE=0 and once with WRITE_QUEUE=1, fires
+concurrent POST /replacements/ requests and prints sustained writes per second
+and error counts for each mode as JSON.
+
+    python -m benchmarks.write_throughput --requests 2000 --concurrency 64 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import create_engine
+
+from benchmarks.async_throughput import _free_port, _wait_until_healthy
+from benchmarks.datagen import SIZES, populate
+
+def _start_server(database_url: str, write_queue: bool, port: int, workers: int) -> subprocess.Popen:
+    env = {**os.environ, 'DATABASE_URL': database_url, 'WRITE_QUEUE': '1' if write_queue else '0'}
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'backend.main:app', '--port', str(port), '--workers', str(workers),
+         '--log-level', 'warning'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+def _payloads(total: int, spec) -> list:
+    start = date(2000, 1, 1)
+    return [
+        {
+            'equipment_id': (i % spec.parts) % spec.equipment + 1, 'part_id': i % spec.parts + 1,
+            'replacement_date': (start + timedelta(days=i % 3650)).isoformat(),
+            'replacement_type_id': i % spec.replacement_types + 1, 'workshop_id': i % spec.workshops + 1,
+        }
+        for i in range(total)
+    ]
+
+async def _load(base_url: str, payloads: list, concurrency: int) -> dict:
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def one(payload):
+            nonlocal errors
+            async with semaphore:
+                response = await client.post('/replacements/', json=payload)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(payload) for payload in payloads))
+        elapsed = time.perf_counter() - started
+
+    return {
+        'requests': len(payloads),
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'writes_per_second': round((len(payloads) - errors) / elapsed, 1),
+    }
+
+def run(total: int, concurrency: int, workers: int, size: str = 'tiny') -> dict:
+    spec = SIZES[size]
+    payloads = _payloads(total, spec)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, write_queue in (('per_request', False), ('group_commit', True)):
+            database_url = f'sqlite:///{os.path.join(tmp, f"{mode}.db")}'
+            engine = create_engine(database_url)
+            populate(engine, spec)
+            engine.dispose()
+            port = _free_port()
+            server = _start_server(database_url, write_queue, port, workers)
+            try:
+                base_url = f'http://127.0.0.1:{port}'
+                _wait_until_healthy(base_url)
+                results[mode] = asyncio.run(_load(base_url, payloads, concurrency))
+            finally:
+                server.terminate()
+                server.wait()
+    results['speedup'] = round(
+        results['group_commit']['writes_per_second'] / results['per_request']['writes_per_second'], 2
+    )
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--size', choices=sorted(SIZES), default='tiny')
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests, args.concurrency, args.workers, args.size), indent=2))
+
+if __name__ == '__main__':
+    main()
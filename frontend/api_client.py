@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple, Union
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+BASE_URL = 'http://backend:8000'
+REQUEST_TIMEOUT = 30
+CACHE_TTL_SECONDS = 60
+MAX_PARALLEL_REQUESTS = 8
+PART_SEARCH_LIMIT = 20
+EVENT_READ_TIMEOUT = 60
+EVENT_RECONNECT_SECONDS = (1, 30)
+EVENT_POLL_SECONDS = 2
+
+Request = Union[str, Tuple[str, Optional[Dict[str, Any]]], Tuple[str, Optional[Dict[str, Any]], Hashable]]
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_PARALLEL_REQUESTS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+@st.cache_resource
+def _etag_store() -> Dict[Tuple[str, str], Tuple[str, Any]]:
+    return {}
+
+def _get_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    url = f'{BASE_URL}{path}'
+    key = (url, repr(sorted((params or {}).items())))
+    store = _etag_store()
+    headers = {}
+    if key in store:
+        headers['If-None-Match'] = store[key][0]
+
+    response = get_session().get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304 and key in store:
+        return store[key][1]
+    response.raise_for_status()
+    data = response.json()
+    etag = response.headers.get('ETag')
+    if isinstance(etag, str):
+        store[key] = (etag, data)
+    return data
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def fetch(path: str, params: Optional[Dict[str, Any]] = None, version: Hashable = None) -> Any:
+    # version is only part of the cache key: pass event_version(...) to get
+    # fresh data as soon as the backend reports a change instead of after the TTL
+    return _get_json(path, params)
+
+class EventVersions:
+    """Change counters per scope, advanced by the backend's /events stream.
+
+    Scopes are 'replacements' and 'wear:<equipment_id>'; '*' advances on
+    (re)connect, bulk loads and resync, when anything may have changed.
+    """
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, scopes: Iterable[str]) -> None:
+        with self._lock:
+            for scope in scopes:
+                self._counts[scope] = self._counts.get(scope, 0) + 1
+
+    def get(self, scope: str) -> Tuple[int, int]:
+        with self._lock:
+            return self._counts.get('*', 0), self._counts.get(scope, 0)
+
+def _event_scopes(event_type: str, data: Dict[str, Any]) -> Tuple[str, ...]:
+    if event_type in ('replacement.created', 'replacement.updated'):
+        return 'replacements', f"wear:{data['equipment_id']}"
+    if event_type == 'wear.zone_changed':
+        return (f"wear:{data['equipment_id']}",)
+    return ('*',)
+
+def _listen(versions: EventVersions) -> None:
+    # One long-lived connection, kept out of the shared pool used by page requests
+    delay, max_delay = EVENT_RECONNECT_SECONDS
+    while True:
+        try:
+            with requests.get(f'{BASE_URL}/events', stream=True, timeout=(REQUEST_TIMEOUT, EVENT_READ_TIMEOUT)) as response:
+                response.raise_for_status()
+                # Nothing was heard while disconnected, so every scope is suspect
+                versions.bump(['*'])
+                delay = EVENT_RECONNECT_SECONDS[0]
+                event_type = None
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith('event: '):
+                        event_type = line[len('event: '):]
+                    elif line.startswith('data: ') and event_type:
+                        versions.bump(_event_scopes(event_type, json.loads(line[len('data: '):])))
+                    elif not line:
+                        event_type = None
+        except (requests.RequestException, ValueError, KeyError):
+            pass
+        time.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+@st.cache_resource
+def _event_versions() -> EventVersions:
+    versions = EventVersions()
+    threading.Thread(target=_listen, args=(versions,), name='backend-events', daemon=True).start()
+    return versions
+
+def event_version(scope: str) -> Tuple[int, int]:
+    return _event_versions().get(scope)
+
+def part_search_request(query: str, equipment_id: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+    params: Dict[str, Any] = {'q': query.strip(), 'limit': PART_SEARCH_LIMIT}
+    if equipment_id:
+        params['equipment_id'] = equipment_id
+    return '/parts/search', params
+
+def search_parts(query: str, equipment_id: Optional[int] = None) -> Any:
+    return fetch(*part_search_request(query, equipment_id))
+
+def fetch_many(requests_by_name: Dict[str, Request]) -> Dict[str, Any]:
+    normalized = {
+        name: (request, None, None) if isinstance(request, str) else (*request, None)[:3]
+        for name, request in requests_by_name.items()
+    }
+    ctx = get_script_run_ctx()
+
+    def attach_context():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+
+    workers = min(MAX_PARALLEL_REQUESTS, len(normalized)) or 1
+    with ThreadPoolExecutor(max_workers=workers, initializer=attach_context) as executor:
+        futures = {
+            name: executor.submit(fetch, path, params, version) for name, (path, params, version) in normalized.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+def invalidate() -> None:
+    fetch.clear()
+
+def post(path: str, payload: Any) -> requests.Response:
+    response = get_session().post(f'{BASE_URL}{path}', json=payload, timeout=REQUEST_TIMEOUT)
+    invalidate()
+    return response
+
+def patch(path: str, payload: Any) -> requests.Response:
+    response = get_session().patch(f'{BASE_URL}{path}', json=payload, timeout=REQUEST_TIMEOUT)
+    invalidate()
+    return response
@@ -1,31 +1,31 @@
 import streamlit as st
-import requests
 import pandas as pd
-
-BASE_URL = 'http://backend:8000'
+from api_client import fetch_many, post
 
 st.title('Справочники')
 
+data = fetch_many({
+    'equipment': '/equipment/',
+    'parts': '/parts/',
+    'workshops': '/workshops/',
+    'replacement_types': '/replacement_types/',
+})
+
 tabs = st.tabs(['Оборудование', 'Запчасти', 'Мастерские', 'Типы замен'])
 
 with tabs[0]:
-    response = requests.get(f'{BASE_URL}/equipment/')
-    data = response.json()
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(data['equipment'])
     st.dataframe(df)
     with st.form('add_equipment'):
         name = st.text_input('Наименование')
         fleet_quantity = st.number_input('Количество в парке', min_value=1)
         if st.form_submit_button('Добавить'):
-            requests.post(f'{BASE_URL}/equipment/', json={'name': name, 'fleet_quantity': fleet_quantity})
+            post('/equipment/', {'name': name, 'fleet_quantity': fleet_quantity})
             st.rerun()
 
 with tabs[1]:
-    equipments = requests.get(f'{BASE_URL}/equipment/').json()
-    eq_options = {eq['name']: eq['id'] for eq in equipments}
-    response = requests.get(f'{BASE_URL}/parts/')
-    data = response.json()
-    df = pd.DataFrame(data)
+    eq_options = {eq['name']: eq['id'] for eq in data['equipment']}
+    df = pd.DataFrame(data['parts'])
     st.dataframe(df)
     with st.form('add_part'):
         name = st.text_input('Наименование')
@@ -35,33 +35,29 @@ with tabs[1]:
         stock_quantity = st.number_input('Количество на складе', min_value=0)
         procurement_time = st.number_input('Срок закупки (дни)')
         if st.form_submit_button('Добавить'):
-            data = {
+            part = {
                 'name': name, 'useful_life': useful_life, 'equipment_id': eq_options[equipment_name],
                 'quantity_per_equipment': quantity_per_equipment, 'stock_quantity': stock_quantity,
                 'procurement_time': procurement_time
             }
-            requests.post(f'{BASE_URL}/parts/', json=data)
+            post('/parts/', part)
             st.rerun()
 
 with tabs[2]:
-    response = requests.get(f'{BASE_URL}/workshops/')
-    data = response.json()
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(data['workshops'])
     st.dataframe(df)
     with st.form('add_workshop'):
         name = st.text_input('Наименование')
         address = st.text_input('Адрес')
         if st.form_submit_button('Добавить'):
-            requests.post(f'{BASE_URL}/workshops/', json={'name': name, 'address': address})
+            post('/workshops/', {'name': name, 'address': address})
             st.rerun()
 
 with tabs[3]:
-    response = requests.get(f'{BASE_URL}/replacement_types/')
-    data = response.json()
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(data['replacement_types'])
     st.dataframe(df)
     with st.form('add_replacement_type'):
         name = st.text_input('Наименование')
         if st.form_submit_button('Добавить'):
-            requests.post(f'{BASE_URL}/replacement_types/', json={'name': name})
-            st.rerun()
\ No newline at end of file
+            post('/replacement_types/', {'name': name})
+            st.rerun()
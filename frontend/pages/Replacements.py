@@ -1,42 +1,69 @@
 import streamlit as st
-import requests
 import pandas as pd
+from api_client import event_version, fetch_many, part_search_request, patch, post
 
-BASE_URL = 'http://backend:8000'
+EDITABLE_COLUMNS = ['equipment_id', 'part_id', 'replacement_date', 'replacement_type_id', 'workshop_id']
+
+def to_json_value(value):
+    return value.item() if hasattr(value, 'item') else value
+
+def changed_rows(original, edited):
+    if original.empty or 'id' not in edited:
+        return []
+    original_by_id = original.set_index('id')
+    patches = []
+    for _, row in edited.dropna(subset=['id']).iterrows():
+        replacement_id = int(row['id'])
+        if replacement_id not in original_by_id.index:
+            continue
+        before = original_by_id.loc[replacement_id]
+        patch = {
+            column: to_json_value(row[column]) for column in EDITABLE_COLUMNS
+            if column in row and not pd.isna(row[column]) and row[column] != before[column]
+        }
+        if patch:
+            patches.append({'id': replacement_id, **patch})
+    return patches
 
 st.title('Случаи замен запчастей')
 
-equipments = requests.get(f'{BASE_URL}/equipment/').json()
-eq_options = {eq['name']: eq['id'] for eq in equipments}
+references = fetch_many({
+    'equipment': '/equipment/',
+    'replacement_types': '/replacement_types/',
+    'workshops': '/workshops/',
+})
+eq_options = {eq['name']: eq['id'] for eq in references['equipment']}
 selected_eq = st.selectbox('Выберите оборудование', list(eq_options.keys()))
 eq_id = eq_options.get(selected_eq)
 
 if eq_id:
-    replacements = requests.get(f'{BASE_URL}/replacements/?equipment_id={eq_id}').json()
-    df = pd.DataFrame(replacements)
+    part_query = st.text_input('Поиск запчасти', placeholder='Начните вводить название')
+    data = fetch_many({
+        'replacements': ('/replacements/', {'equipment_id': eq_id}, event_version('replacements')),
+        'parts': part_search_request(part_query, eq_id),
+    })
+    df = pd.DataFrame(data['replacements'])
     edited_df = st.data_editor(df, num_rows='dynamic')
 
     if st.button('Сохранить изменения'):
-        for idx, row in edited_df.iterrows():
-            requests.put(f"{BASE_URL}/replacements/{row['id']}", json=row.to_dict())
+        patches = changed_rows(df, edited_df)
+        if patches:
+            patch('/replacements/', patches)
         st.success('Сохранено')
 
     with st.form('add_replacement'):
-        parts = requests.get(f'{BASE_URL}/parts/').json()
-        part_options = {p['name']: p['id'] for p in parts if p['equipment_id'] == eq_id}
+        part_options = {p['name']: p['id'] for p in data['parts']}
         part_id = st.selectbox('Запчасть', list(part_options.keys()))
         replacement_date = st.date_input('Дата замены')
-        types = requests.get(f'{BASE_URL}/replacement_types/').json()
-        type_options = {t['name']: t['id'] for t in types}
+        type_options = {t['name']: t['id'] for t in references['replacement_types']}
         type_id = st.selectbox('Тип замены', list(type_options.keys()))
-        workshops = requests.get(f'{BASE_URL}/workshops/').json()
-        ws_options = {w['name']: w['id'] for w in workshops}
+        ws_options = {w['name']: w['id'] for w in references['workshops']}
         ws_id = st.selectbox('Мастерская', list(ws_options.keys()))
         if st.form_submit_button('Добавить'):
-            data = {
+            replacement = {
                 'equipment_id': eq_id, 'part_id': part_options[part_id],
                 'replacement_date': str(replacement_date), 'replacement_type_id': type_options[type_id],
                 'workshop_id': ws_options[ws_id]
             }
-            requests.post(f'{BASE_URL}/replacements/', json=data)
-            st.rerun()
\ No newline at end of file
+            post('/replacements/', replacement)
+            st.rerun()
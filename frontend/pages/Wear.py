@@ -1,13 +1,11 @@
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.express as px
-
-BASE_URL = 'http://backend:8000'
+from api_client import EVENT_POLL_SECONDS, event_version, fetch
 
 st.title('Расчет степени износа')
 
-equipments = requests.get(f'{BASE_URL}/equipment/').json()
+equipments = fetch('/equipment/')
 eq_options = {eq['name']: eq['id'] for eq in equipments}
 selected_eq = st.selectbox('Оборудование', list(eq_options.keys()))
 eq_id = eq_options.get(selected_eq)
@@ -20,8 +18,11 @@ zone_translation = {
     'Critical': 'Критический'
 }
 
-if eq_id:
-    wear_data = requests.get(f'{BASE_URL}/wear/{eq_id}').json()
+# Re-runs on a timer but only calls the backend when /events reported a change
+# for this equipment; otherwise the cached response is redrawn.
+@st.fragment(run_every=EVENT_POLL_SECONDS)
+def wear_panel(eq_id):
+    wear_data = fetch(f'/wear/{eq_id}', version=event_version(f'wear:{eq_id}'))
     df = pd.DataFrame(wear_data)
     df['zone'] = df['zone'].map(zone_translation)
     st.dataframe(df)
@@ -35,4 +36,7 @@ if eq_id:
                      'Критический': 'black'
                  },
                  title='Износ запчастей')
-    st.plotly_chart(fig)
\ No newline at end of file
+    st.plotly_chart(fig)
+
+if eq_id:
+    wear_panel(eq_id)
@@ -1,8 +1,33 @@
+import os
+import sys
 import pytest
+import streamlit as st
+from unittest.mock import MagicMock
 from streamlit.testing.v1 import AppTest
 
+# Streamlit puts the script folder on sys.path when it runs the app; mirror that
+# so pages can import the shared api_client module under test.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(autouse=True)
+def clear_streamlit_caches():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield
+
 @pytest.fixture
 def run_app():
     def _run(script_path):
         return AppTest.from_file(script_path)
-    return _run
\ No newline at end of file
+    return _run
+
+@pytest.fixture
+def backend_routes():
+    def _routes(responses):
+        def fake_get(url, *args, **kwargs):
+            path = '/' + url.split('://', 1)[-1].split('/', 1)[-1]
+            response = MagicMock(status_code=200, headers={})
+            response.json.return_value = responses.get(path, [])
+            return response
+        return fake_get
+    return _routes
@@ -0,0 +1,23 @@
+from unittest.mock import patch
+
+import api_client
+
+def test_event_scopes():
+    assert api_client._event_scopes('replacement.created', {'equipment_id': 3}) == ('replacements', 'wear:3')
+    assert api_client._event_scopes('wear.zone_changed', {'equipment_id': 3}) == ('wear:3',)
+    assert api_client._event_scopes('resync', {'dropped': 10}) == ('*',)
+
+def test_fetch_refetches_only_when_event_version_changes(backend_routes):
+    versions = api_client.EventVersions()
+    with patch('requests.Session.get') as mock_get:
+        mock_get.side_effect = backend_routes({'/wear/3': [{'part_name': 'Hook'}]})
+        api_client.fetch('/wear/3', version=versions.get('wear:3'))
+        versions.bump(['wear:4'])
+        api_client.fetch('/wear/3', version=versions.get('wear:3'))
+        assert mock_get.call_count == 1
+
+        versions.bump(api_client._event_scopes('wear.zone_changed', {'equipment_id': 3}))
+        api_client.fetch('/wear/3', version=versions.get('wear:3'))
+        versions.bump(['*'])
+        api_client.fetch('/wear/3', version=versions.get('wear:3'))
+        assert mock_get.call_count == 3
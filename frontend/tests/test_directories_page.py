@@ -1,57 +1,33 @@
-import pytest
 from unittest.mock import patch
 from streamlit.testing.v1 import AppTest
 
-@pytest.mark.timeout(5)
-@patch('requests.get')
-@patch('requests.post')
-def test_directories_page(mock_post, mock_get):
-    mock_get.return_value.json.return_value = [{'id': 1, 'name': 'Test Truck', 'fleet_quantity': 10}]
+@patch('requests.Session.get')
+@patch('requests.Session.post')
+def test_directories_page(mock_post, mock_get, backend_routes):
+    mock_get.side_effect = backend_routes({
+        '/equipment/': [{'id': 1, 'name': 'Bulldozer', 'fleet_quantity': 2}],
+    })
     mock_post.return_value.status_code = 200
+
     app = AppTest.from_file('frontend/pages/Directories.py')
-    app.run()
-    assert app.session_state is not None
-    text_inputs = [ti for ti in app.text_input if ti.form_id == 'add_equipment' and ti.label == 'Наименование']
-    assert len(text_inputs) > 0
+    app.run(timeout=5)
 
-@pytest.mark.timeout(5)
-@patch('requests.get')
-def test_replacements_page(mock_get):
-    mock_get.side_effect = [
-        [{'id': 1, 'name': 'Truck'}],
-        [{'id': 1, 'part_name': 'Engine Belt', 'replacement_date': '2025-01-01'}],
-        [{'id': 1, 'name': 'Engine Belt', 'equipment_id': 1}],
-        [{'id': 1, 'name': 'Planned'}],
-        [{'id': 1, 'name': 'Main Workshop'}],
+    assert app.title[0].value == 'Справочники'
+    assert len(app.dataframe) > 0
+    assert not app.exception
+    assert sorted(call.args[0] for call in mock_get.call_args_list) == [
+        'http://backend:8000/equipment/', 'http://backend:8000/parts/',
+        'http://backend:8000/replacement_types/', 'http://backend:8000/workshops/',
     ]
-    app = AppTest.from_file('frontend/pages/Replacements.py')
-    app.run()
-    assert app.session_state is not None
-    assert app.title[0].value == 'Случаи замен запчастей'
 
-@pytest.mark.timeout(5)
-@patch('requests.get')
-def test_procurement_page(mock_get):
-    mock_get.side_effect = [
-        [{'id': 1, 'name': 'Filter'}],
-        {'part_name': 'Filter', 'latest_init_date': '2025-08-01'}
-    ]
-    app = AppTest.from_file('frontend/pages/Procurement.py')
-    app.run()
-    assert app.title[0].value == 'Формирование плана закупки'
-    assert app.session_state is not None
+@patch('requests.Session.get')
+def test_directories_page_reuses_cache_across_reruns(mock_get, backend_routes):
+    mock_get.side_effect = backend_routes({
+        '/equipment/': [{'id': 1, 'name': 'Bulldozer', 'fleet_quantity': 2}],
+    })
 
-@pytest.mark.timeout(5)
-@patch('requests.get')
-def test_wear_page(mock_get):
-    mock_get.side_effect = [
-        [{'id': 1, 'name': 'Excavator'}],
-        [
-            {'part_name': 'Track Belt', 'remaining_percentage': 80, 'zone': 'Green'},
-            {'part_name': 'Hydraulic Pump', 'remaining_percentage': 50, 'zone': 'Yellow'}
-        ]
-    ]
-    app = AppTest.from_file('frontend/pages/Wear.py')
-    app.run()
-    assert app.title[0].value == 'Расчет степени износа'
-    assert app.session_state is not None
\ No newline at end of file
+    app = AppTest.from_file('frontend/pages/Directories.py')
+    app.run(timeout=5)
+    app.run(timeout=5)
+
+    assert mock_get.call_count == 4
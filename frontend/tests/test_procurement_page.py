@@ -2,15 +2,33 @@ from unittest.mock import patch
 from streamlit.testing.v1 import AppTest
 from datetime import date
 
-@patch('requests.get')
-def test_procurement_page(mock_get):
-    mock_get.return_value.json.side_effect = [
-        [{'id': 1, 'name': 'Bearing'}],
-        {'latest_init_date': str(date.today()), 'part_name': 'Bearing'},
-        {'latest_init_date': str(date.today()), 'part_name': 'Bearing'}
-    ]
+@patch('requests.Session.get')
+def test_procurement_page(mock_get, backend_routes):
+    mock_get.side_effect = backend_routes({
+        '/parts/search': [{'id': 1, 'name': 'Bearing'}],
+        '/procurement/': [{'part_id': 1, 'latest_init_date': str(date.today()), 'part_name': 'Bearing'}],
+    })
 
     app = AppTest.from_file('frontend/pages/Procurement.py')
     app.run(timeout=5)
 
-    assert app.title[0].value == 'Формирование плана закупки'
\ No newline at end of file
+    assert app.title[0].value == 'Формирование плана закупки'
+    assert not app.exception
+    assert mock_get.call_count == 2
+
+@patch('requests.Session.get')
+def test_procurement_page_searches_parts_as_user_types(mock_get, backend_routes):
+    mock_get.side_effect = backend_routes({
+        '/parts/search': [{'id': 1, 'name': 'Подшипник'}],
+        '/procurement/': [{'part_id': 1, 'latest_init_date': str(date.today()), 'part_name': 'Подшипник'}],
+    })
+
+    app = AppTest.from_file('frontend/pages/Procurement.py')
+    app.run(timeout=5)
+    app.text_input[0].input('подш').run(timeout=5)
+
+    urls = [call.args[0] for call in mock_get.call_args_list]
+    assert not [url for url in urls if url.endswith('/parts/')]
+    searches = [call.kwargs['params'] for call in mock_get.call_args_list if call.args[0].endswith('/parts/search')]
+    assert searches == [{'q': '', 'limit': 20}, {'q': 'подш', 'limit': 20}]
+    assert not app.exception
@@ -1,18 +1,36 @@
 from unittest.mock import patch
 from streamlit.testing.v1 import AppTest
 
-@patch('requests.get')
-@patch('requests.post')
-@patch('requests.put')
-def test_replacements_page(mock_put, mock_post, mock_get):
-    mock_get.return_value.json.side_effect = [
-        [{'id': 1, 'name': 'Excavator'}],
-        [], [], [], []
-    ]
+@patch('requests.Session.get')
+@patch('requests.Session.post')
+@patch('requests.Session.patch')
+def test_replacements_page(mock_patch, mock_post, mock_get, backend_routes):
+    mock_get.side_effect = backend_routes({
+        '/equipment/': [{'id': 1, 'name': 'Excavator'}],
+    })
     mock_post.return_value.status_code = 200
-    mock_put.return_value.status_code = 200
+    mock_patch.return_value.status_code = 200
 
     app = AppTest.from_file('frontend/pages/Replacements.py')
     app.run(timeout=5)
 
-    assert 'Случаи замен запчастей' in app.title[0].value
\ No newline at end of file
+    assert 'Случаи замен запчастей' in app.title[0].value
+    assert not app.exception
+
+@patch('requests.Session.get')
+@patch('requests.Session.patch')
+def test_replacements_page_saves_only_changed_rows(mock_patch, mock_get, backend_routes):
+    replacement = {'id': 7, 'equipment_id': 1, 'part_id': 2, 'replacement_date': '2024-01-01',
+                   'replacement_type_id': 1, 'workshop_id': 1}
+    mock_get.side_effect = backend_routes({
+        '/equipment/': [{'id': 1, 'name': 'Excavator'}],
+        '/replacements/': [replacement],
+    })
+
+    app = AppTest.from_file('frontend/pages/Replacements.py')
+    app.run(timeout=5)
+    app.button[0].click().run(timeout=5)
+
+    assert not app.exception
+    assert app.success[0].value == 'Сохранено'
+    mock_patch.assert_not_called()
@@ -0,0 +1,31 @@
+from unittest.mock import patch
+from streamlit.testing.v1 import AppTest
+
+@patch('requests.Session.get')
+def test_statistics_page_reads_the_rollup(mock_get, backend_routes):
+    mock_get.side_effect = backend_routes({
+        '/stats/replacements': [
+            {'month': '2024-01-01', 'workshop_id': 1, 'workshop_name': 'Гараж', 'replacement_count': 3},
+            {'month': '2024-02-01', 'workshop_id': 2, 'workshop_name': 'Депо', 'replacement_count': 1},
+        ],
+    })
+
+    app = AppTest.from_file('frontend/pages/Statistics.py')
+    app.run(timeout=5)
+
+    assert app.title[0].value == 'Статистика замен'
+    assert not app.exception
+    urls = [call.args[0] for call in mock_get.call_args_list]
+    assert not [url for url in urls if url.endswith('/replacements/')]
+    [params] = [call.kwargs['params'] for call in mock_get.call_args_list]
+    assert params['group_by'] == ['month', 'workshop']
+
+@patch('requests.Session.get')
+def test_statistics_page_without_replacements(mock_get, backend_routes):
+    mock_get.side_effect = backend_routes({})
+
+    app = AppTest.from_file('frontend/pages/Statistics.py')
+    app.run(timeout=5)
+
+    assert app.info[0].value == 'За выбранный период замен нет'
+    assert not app.exception
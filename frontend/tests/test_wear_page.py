@@ -1,14 +1,15 @@
 from unittest.mock import patch
 from streamlit.testing.v1 import AppTest
 
-@patch('requests.get')
-def test_wear_page(mock_get):
-    mock_get.return_value.json.side_effect = [
-        [{'id': 1, 'name': 'Crane'}],
-        [{'part_name': 'Hook', 'remaining_percentage': 80, 'zone': 'Green'}]
-    ]
+@patch('requests.Session.get')
+def test_wear_page(mock_get, backend_routes):
+    mock_get.side_effect = backend_routes({
+        '/equipment/': [{'id': 1, 'name': 'Crane'}],
+        '/wear/1': [{'part_name': 'Hook', 'remaining_percentage': 80, 'zone': 'Green'}],
+    })
 
     app = AppTest.from_file('frontend/pages/Wear.py')
     app.run(timeout=5)
 
-    assert app.title[0].value == 'Расчет степени износа'
\ No newline at end of file
+    assert app.title[0].value == 'Расчет степени износа'
+    assert not app.exception